@@ -47,16 +47,8 @@ def mr_index(data, r=100):
     check_homogeneous_timegrid(data)
     check_int_parameter(r)
 
-    # Get non-nan values
-    values = data.glucose.values[~np.isnan(data.glucose.values)]
-
-    # Return nan if all values are nan
-    if values.size == 0:
-        return np.nan
-
     # Return the result
-    trans_data = 1000 * abs(np.log10(values / r))**3
-    return np.mean(trans_data)
+    return _mr_index(data.glucose.values, r)
 
 
 def hypo_index(data):
@@ -97,20 +89,8 @@ def hypo_index(data):
     check_data_columns(data)
     check_homogeneous_timegrid(data)
 
-    # Get non-nan values
-    values = data.glucose.values[~np.isnan(data.glucose.values)]
-
-    # Return nan if all values are nan
-    if values.size == 0:
-        return np.nan
-
-    # Set up the formula parameters
-    b = 2
-    d = 30
-    lltr = 70
-
     # Compute metric
-    return np.sum((lltr - values[values < lltr])**b) / (values.size * d)
+    return _hypo_index(data.glucose.values)
 
 
 def hyper_index(data):
@@ -151,20 +131,8 @@ def hyper_index(data):
     check_data_columns(data)
     check_homogeneous_timegrid(data)
 
-    # Get non-nan values
-    values = data.glucose.values[~np.isnan(data.glucose.values)]
-
-    # Return nan if all values are nan
-    if values.size == 0:
-        return np.nan
-
-    # Set up the formula parameters
-    a = 1.1
-    c = 30
-    ultr = 180
-
     # Compute metric
-    return np.sum((values[values > ultr] - ultr)**a) / (values.size * c)
+    return _hyper_index(data.glucose.values)
 
 
 def igc(data):
@@ -206,7 +174,7 @@ def igc(data):
     check_homogeneous_timegrid(data)
 
     # Compute metric
-    return hypo_index(data) + hyper_index(data)
+    return _igc(data.glucose.values)
 
 
 def grade_hypo_score(data):
@@ -248,17 +216,8 @@ def grade_hypo_score(data):
     check_data_columns(data)
     check_homogeneous_timegrid(data)
 
-    # Get non-nan values
-    values = data.glucose.values[~np.isnan(data.glucose.values)]
-
-    # Return nan if all values are nan
-    if values.size == 0:
-        return np.nan
-
-    # Set up the formula parameters
-    grade = 425 * (np.log10(np.log10(values / 18)) + .16)**2
-    g_tot = np.sum(grade)
-    return 100 * np.sum(grade[values < 70]) / g_tot
+    # Compute metric
+    return _grade_hypo_score(data.glucose.values)
 
 
 def grade_hyper_score(data):
@@ -300,17 +259,8 @@ def grade_hyper_score(data):
     check_data_columns(data)
     check_homogeneous_timegrid(data)
 
-    # Get non-nan values
-    values = data.glucose.values[~np.isnan(data.glucose.values)]
-
-    # Return nan if all values are nan
-    if values.size == 0:
-        return np.nan
-
-    # Set up the formula parameters
-    grade = 425 * (np.log10(np.log10(values / 18)) + .16)**2
-    g_tot = np.sum(grade)
-    return 100 * np.sum(grade[values > 180]) / g_tot
+    # Compute metric
+    return _grade_hyper_score(data.glucose.values)
 
 
 def grade_eu_score(data):
@@ -352,7 +302,7 @@ def grade_eu_score(data):
     check_data_columns(data)
     check_homogeneous_timegrid(data)
 
-    return 100 - (grade_hypo_score(data) + grade_hyper_score(data))
+    return _grade_eu_score(data.glucose.values)
 
 
 def grade_score(data):
@@ -394,8 +344,339 @@ def grade_score(data):
     check_data_columns(data)
     check_homogeneous_timegrid(data)
 
+    # Compute metric
+    return _grade_score(data.glucose.values)
+
+
+def _mr_index(glucose, r=100):
+    """
+    Computes the mr value by Schlichtkrull of the given glucose vector (ignores nan values).
+    Array counterpart of `mr_index`.
+
+    Parameters
+    ----------
+    glucose: np.ndarray
+        A vector of double containing the glucose data to analyze (in mg/dl).
+    r: int, optional, default : 100
+        Hyperparameter for mr value calculation
+
+    Returns
+    -------
+    mr_index: float
+        The mr value
+
+    Raises
+    ------
+    None
+
+    See Also
+    --------
+    mr_index
+
+    Examples
+    --------
+    None
+
+    References
+    ----------
+    None
+    """
+    # Get non-nan values
+    values = glucose[~np.isnan(glucose)]
+
+    # Return nan if all values are nan
+    if values.size == 0:
+        return np.nan
+
+    # Return the result
+    trans_data = 1000 * abs(np.log10(values / r))**3
+    return np.mean(trans_data)
+
+
+def _hypo_index(glucose):
+    """
+    Computes the hypoglycemic index by Rodbard of the given glucose vector (ignores nan values).
+    Array counterpart of `hypo_index`.
+
+    Parameters
+    ----------
+    glucose: np.ndarray
+        A vector of double containing the glucose data to analyze (in mg/dl).
+
+    Returns
+    -------
+    hypo_index: float
+        The hypo index
+
+    Raises
+    ------
+    None
+
+    See Also
+    --------
+    hypo_index
+
+    Examples
+    --------
+    None
+
+    References
+    ----------
+    None
+    """
+    # Get non-nan values
+    values = glucose[~np.isnan(glucose)]
+
+    # Return nan if all values are nan
+    if values.size == 0:
+        return np.nan
+
+    # Set up the formula parameters
+    b = 2
+    d = 30
+    lltr = 70
+
+    # Compute metric
+    return np.sum((lltr - values[values < lltr])**b) / (values.size * d)
+
+
+def _hyper_index(glucose):
+    """
+    Computes the hyperglycemic index by Rodbard of the given glucose vector (ignores nan values).
+    Array counterpart of `hyper_index`.
+
+    Parameters
+    ----------
+    glucose: np.ndarray
+        A vector of double containing the glucose data to analyze (in mg/dl).
+
+    Returns
+    -------
+    hyper_index: float
+        The hyper index
+
+    Raises
+    ------
+    None
+
+    See Also
+    --------
+    hyper_index
+
+    Examples
+    --------
+    None
+
+    References
+    ----------
+    None
+    """
+    # Get non-nan values
+    values = glucose[~np.isnan(glucose)]
+
+    # Return nan if all values are nan
+    if values.size == 0:
+        return np.nan
+
+    # Set up the formula parameters
+    a = 1.1
+    c = 30
+    ultr = 180
+
+    # Compute metric
+    return np.sum((values[values > ultr] - ultr)**a) / (values.size * c)
+
+
+def _igc(glucose):
+    """
+    Computes the index of glycemic control by Rodbard of the given glucose vector (ignores nan values).
+    Array counterpart of `igc`.
+
+    Parameters
+    ----------
+    glucose: np.ndarray
+        A vector of double containing the glucose data to analyze (in mg/dl).
+
+    Returns
+    -------
+    igc: float
+        The index of glycemic control
+
+    Raises
+    ------
+    None
+
+    See Also
+    --------
+    igc
+
+    Examples
+    --------
+    None
+
+    References
+    ----------
+    None
+    """
+    # Compute metric
+    return _hypo_index(glucose) + _hyper_index(glucose)
+
+
+def _grade_hypo_score(glucose):
+    """
+    Computes the GRADEhypo score of the given glucose vector (ignores nan values).
+    Array counterpart of `grade_hypo_score`.
+
+    Parameters
+    ----------
+    glucose: np.ndarray
+        A vector of double containing the glucose data to analyze (in mg/dl).
+
+    Returns
+    -------
+    grade_hypo_score: float
+        The glycemic risk assessment diabetes equation score in the hypoglycemic range (GRADEhypo) (%).
+
+    Raises
+    ------
+    None
+
+    See Also
+    --------
+    grade_hypo_score
+
+    Examples
+    --------
+    None
+
+    References
+    ----------
+    None
+    """
+    # Get non-nan values
+    values = glucose[~np.isnan(glucose)]
+
+    # Return nan if all values are nan
+    if values.size == 0:
+        return np.nan
+
+    # Set up the formula parameters
+    grade = 425 * (np.log10(np.log10(values / 18)) + .16)**2
+    g_tot = np.sum(grade)
+    return 100 * np.sum(grade[values < 70]) / g_tot
+
+
+def _grade_hyper_score(glucose):
+    """
+    Computes the GRADEhyper score of the given glucose vector (ignores nan values).
+    Array counterpart of `grade_hyper_score`.
+
+    Parameters
+    ----------
+    glucose: np.ndarray
+        A vector of double containing the glucose data to analyze (in mg/dl).
+
+    Returns
+    -------
+    grade_hyper_score: float
+        The glycemic risk assessment diabetes equation score in the hyperglycemic range (GRADEhyper) (%).
+
+    Raises
+    ------
+    None
+
+    See Also
+    --------
+    grade_hyper_score
+
+    Examples
+    --------
+    None
+
+    References
+    ----------
+    None
+    """
+    # Get non-nan values
+    values = glucose[~np.isnan(glucose)]
+
+    # Return nan if all values are nan
+    if values.size == 0:
+        return np.nan
+
+    # Set up the formula parameters
+    grade = 425 * (np.log10(np.log10(values / 18)) + .16)**2
+    g_tot = np.sum(grade)
+    return 100 * np.sum(grade[values > 180]) / g_tot
+
+
+def _grade_eu_score(glucose):
+    """
+    Computes the GRADEeu score of the given glucose vector (ignores nan values).
+    Array counterpart of `grade_eu_score`.
+
+    Parameters
+    ----------
+    glucose: np.ndarray
+        A vector of double containing the glucose data to analyze (in mg/dl).
+
+    Returns
+    -------
+    grade_eu_score: float
+        The glycemic risk assessment diabetes equation score in the euglycemic range (GRADEeu) (%).
+
+    Raises
+    ------
+    None
+
+    See Also
+    --------
+    grade_eu_score
+
+    Examples
+    --------
+    None
+
+    References
+    ----------
+    None
+    """
+    return 100 - (_grade_hypo_score(glucose) + _grade_hyper_score(glucose))
+
+
+def _grade_score(glucose):
+    """
+    Computes the GRADE score of the given glucose vector (ignores nan values).
+    Array counterpart of `grade_score`.
+
+    Parameters
+    ----------
+    glucose: np.ndarray
+        A vector of double containing the glucose data to analyze (in mg/dl).
+
+    Returns
+    -------
+    grade_score: float
+        The glycemic risk assessment diabetes equation score (GRADE) (%).
+
+    Raises
+    ------
+    None
+
+    See Also
+    --------
+    grade_score
+
+    Examples
+    --------
+    None
+
+    References
+    ----------
+    None
+    """
     # Get non-nan values
-    values = data.glucose.values[~np.isnan(data.glucose.values)]
+    values = glucose[~np.isnan(glucose)]
 
     # Return nan if all values are nan
     if values.size == 0:
@@ -34,7 +34,7 @@ def check_dataframe(data):
     ----------
     None
     """
-    if not type(data) is pd.DataFrame:
+    if not isinstance(data, pd.DataFrame):
         raise Exception("`data` is not a pd.Dataframe")
 
     return True
@@ -128,10 +128,7 @@ def missing_glucose_percentage(data):
     check_data_columns(data)
     check_homogeneous_timegrid(data)
 
-    if data.glucose.values.size == 0:
-        return np.nan
-
-    return 100 * np.sum(np.isnan(data.glucose))/ data.glucose.values.size
+    return _missing_glucose_percentage(data.glucose.values)
 
 
 def number_days_of_observation(data):
@@ -169,12 +166,7 @@ def number_days_of_observation(data):
     check_data_columns(data)
     check_homogeneous_timegrid(data)
 
-    if data.glucose.values.size == 0:
-        return np.nan
-
-    start_time = pd.to_datetime(data.t.values[0]).to_pydatetime()
-    end_time = pd.to_datetime(data.t.values[-1]).to_pydatetime()
-    return (end_time - start_time).total_seconds() / (60 * 60 * 24)
+    return _number_days_of_observation(np.asarray(data.t.values, dtype='datetime64[ns]').view('i8'))
 
 
 def find_hypoglycemic_events(data, th=70.):
@@ -809,3 +801,78 @@ def find_hyperglycemic_events_by_level(data, glycemic_target='diabetes'):
     hyperglycemic_events['l2'] = copy(l2_hyper_events)
 
     return hyperglycemic_events
+
+
+def _missing_glucose_percentage(glucose):
+    """
+    Computes the percentage of missing values in the given glucose vector.
+    Array counterpart of `missing_glucose_percentage`.
+
+    Parameters
+    ----------
+    glucose: np.ndarray
+        A vector of double containing the glucose data to analyze (in mg/dl).
+
+    Returns
+    -------
+    missing_glucose_percentage: float
+        The percentage of missing glucose values.
+
+    Raises
+    ------
+    None
+
+    See Also
+    --------
+    missing_glucose_percentage
+
+    Examples
+    --------
+    None
+
+    References
+    ----------
+    None
+    """
+    if glucose.size == 0:
+        return np.nan
+
+    return 100 * np.sum(np.isnan(glucose)) / glucose.size
+
+
+def _number_days_of_observation(t):
+    """
+    Computes the number of days of observation spanned by the given timestamps.
+    Array counterpart of `number_days_of_observation`.
+
+    Parameters
+    ----------
+    t: np.ndarray
+        A vector of int64 containing the timestamps (in ns since epoch).
+
+    Returns
+    -------
+    number_days_of_observation: float
+        The number of days of observation.
+
+    Raises
+    ------
+    None
+
+    See Also
+    --------
+    number_days_of_observation
+
+    Examples
+    --------
+    None
+
+    References
+    ----------
+    None
+    """
+    if t.size == 0:
+        return np.nan
+
+    # Work at the microsecond resolution of python datetimes
+    return ((t[-1] - t[0]) // 1000) / 1e6 / (60 * 60 * 24)
@@ -1,10 +1,7 @@
 import numpy as np
 import pandas as pd
-from datetime import datetime, timedelta
 from copy import copy
 
-from scipy.interpolate import interp1d
-
 from py_agata.inspection import find_nan_islands
 from py_agata.input_validator import *
 
@@ -44,28 +41,32 @@ def detrend_glucose(data):
     check_data_columns(data)
     check_homogeneous_timegrid(data)
 
+    # Get the raw timestamps (in ns) and glucose buffers
+    t_ns = _time_ns(data)
+    g = _glucose_values(data)
+
     # Compute the slope
-    first_point = np.where(~np.isnan(data.glucose.values))[0]
+    first_point = np.where(~np.isnan(g))[0]
     if first_point.size > 1:
-        t0 = pd.to_datetime(data.t.values[0]).to_pydatetime()
-        t1 = pd.to_datetime(data.t.values[1]).to_pydatetime()
-        sample_time = (t1 - t0).total_seconds() / 60
+        sample_time = (t_ns[1] - t_ns[0]) / 6e10
 
         last_point = first_point[-1]
         first_point = first_point[0]
-        m = (data.glucose.values[last_point] - data.glucose.values[first_point]) / ((last_point - first_point) * sample_time)
+        m = (g[last_point] - g[first_point]) / ((last_point - first_point) * sample_time)
 
-        # Detrend data
-        data_detrented = copy(data)
-        data_detrented.glucose[:] = data_detrented.glucose.values - m*np.arange(0,data_detrented.glucose.values.size)*sample_time
-        return data_detrented
+        # Detrend data (in a single output buffer)
+        glucose = np.arange(0, g.size, dtype=np.float64)
+        np.multiply(glucose, m*sample_time, out=glucose)
+        np.subtract(g, glucose, out=glucose)
+        return pd.DataFrame(data={'t': data.t.values, 'glucose': glucose})
     else:
         return copy(data)
 
 def impute_glucose(data, max_gap):
     """
     Imputes missing glucose data using linear interpolation. The function imputes only missing data gaps of maximum
-    `max_gap` minutes. Gaps longer than `max_gap` minutes are ignored.
+    `max_gap` minutes. Gaps longer than `max_gap` minutes, as well as gaps at the beginning or at the end of the
+    timeseries, are ignored.
 
     Parameters
     ----------
@@ -103,20 +104,20 @@ def impute_glucose(data, max_gap):
     check_int_parameter(max_gap)
 
     # Get the sample time
-    t0 = pd.to_datetime(data.t.values[0]).to_pydatetime()
-    t1 = pd.to_datetime(data.t.values[1]).to_pydatetime()
-    sample_time = (t1 - t0).total_seconds() / 60
+    t_ns = _time_ns(data)
+    sample_time = (t_ns[1] - t_ns[0]) / 6e10
 
     # Find the interpolable gaps
     short_nan, long_nan, nan_start, nan_end = find_nan_islands(data, int(np.round(max_gap / sample_time)))
 
     # Impute data
-    data_imputed = copy(data)
-    idxs = np.arange(data_imputed.shape[0])
-    f = interp1d(idxs[~np.isnan(data.glucose.values)], data.glucose.values[~np.isnan(data.glucose.values)], kind='linear')
-    data_imputed.glucose.values[short_nan] = f(short_nan)
+    g = _glucose_values(data)
+    valid = ~np.isnan(g)
+    idxs = np.arange(g.size)
+    glucose = g.copy()
+    glucose[short_nan] = np.interp(short_nan, idxs[valid], g[valid], left=np.nan, right=np.nan)
 
-    return data_imputed
+    return pd.DataFrame(data={'t': data.t.values, 'glucose': glucose})
 
 def retime_glucose(data, timestep):
     """
@@ -156,39 +157,152 @@ def retime_glucose(data, timestep):
     check_dataframe(data)
     check_data_columns(data)
 
-    data_temp = copy(data)
-    start_time = pd.to_datetime(data_temp.t.values[0]).to_pydatetime()
-    start_time = start_time.replace(second=0)
-    end_time = pd.to_datetime(data_temp.t.values[-1]).to_pydatetime()
+    # Get the timestamps (in ns) and glucose buffers
+    t_ns = _time_ns(data)
+    g = _glucose_values(data)
+    valid = ~np.isnan(g)
+    step_ns = int(round(timestep * 60 * 1_000_000_000))
+
+    # Data already sampled every `timestep` minutes starting at a whole minute keep their timestamps, but the last
+    # one which falls out of the new timegrid and is averaged with the previous one
+    d = np.diff(t_ns)
+    if d.size > 0 and t_ns[0] % 60_000_000_000 == 0 and d.min() == d.max() == step_ns:
+        glucose = g[:-1].copy()
+        last = g[-2:][valid[-2:]]
+        glucose[-1] = last.mean() if last.size > 0 else np.nan
+        return pd.DataFrame(data={'t': t_ns[:-1].view('datetime64[ns]'), 'glucose': glucose})
+
+    # Floor the first timestamp to the minute and build the new timegrid
+    start_ns = (t_ns[0] // 60_000_000_000) * 60_000_000_000
+    end_ns = t_ns[-1]
+    grid_ns = np.arange(start_ns, end_ns, step_ns, dtype=np.int64)
+
+    # Assign each datapoint to its nearest timestamp
+    sums, counts = _retime_kernel(t_ns[valid], g[valid], grid_ns)
+
+    # Manage conflicts computing their average
+    glucose = np.where(counts > 0, sums / np.maximum(counts, 1), np.nan)
+
+    return pd.DataFrame(data={'t': grid_ns.view('datetime64[ns]'), 'glucose': glucose})
+
+
+def _retime_kernel(src_ns, src_g, grid_ns):
+    """
+    Accumulates the given glucose datapoints on the nearest timestamp of a homogeneous timegrid. Ties (i.e., when a
+    datapoint is equidistant from two grid points) are solved in favour of the earliest one.
+
+    Parameters
+    ----------
+    src_ns: np.ndarray
+        A vector of int64 containing the timestamps of the (non-nan) glucose datapoints (in ns)
+    src_g: np.ndarray
+        A vector of double containing the (non-nan) glucose datapoints
+    grid_ns: np.ndarray
+        A vector of int64 containing the monotone timegrid to retime data on (in ns)
+
+    Returns
+    -------
+    sums: np.ndarray
+        A vector of double containing, for each grid point, the sum of the glucose datapoints assigned to it
+    counts: np.ndarray
+        A vector of int containing, for each grid point, the number of glucose datapoints assigned to it
+
+    Raises
+    ------
+    None
+
+    See Also
+    --------
+    None
+
+    Examples
+    --------
+    None
+
+    References
+    ----------
+    None
+    """
+    if grid_ns.size == 0:
+        return np.zeros(0), np.zeros(0, dtype=np.intp)
+
+    # Find the nearest grid point of each datapoint
+    grid_idx = pd.DatetimeIndex(grid_ns.view('datetime64[ns]'))
+    idx_near = grid_idx.get_indexer(pd.DatetimeIndex(src_ns.view('datetime64[ns]')), method='nearest')
+
+    # get_indexer breaks ties in favour of the latest grid point: move them back to the earliest one
+    prev = np.maximum(idx_near - 1, 0)
+    ties = (idx_near > 0) & (src_ns - grid_ns[prev] == grid_ns[idx_near] - src_ns)
+    idx_near[ties] -= 1
+
+    # Accumulate datapoints and their number on each grid point
+    sums = np.bincount(idx_near, weights=src_g, minlength=grid_ns.size)
+    counts = np.bincount(idx_near, minlength=grid_ns.size)
+
+    return sums, counts
+
+
+def _time_ns(data):
+    """
+    Returns the timestamps of the given data as a C-contiguous vector of int64 (in ns).
+
+    Parameters
+    ----------
+    data: pd.DataFrame
+        Pandas dataframe with a column `t` containing the timestamps
 
-    new_t = np.arange(start_time, end_time, timedelta(minutes=timestep)).astype(datetime)
-    values = np.empty(new_t.size)
-    values.fill(np.nan)
+    Returns
+    -------
+    t_ns: np.ndarray
+        A C-contiguous vector of int64 containing the timestamps (in ns since epoch)
 
-    dr = {'t': new_t, 'glucose': values, 'k' : values}
-    data_retimed = pd.DataFrame(data=dr)
+    Raises
+    ------
+    None
 
-    data_temp = data_temp.drop(np.where(np.isnan(data_temp.glucose.values))[0]).reset_index().drop(columns='index')
+    See Also
+    --------
+    None
 
-    t_list = pd.to_datetime(data_retimed.t.values).to_pydatetime().tolist()
+    Examples
+    --------
+    None
 
-    for t in range(data_temp.shape[0]):
+    References
+    ----------
+    None
+    """
+    return np.ascontiguousarray(np.asarray(data.t.values, dtype='datetime64[ns]').view('i8'))
 
-        # Find the nearest timestamp
-        t_temp = pd.to_datetime(data_temp.t.values[t]).to_pydatetime()
-        distances = [abs(x - t_temp).total_seconds() for x in t_list]
-        idx_near = np.where(min(distances) == np.array(distances))[0][0]
 
-        # Manage conflicts computing their average
-        if np.isnan(data_retimed.glucose[idx_near]):
-            data_retimed.glucose[idx_near] = data_temp.glucose[t]
-            data_retimed.k[idx_near] = 1
-        else:
-            data_retimed.glucose[idx_near] += data_temp.glucose[t]
-            data_retimed.k[idx_near] += 1
+def _glucose_values(data):
+    """
+    Returns the glucose data of the given data as a C-contiguous vector of float64.
 
-    # Compute the average and remove column 'k'
-    data_retimed.glucose = np.divide(data_retimed.glucose, data_retimed.k)
-    data_retimed = data_retimed.drop(columns='k')
+    Parameters
+    ----------
+    data: pd.DataFrame
+        Pandas dataframe with a column `glucose` containing the glucose data
+
+    Returns
+    -------
+    g: np.ndarray
+        A C-contiguous vector of float64 containing the glucose data
+
+    Raises
+    ------
+    None
+
+    See Also
+    --------
+    None
+
+    Examples
+    --------
+    None
 
-    return data_retimed
\ No newline at end of file
+    References
+    ----------
+    None
+    """
+    return np.ascontiguousarray(data.glucose.values, dtype=np.float64)
@@ -51,4 +51,54 @@ def test_impute_glucose():
     assert (results.glucose[1] == 120)
     assert (results.glucose[2] == 120)
     assert (results.glucose[21] == 120)
-    assert np.all(np.isnan(data.glucose.values[9:20]))
\ No newline at end of file
+    assert np.all(np.isnan(data.glucose.values[9:20]))
+
+def test_impute_glucose_leading_trailing_gaps():
+    """
+    Unit test of impute_glucose function with missing data gaps at the beginning and at the end of the timeseries.
+
+    Parameters
+    ----------
+    None
+
+    Returns
+    -------
+    None
+
+    Raises
+    ------
+    None
+
+    See Also
+    --------
+    None
+
+    Examples
+    --------
+    None
+
+    References
+    ----------
+    None
+    """
+    # Set test data
+    t = np.arange(datetime(2000, 1, 1, 0, 0, 0), datetime(2000, 1, 1, 0, 0, 0)+timedelta(minutes=125), timedelta(minutes=5)).astype(
+        datetime)
+    glucose = np.arange(t.size)*2. + 100
+    glucose[0:2] = [np.nan, np.nan]
+    glucose[10:12] = [np.nan, np.nan]
+    glucose[-2:] = [np.nan, np.nan]
+    d = {'t': t, 'glucose': glucose}
+    data = pd.DataFrame(data=d)
+
+    #Tests
+    results = impute_glucose(data, 15)
+
+    # Leading and trailing gaps are left as they are, inner gaps are imputed
+    assert results.glucose.values.size == data.glucose.values.size
+    assert np.all(np.isnan(results.glucose.values[0:2]))
+    assert np.all(np.isnan(results.glucose.values[-2:]))
+    assert results.glucose[10] == 120
+    assert results.glucose[11] == 122
+    assert np.all(results.glucose.values[2:10] == data.glucose.values[2:10])
+    assert np.all(results.glucose.values[12:-2] == data.glucose.values[12:-2])
@@ -108,3 +108,12 @@ def test_retime_glucose():
     assert pd.to_datetime(results.t.values[0]).to_pydatetime().minute == 0
     assert pd.to_datetime(results.t.values[1]).to_pydatetime().minute == 12
     assert pd.to_datetime(results.t.values[2]).to_pydatetime().minute == 24
+
+    # 4. check retime with a fractional timestep (timestep = 2.5)
+    results = retime_glucose(data, 2.5)
+
+    assert results.glucose.values.size == 11
+    assert np.all(np.diff(results.t.values) == np.timedelta64(150, 's'))
+    assert results.glucose.values[0] == 40
+    assert results.glucose.values[2] == 50
+    assert results.glucose.values[10] == 120
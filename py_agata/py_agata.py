@@ -1,12 +1,353 @@
 import numpy as np
+import pandas as pd
+import hashlib
+from copy import deepcopy
+from collections import OrderedDict
+from functools import reduce
+from operator import getitem
+from types import SimpleNamespace
+import os
+from concurrent.futures import ProcessPoolExecutor
 from statsmodels.stats.diagnostic import lilliefors
-from scipy.stats import ttest_ind, wilcoxon, mannwhitneyu,ranksums
+try:
+    # Private statsmodels API, used to batch the Lilliefors tests (see _lilliefors_critvals)
+    from statsmodels.stats._lilliefors import get_lilliefors_table
+except ImportError:
+    get_lilliefors_table = None
+from scipy.stats import norm, ttest_ind, wilcoxon, mannwhitneyu, ranksums
 
 from py_agata.variability import *
 from py_agata.time_in_ranges import *
 from py_agata.risk import *
 from py_agata.glycemic_transformation import *
 from py_agata.inspection import *
+from py_agata.variability import _mean_glucose, _median_glucose, _std_glucose, _cv_glucose, _range_glucose, \
+    _iqr_glucose, _auc_glucose_over_basal, _gmi, _cogi, _j_index, _daily_excursions, _mage_plus_index, \
+    _mage_minus_index, _mage_index, _ef_index, _conga, _modd, _sddm_index, _sdw_index, _std_glucose_roc, _cvga
+from py_agata.time_in_ranges import _time_in_ranges
+from py_agata.risk import _adrr, _lbgi, _hbgi, _bgri, _gri
+from py_agata.glycemic_transformation import _mr_index, _hypo_index, _hyper_index, _igc, _grade_hypo_score, \
+    _grade_hyper_score, _grade_eu_score, _grade_score
+from py_agata.inspection import _number_days_of_observation, _missing_glucose_percentage
+
+
+def _summarize(values):
+    """
+    Computes the mean, std, median and the 5th, 25th, 75th, 95th percentiles of the given values along their last
+    axis (ignoring nan values). The values are sorted only once and every statistic is derived from the sorted
+    values. Percentiles are linearly interpolated as in `np.nanpercentile`.
+
+    Parameters
+    ----------
+    values: np.ndarray
+        A vector (or a matrix with one row per metric) of double containing the values to summarize.
+
+    Returns
+    -------
+    summary: dict
+        A dictionary containing the `mean`, `std`, `median`, `prc_5`, `prc_25`, `prc_75`, `prc_95` of the
+        values. Each statistic is a float if `values` is a vector, a vector with one element per row otherwise.
+
+    Raises
+    ------
+    None
+
+    See Also
+    --------
+    None
+
+    Examples
+    --------
+    None
+
+    References
+    ----------
+    None
+    """
+    v = np.sort(np.atleast_2d(values), axis=-1)  # nan values are sorted last
+
+    # Without values (e.g., an empty arm) all the statistics are nan
+    if v.shape[-1] == 0:
+        summary = {stat: np.full(shape=v.shape[:-1], fill_value=np.nan)
+                   for stat in ['mean', 'std', 'median', 'prc_5', 'prc_25', 'prc_75', 'prc_95']}
+        if np.ndim(values) == 1:
+            summary = {stat: summary[stat][0] for stat in summary}
+        return summary
+    invalid = np.isnan(v)
+    n = v.shape[-1] - np.count_nonzero(invalid, axis=-1)
+    empty = n == 0
+
+    # Scratch buffer holding the (centered and squared) values with nans zeroed, reused by mean and std
+    scratch = np.copy(v)
+    np.copyto(scratch, 0, where=invalid)
+
+    summary = dict()
+    with np.errstate(invalid='ignore', divide='ignore'):
+        summary['mean'] = np.sum(scratch, axis=-1) / n
+        np.subtract(v, summary['mean'][:, np.newaxis], out=scratch)
+        np.square(scratch, out=scratch)
+        np.copyto(scratch, 0, where=invalid)
+        summary['std'] = np.sqrt(np.sum(scratch, axis=-1) / n)
+
+    # Interpolate all the percentiles at once between the two closest ranks
+    stats = ['median', 'prc_5', 'prc_25', 'prc_75', 'prc_95']
+    last = np.maximum(n - 1, 0)[:, np.newaxis]
+    rank = np.array([50, 5, 25, 75, 95]) / 100 * last
+    lo = np.floor(rank).astype(int)
+    hi = np.minimum(lo + 1, last)
+    gamma = rank - lo
+    a = np.take_along_axis(v, lo, axis=-1)
+    b = np.take_along_axis(v, hi, axis=-1)
+    prc = np.where(gamma >= 0.5, b - (b - a) * (1 - gamma), a + (b - a) * gamma)
+    prc[empty] = np.nan
+    for i in range(len(stats)):
+        summary[stats[i]] = prc[:, i]
+
+    # Reorder the statistics as expected and return scalars for vectors
+    summary = {stat: summary[stat] for stat in ['mean', 'std', 'median', 'prc_5', 'prc_25', 'prc_75', 'prc_95']}
+    if np.ndim(values) == 1:
+        summary = {stat: summary[stat][0] for stat in summary}
+    return summary
+
+
+def _lilliefors_pvalues(values, valid, n):
+    """
+    Computes the p-values of the Lilliefors normality test of each row of the given matrix (ignoring nan values), as
+    `statsmodels.stats.diagnostic.lilliefors` does, but batching the rows with the same number of valid values: their
+    Kolmogorov-Smirnov statistics are computed at once and their p-values are interpolated in the critical values of
+    their number of observations with a single call. If the critical values cannot be read from statsmodels, each row
+    is tested with `statsmodels.stats.diagnostic.lilliefors`.
+
+    Parameters
+    ----------
+    values: np.ndarray
+        A matrix of double containing the values to test (one row per test).
+    valid: np.ndarray
+        A matrix of bool flagging the non-nan values.
+    n: np.ndarray
+        A vector of int containing the number of non-nan values of each row.
+
+    Returns
+    -------
+    pvalues: np.ndarray
+        A vector of double containing the p-value of each row (0 for rows with less than 4 values, that cannot be
+        tested).
+
+    Raises
+    ------
+    None
+
+    See Also
+    --------
+    statsmodels.stats.diagnostic.lilliefors
+
+    Examples
+    --------
+    None
+
+    References
+    ----------
+    - Lilliefors, "On the Kolmogorov-Smirnov test for normality with mean and
+    variance unknown", Journal of the American Statistical Association, 1967,
+    vol. 62, pp. 399-402. DOI: 10.1080/01621459.1967.10482916.
+    """
+    pvalues = np.zeros(shape=(values.shape[0],))
+    for nobs in np.unique(n[n >= 4]):
+        rows = np.where(n == nobs)[0]
+        x = np.stack([values[i][valid[i]] for i in rows])
+
+        # Standardize and sort the values of each row
+        z = np.sort((x - x.mean(axis=1, keepdims=True)) / x.std(axis=1, ddof=1, keepdims=True), axis=1)
+
+        # Kolmogorov-Smirnov statistic against the standard normal
+        cdf = norm.cdf(z)
+        d_plus = (np.arange(1.0, nobs + 1) / nobs - cdf).max(axis=1)
+        d_min = (cdf - np.arange(0.0, nobs) / nobs).max(axis=1)
+        d_ks = np.maximum(d_plus, d_min)
+
+        # Interpolate the p-values in the critical values of nobs (outside them, the p-values are clipped to the
+        # smallest or largest tabulated ones)
+        table = _lilliefors_critvals(nobs)
+        if table is None:
+            pvalues[rows] = [lilliefors(x[i])[1] for i in range(x.shape[0])]
+        else:
+            pvalues[rows] = np.interp(d_ks, table[0], table[1])
+
+    return pvalues
+
+
+# Critical values of the Lilliefors normality test, and the corresponding p-values, already interpolated for a
+# number of observations (see _lilliefors_critvals)
+_LILLIEFORS_CRITVALS = dict()
+
+
+def _lilliefors_critvals(nobs):
+    """
+    Returns the critical values of the Lilliefors normality test, and the corresponding p-values, for the given number
+    of observations. They are interpolated in the statsmodels table only the first time a number of observations is
+    required. The table is a private statsmodels API: if it is not available (or it changed), None is returned.
+
+    Parameters
+    ----------
+    nobs: int
+        The number of observations of the test.
+
+    Returns
+    -------
+    table: tuple or None
+        The vector of double containing the critical values of the test (in increasing order) and the vector of
+        double containing the corresponding p-values, or None if they cannot be read from statsmodels.
+
+    Raises
+    ------
+    None
+
+    See Also
+    --------
+    statsmodels.stats.diagnostic.lilliefors
+
+    Examples
+    --------
+    None
+
+    References
+    ----------
+    None
+    """
+    nobs = int(nobs)
+    if nobs not in _LILLIEFORS_CRITVALS:
+        try:
+            table = get_lilliefors_table(dist='norm')
+            critvals = np.asarray(table._critvals(nobs), dtype=float)
+            alpha = np.asarray(table.alpha, dtype=float)
+            if table.signcrit < 1:
+                # Sort the critical values in increasing order
+                critvals, alpha = critvals[::-1], alpha[::-1]
+            _LILLIEFORS_CRITVALS[nobs] = (critvals, alpha) if critvals.shape == alpha.shape else None
+        except (TypeError, AttributeError, ValueError):
+            # The table is not available (e.g., get_lilliefors_table is None) or its internals changed
+            _LILLIEFORS_CRITVALS[nobs] = None
+    return _LILLIEFORS_CRITVALS[nobs]
+
+
+def _run_tests(r1_matrix, r2_matrix, is_paired, alpha, identical=(1, 0), normality_test=True):
+    """
+    Compares, metric by metric, the values of two arms with the proper statistical test, i.e.:
+        - t-test if at least one arm has less than 4 values or if both arms are gaussian distributed (checked with the
+        Lilliefors test)
+        - Wilcoxon rank test if `is_paired` and at least one of the arms is not gaussian distributed
+        - Mann-Whitney U-test if not `is_paired` and at least one of the arms is not gaussian distributed.
+    If not `normality_test`, the arms are assumed not gaussian distributed.
+    The nan masks and the number of valid values of all the metrics are computed at once.
+
+    Parameters
+    ----------
+    r1_matrix: np.ndarray
+        A matrix of double containing the values of the first arm (one row per metric, one column per subject).
+    r2_matrix: np.ndarray
+        A matrix of double containing the values of the second arm (one row per metric, one column per subject).
+    is_paired: bool
+        A boolean flag defining whether the arms are paired.
+    alpha: float
+        The significance level of the tests.
+    identical: tuple, optional, default (1, 0)
+        The `p` and `h` to return, without testing, when the paired values of a metric are identical.
+    normality_test: bool, optional, default True
+        A boolean flag defining whether to check if the arms are gaussian distributed.
+
+    Returns
+    -------
+    p: np.ndarray
+        A vector of double containing the p-value of the test of each metric.
+    h: np.ndarray
+        A vector of double containing the null hypothesis rejection (1 or 0, nan if the p-value is nan) of the test of
+        each metric.
+
+    Raises
+    ------
+    None
+
+    See Also
+    --------
+    None
+
+    Examples
+    --------
+    None
+
+    References
+    ----------
+    None
+    """
+    # Get the non-nan masks (also of the pairs) and the number of non-nan values of all the metrics once
+    valid_1 = ~np.isnan(r1_matrix)
+    valid_2 = ~np.isnan(r2_matrix)
+    valid_pairs = valid_1 & valid_2 if is_paired else None
+    n_1 = np.count_nonzero(valid_1, axis=1)
+    n_2 = np.count_nonzero(valid_2, axis=1)
+
+    # Choose the test of each metric: the t-test is used anyway if an arm has less than 4 values, so the Lilliefors
+    # test is run only on the metrics where both arms have at least 4 values
+    use_ttest = (n_1 < 4) | (n_2 < 4)
+    tested = ~use_ttest
+    if normality_test and np.any(tested):
+        p_1 = _lilliefors_pvalues(r1_matrix[tested], valid_1[tested], n_1[tested])
+        p_2 = _lilliefors_pvalues(r2_matrix[tested], valid_2[tested], n_2[tested])
+        use_ttest[tested] = ((p_1 > 0.05) | np.isnan(p_1)) & ((p_2 > 0.05) | np.isnan(p_2))
+
+    # Run the t-test and Mann-Whitney U-test on all the metrics they apply to at once
+    pvalues = np.full(shape=(r1_matrix.shape[0],), fill_value=np.nan)
+    if np.any(use_ttest):
+        pvalues[use_ttest] = ttest_ind(r1_matrix[use_ttest], r2_matrix[use_ttest], axis=1, nan_policy="omit").pvalue
+    if not is_paired and not np.all(use_ttest):
+        pvalues[~use_ttest] = mannwhitneyu(r1_matrix[~use_ttest], r2_matrix[~use_ttest], axis=1).pvalue
+
+    is_identical = np.zeros(shape=(r1_matrix.shape[0],), dtype=bool)
+    if is_paired:
+        # Find the metrics, not tested with the t-test, whose non-nan pairs are identical, all at once
+        is_identical = ~use_ttest & np.all((r1_matrix == r2_matrix) | ~valid_pairs, axis=1)
+
+        # Run the Wilcoxon rank test on the non-nan pairs of the other ones
+        for i in np.where(~use_ttest & ~is_identical)[0]:
+            pvalues[i] = wilcoxon(r1_matrix[i][valid_pairs[i]], r2_matrix[i][valid_pairs[i]]).pvalue
+
+    # Reject the null hypotheses of all the metrics at once
+    h = np.where(np.isnan(pvalues), np.nan, pvalues < alpha)
+    pvalues[is_identical] = identical[0]
+    h[is_identical] = identical[1]
+
+    return pvalues, h
+
+
+# Event metrics reported by Agata.analyze_one_arm as (category, levels, event finder). The event finders of the
+# categories with a `None` level do not distinguish levels nor take the glycemic target.
+_EVENTS_SPEC = [('hyperglycemic_events', ['hyper', 'l1', 'l2'], find_hyperglycemic_events_by_level),
+                ('hypoglycemic_events', ['hypo', 'l1', 'l2'], find_hypoglycemic_events_by_level),
+                ('extended_hypoglycemic_events', [None], find_extended_hypoglycemic_events)]
+_EVENTS_FIELDS = ['mean_duration', 'events_per_week']
+# Address (category, level, field) of each event metric, in the order they are stacked by Agata.analyze_one_arm
+_EVENTS_ADDR = [(category, level, field) for category, levels, _ in _EVENTS_SPEC for level in levels
+                for field in _EVENTS_FIELDS]
+
+# Statistical comparisons run by Agata.compare_two_arms as (path of the metrics in the results, metrics, p and h to
+# return when the paired values are identical). Identical paired event metrics are not tested.
+_CMP_SCHEMA = [(('variability',), ['mean_glucose', 'median_glucose', 'std_glucose', 'cv_glucose', 'range_glucose',
+                                   'iqr_glucose', 'auc_glucose', 'gmi', 'cogi', 'conga', 'j_index', 'mage_index',
+                                   'mage_minus_index', 'mage_plus_index', 'ef_index', 'modd', 'sddm_index',
+                                   'sdw_index', 'std_glucose_roc', 'cvga'], (1, 0)),
+               (('time_in_ranges',), ['time_in_target', 'time_in_tight_target', 'time_in_hypoglycemia',
+                                      'time_in_l1_hypoglycemia', 'time_in_l2_hypoglycemia', 'time_in_hyperglycemia',
+                                      'time_in_l1_hyperglycemia', 'time_in_l2_hyperglycemia'], (1, 0)),
+               (('risk',), ['adrr', 'lbgi', 'hbgi', 'bgri', 'gri'], (1, 0)),
+               (('glycemic_transformation',), ['grade_score', 'grade_hypo_score', 'grade_hyper_score',
+                                               'grade_eu_score', 'igc', 'hypo_index', 'hyper_index', 'mr_index'],
+                (1, 0)),
+               (('data_quality',), ['number_days_of_observation', 'missing_glucose_percentage'], (1, 0))] + \
+              [(('events', category, level), _EVENTS_FIELDS, (np.nan, np.nan))
+               for category, levels in [('hypoglycemic_events', ['hypo', 'l1', 'l2']),
+                                        ('hyperglycemic_events', ['hyper', 'l1', 'l2'])] for level in levels] + \
+              [(('events', 'extended_hypoglycemic_events'), _EVENTS_FIELDS, (np.nan, np.nan))]
+
 
 class Agata:
     """
@@ -17,6 +358,9 @@ class Agata:
     ----------
     glycemic_target: str
         A string defining the set of glycemic targets to use.
+    cache_size: int
+        The maximum number of arms (and of subjects) whose results are kept by `compare_two_arms` to reuse them when
+        the same arm (or subject) is compared again. If 0, nothing is kept.
 
     Methods
     -------
@@ -24,8 +368,90 @@ class Agata:
         Runs ReplayBG.
     """
 
-    def __init__(self, glycemic_target='diabetes'):
+    def __init__(self, glycemic_target='diabetes', cache_size=0):
+        # Check input
+        check_int_parameter(cache_size)
+
         self.glycemic_target = glycemic_target
+        self.cache_size = cache_size
+
+        # Per-analysis cache of the intermediate results shared by several metrics, keyed by id of the data
+        self._cache = dict()
+
+        # Results of the arms last analyzed by compare_two_arms, keyed by their content (see `_subject_key`), from the
+        # least to the most recently used
+        self._arm_cache = OrderedDict()
+
+        # Metrics of the subjects last analyzed by compare_two_arms, keyed by their content (see `_subject_key`), from
+        # the least to the most recently used
+        self._subject_cache = OrderedDict()
+
+        # Metric functions computed by analyze_one_arm for each subject, built once
+        self._metric_list, self._metric_list_name = self._arm_metrics()
+
+    def __getstate__(self):
+        """
+        Returns the state of the object to pickle (e.g., to send it to the worker processes of `analyze_one_arm`).
+        Only the arguments of the constructor are pickled: the metric functions cannot be pickled and are rebuilt,
+        while the caches are not shared with the worker processes.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        state: dict
+            A dictionary containing the arguments to rebuild the object with.
+
+        Raises
+        ------
+        None
+
+        See Also
+        --------
+        None
+
+        Examples
+        --------
+        None
+
+        References
+        ----------
+        None
+        """
+        return {'glycemic_target': self.glycemic_target, 'cache_size': self.cache_size}
+
+    def __setstate__(self, state):
+        """
+        Rebuilds the object from its pickled state.
+
+        Parameters
+        ----------
+        state: dict
+            A dictionary containing the arguments to rebuild the object with, as returned by `__getstate__`.
+
+        Returns
+        -------
+        None
+
+        Raises
+        ------
+        None
+
+        See Also
+        --------
+        None
+
+        Examples
+        --------
+        None
+
+        References
+        ----------
+        None
+        """
+        self.__init__(**state)
 
     def analyze_glucose_profile(self, data):
         """
@@ -75,76 +501,71 @@ class Agata:
         check_data_columns(data)
         check_homogeneous_timegrid(data)
 
+        # Extract the data arrays once
+        self._cache.clear()
+        arrays = self._profile_arrays(data)
+
         results = dict()
 
-        # Get variability metrics
-        results['variability'] = dict()
-        results['variability']['mean_glucose'] = mean_glucose(data)
-        results['variability']['median_glucose'] = median_glucose(data)
-        results['variability']['std_glucose'] = std_glucose(data)
-        results['variability']['cv_glucose'] = cv_glucose(data)
-        results['variability']['range_glucose'] = range_glucose(data)
-        results['variability']['iqr_glucose'] = iqr_glucose(data)
-        results['variability']['auc_glucose'] = auc_glucose(data)
-        results['variability']['gmi'] = gmi(data)
-        results['variability']['cogi'] = cogi(data)
-        results['variability']['conga'] = conga(data)
-        results['variability']['j_index'] = j_index(data)
-        results['variability']['mage_plus_index'] = mage_plus_index(data)
-        results['variability']['mage_minus_index'] = mage_minus_index(data)
-        results['variability']['mage_index'] = mage_index(data)
-        results['variability']['ef_index'] = ef_index(data)
-        results['variability']['modd'] = modd(data)
-        results['variability']['sddm_index'] = sddm_index(data)
-        results['variability']['sdw_index'] = sdw_index(data)
-        results['variability']['std_glucose_roc'] = std_glucose_roc(data)
-        results['variability']['cvga'] = cvga(data)
-
-        # Get time metrics
-        results['time_in_ranges'] = dict()
-        results['time_in_ranges']['time_in_target'] = time_in_target(data, self.glycemic_target)
-        results['time_in_ranges']['time_in_tight_target'] = time_in_tight_target(data, self.glycemic_target)
-        results['time_in_ranges']['time_in_hypoglycemia'] = time_in_hypoglycemia(data, self.glycemic_target)
-        results['time_in_ranges']['time_in_l1_hypoglycemia'] = time_in_l1_hypoglycemia(data, self.glycemic_target)
-        results['time_in_ranges']['time_in_l2_hypoglycemia'] = time_in_l2_hypoglycemia(data, self.glycemic_target)
-        results['time_in_ranges']['time_in_hyperglycemia'] = time_in_hyperglycemia(data, self.glycemic_target)
-        results['time_in_ranges']['time_in_l1_hyperglycemia'] = time_in_l1_hyperglycemia(data, self.glycemic_target)
-        results['time_in_ranges']['time_in_l2_hyperglycemia'] = time_in_l2_hyperglycemia(data, self.glycemic_target)
-
-        # Get risk metrics
-        results['risk'] = dict()
-        results['risk']['adrr'] = adrr(data)
-        results['risk']['lbgi'] = lbgi(data)
-        results['risk']['hbgi'] = hbgi(data)
-        results['risk']['bgri'] = bgri(data)
-        results['risk']['gri'] = gri(data)
-
-        # Get glycemic transformation metrics
-        results['glycemic_transformation'] = dict()
-        results['glycemic_transformation']['grade_score'] = grade_score(data)
-        results['glycemic_transformation']['grade_hypo_score'] = grade_hypo_score(data)
-        results['glycemic_transformation']['grade_hyper_score'] = grade_hyper_score(data)
-        results['glycemic_transformation']['grade_eu_score'] = grade_eu_score(data)
-        results['glycemic_transformation']['igc'] = igc(data)
-        results['glycemic_transformation']['hypo_index'] = hypo_index(data)
-        results['glycemic_transformation']['hyper_index'] = hyper_index(data)
-        results['glycemic_transformation']['mr_index'] = mr_index(data)
-
-        # Event metrics
-        results['events'] = dict()
-        results['events']['hypoglycemic_events'] = find_hypoglycemic_events_by_level(data, glycemic_target=self.glycemic_target)
-        results['events']['hyperglycemic_events'] = find_hyperglycemic_events_by_level(data, glycemic_target=self.glycemic_target)
-        results['events']['extended_hypoglycemic_events'] = find_extended_hypoglycemic_events(data)
-
-        # Data quality metrics
-        results['data_quality'] = dict()
-        results['data_quality']['number_days_of_observation'] = number_days_of_observation(data)
-        results['data_quality']['missing_glucose_percentage'] = missing_glucose_percentage(data)
+        # Set the metrics to compute as (category, name, function, arguments)
+        metrics = [('variability', 'mean_glucose', _mean_glucose, (arrays.values,)),
+                   ('variability', 'median_glucose', _median_glucose, (arrays.values,)),
+                   ('variability', 'std_glucose', _std_glucose, (arrays.values,)),
+                   ('variability', 'cv_glucose', _cv_glucose, (arrays.values,)),
+                   ('variability', 'range_glucose', _range_glucose, (arrays.values,)),
+                   ('variability', 'iqr_glucose', _iqr_glucose, (arrays.values,)),
+                   ('variability', 'auc_glucose', _auc_glucose_over_basal,
+                    (arrays.glucose, 0., arrays.sample_time)),
+                   ('variability', 'gmi', _gmi, (arrays.values,)),
+                   ('variability', 'cogi', _cogi, (arrays.glucose, self._get_time_in_ranges(arrays, 'diabetes'),
+                                                   _std_glucose(arrays.values))),
+                   ('variability', 'conga', _conga, (arrays.t, arrays.glucose)),
+                   ('variability', 'j_index', _j_index, (arrays.values,)),
+                   ('variability', 'mage_plus_index', _mage_plus_index, (self._get_daily_excursions(arrays),)),
+                   ('variability', 'mage_minus_index', _mage_minus_index, (self._get_daily_excursions(arrays),)),
+                   ('variability', 'mage_index', _mage_index, (self._get_daily_excursions(arrays),)),
+                   ('variability', 'ef_index', _ef_index, (self._get_daily_excursions(arrays),)),
+                   ('variability', 'modd', _modd, (arrays.t, arrays.glucose)),
+                   ('variability', 'sddm_index', _sddm_index, (arrays.t, arrays.glucose)),
+                   ('variability', 'sdw_index', _sdw_index, (arrays.t, arrays.glucose)),
+                   ('variability', 'std_glucose_roc', _std_glucose_roc, (arrays.glucose,)),
+                   ('variability', 'cvga', _cvga, (arrays.glucose,)),
+                   ('time_in_ranges', None, self._get_time_in_ranges, (arrays, self.glycemic_target)),
+                   ('risk', 'adrr', _adrr, (arrays.t, arrays.glucose)),
+                   ('risk', 'lbgi', _lbgi, (arrays.values,)),
+                   ('risk', 'hbgi', _hbgi, (arrays.values,)),
+                   ('risk', 'bgri', _bgri, (arrays.values,)),
+                   ('risk', 'gri', _gri, (arrays.glucose, self._get_time_in_ranges(arrays, 'diabetes'))),
+                   ('glycemic_transformation', 'grade_score', _grade_score, (arrays.values,)),
+                   ('glycemic_transformation', 'grade_hypo_score', _grade_hypo_score,
+                    (arrays.values,)),
+                   ('glycemic_transformation', 'grade_hyper_score', _grade_hyper_score,
+                    (arrays.values,)),
+                   ('glycemic_transformation', 'grade_eu_score', _grade_eu_score,
+                    (arrays.values,)),
+                   ('glycemic_transformation', 'igc', _igc, (arrays.values,)),
+                   ('glycemic_transformation', 'hypo_index', _hypo_index, (arrays.values,)),
+                   ('glycemic_transformation', 'hyper_index', _hyper_index, (arrays.values,)),
+                   ('glycemic_transformation', 'mr_index', _mr_index, (arrays.values,)),
+                   ('events', 'hypoglycemic_events', find_hypoglycemic_events_by_level,
+                    (data, self.glycemic_target)),
+                   ('events', 'hyperglycemic_events', find_hyperglycemic_events_by_level,
+                    (data, self.glycemic_target)),
+                   ('events', 'extended_hypoglycemic_events', find_extended_hypoglycemic_events, (data,)),
+                   ('data_quality', 'number_days_of_observation', _number_days_of_observation, (arrays.t,)),
+                   ('data_quality', 'missing_glucose_percentage', _missing_glucose_percentage, (arrays.glucose,))]
+
+        # Compute the metrics
+        for category, name, function, arguments in metrics:
+            if name is None:
+                results[category] = function(*arguments)
+            else:
+                results.setdefault(category, dict())[name] = function(*arguments)
 
         # Return results
         return results
 
-    def analyze_one_arm(self, data):
+    def analyze_one_arm(self, data, n_jobs=1, _prepared_arrays=None):
         """
         Analyzes glucose data of one arm.
 
@@ -153,6 +574,13 @@ class Agata:
         data: list of pd.DataFrame
             List of pandas dataframes with a column `glucose` containing the glucose data
             to analyze (in mg/dl).
+        n_jobs: int, optional, default 1
+            The maximum number of worker processes used to analyze the subjects. If 1, the subjects are analyzed
+            serially in the calling process. If -1, one process per CPU is used. When processes are used on platforms
+            that spawn them (e.g., Windows, macOS), the calling script must be guarded by `if __name__ == '__main__'`.
+        _prepared_arrays: list of SimpleNamespace, optional
+            Internal. The arrays of each glucose profile already extracted by the caller (see `_profile_arrays`),
+            which has already checked the data and owns the per-analysis cache (e.g., `compare_two_arms`).
 
         Returns
         -------
@@ -188,254 +616,82 @@ class Agata:
         ----------
         None
         """
-        for d in data:
-            # Check input
-            check_dataframe(d)
-            check_data_columns(d)
-            check_homogeneous_timegrid(d)
-
-        results = dict()
-
-
-        # Variability
-        results["variability"] = dict()
-        metric_list = [mean_glucose, median_glucose, std_glucose, cv_glucose, range_glucose, iqr_glucose,
-                       auc_glucose, gmi, cogi, conga, j_index, mage_index, mage_minus_index, mage_plus_index,
-                       ef_index, modd, sddm_index, sdw_index, std_glucose_roc, cvga]
-        metric_list_name = ['mean_glucose', 'median_glucose', 'std_glucose', 'cv_glucose', 'range_glucose',
-                            'iqr_glucose',
-                            'auc_glucose', 'gmi', 'cogi', 'conga', 'j_index', 'mage_index', 'mage_minus_index',
-                            'mage_plus_index',
-                            'ef_index', 'modd', 'sddm_index', 'sdw_index', 'std_glucose_roc', 'cvga']
-
-        for m in range(len(metric_list_name)):
-            results["variability"][metric_list_name[m]] = dict()
-            results["variability"][metric_list_name[m]]["values"] = np.zeros(shape=(len(data),))
+        # Check input (unless already checked by the caller that prepared the arrays)
+        check_int_parameter(n_jobs)
+        if _prepared_arrays is None:
+            for d in {id(d): d for d in data}.values():
+                # Check input (once per dataframe, even if given more than once)
+                check_dataframe(d)
+                check_data_columns(d)
+                check_homogeneous_timegrid(d)
+
+        # Extract the data arrays of each subject once (unless already extracted by the caller)
+        if _prepared_arrays is None:
+            self._cache.clear()
+            profiles = [self._profile_arrays(d) for d in data]
+        else:
+            profiles = _prepared_arrays
+
+        # Get the subjects not analyzed yet (the same dataframe might be given more than once, e.g., in both arms)
+        keys = [(id(p.data), 'subject') for p in profiles]
+        to_analyze = dict()
+        for key, p in zip(keys, profiles):
+            if key not in self._cache:
+                to_analyze[key] = p
+
+        # Compute all the metrics of each of them, in parallel processes if required and there are several
+        # subjects (no more processes than subjects are started)
+        n_workers = min(len(to_analyze), (os.cpu_count() or 1) if n_jobs == -1 else max(n_jobs, 1))
+        if n_workers > 1:
+            chunksize = max(1, len(to_analyze) // (4 * n_workers))
+            with ProcessPoolExecutor(max_workers=n_workers) as executor:
+                analyzed = executor.map(self._analyze_one_subject, to_analyze.values(), chunksize=chunksize)
+                self._cache.update(zip(to_analyze.keys(), analyzed))
+        else:
+            self._cache.update((key, self._analyze_one_subject(p)) for key, p in to_analyze.items())
+        subjects = [self._cache[key] for key in keys]
+
+        # Collect the metrics of each category (one row per metric, one column per subject) in float64 matrices, so
+        # that the values of each metric are C-contiguous float64 rows
+        metric_list_name = self._metric_list_name
+        values = dict()
+        for category in metric_list_name:
+            values[category] = np.empty(shape=(len(metric_list_name[category]), len(data)), dtype=np.float64)
             for d in range(len(data)):
-                results["variability"][metric_list_name[m]]["values"][d] = metric_list[m](data[d])
-            results["variability"][metric_list_name[m]]["mean"] = np.nanmean(results["variability"][metric_list_name[m]]["values"])
-            results["variability"][metric_list_name[m]]["std"] = np.nanstd(results["variability"][metric_list_name[m]]["values"])
-            results["variability"][metric_list_name[m]]["median"] = np.nanmedian(results["variability"][metric_list_name[m]]["values"])
-            results["variability"][metric_list_name[m]]["prc_5"] = np.nanpercentile(results["variability"][metric_list_name[m]]["values"], 5)
-            results["variability"][metric_list_name[m]]["prc_25"] = np.nanpercentile(results["variability"][metric_list_name[m]]["values"], 25)
-            results["variability"][metric_list_name[m]]["prc_75"] = np.nanpercentile(results["variability"][metric_list_name[m]]["values"], 75)
-            results["variability"][metric_list_name[m]]["prc_95"] = np.nanpercentile(results["variability"][metric_list_name[m]]["values"], 95)
-
+                values[category][:, d] = subjects[d][category]
 
-        # Time in ranges
-        results["time_in_ranges"] = dict()
-        metric_list = [time_in_target, time_in_tight_target, time_in_hypoglycemia,
-                       time_in_l1_hypoglycemia, time_in_l2_hypoglycemia, time_in_hyperglycemia,
-                       time_in_l1_hyperglycemia, time_in_l2_hyperglycemia]
-        metric_list_name = ['time_in_target', 'time_in_tight_target', 'time_in_hypoglycemia',
-                            'time_in_l1_hypoglycemia', 'time_in_l2_hypoglycemia', 'time_in_hyperglycemia',
-                            'time_in_l1_hyperglycemia', 'time_in_l2_hyperglycemia']
-
-        for m in range(len(metric_list_name)):
-            results["time_in_ranges"][metric_list_name[m]] = dict()
-            results["time_in_ranges"][metric_list_name[m]]["values"] = np.zeros(shape=(len(data),))
-            for d in range(len(data)):
-                results["time_in_ranges"][metric_list_name[m]]["values"][d] = metric_list[m](data[d], self.glycemic_target)
-            results["time_in_ranges"][metric_list_name[m]]["mean"] = np.nanmean(
-                results["time_in_ranges"][metric_list_name[m]]["values"])
-            results["time_in_ranges"][metric_list_name[m]]["std"] = np.nanstd(
-                results["time_in_ranges"][metric_list_name[m]]["values"])
-            results["time_in_ranges"][metric_list_name[m]]["median"] = np.nanmedian(
-                results["time_in_ranges"][metric_list_name[m]]["values"])
-            results["time_in_ranges"][metric_list_name[m]]["prc_5"] = np.nanpercentile(
-                results["time_in_ranges"][metric_list_name[m]]["values"], 5)
-            results["time_in_ranges"][metric_list_name[m]]["prc_25"] = np.nanpercentile(
-                results["time_in_ranges"][metric_list_name[m]]["values"], 25)
-            results["time_in_ranges"][metric_list_name[m]]["prc_75"] = np.nanpercentile(
-                results["time_in_ranges"][metric_list_name[m]]["values"], 75)
-            results["time_in_ranges"][metric_list_name[m]]["prc_95"] = np.nanpercentile(
-                results["time_in_ranges"][metric_list_name[m]]["values"], 95)
-
-        # Risk
-        results["risk"] = dict()
-        metric_list = [adrr, lbgi, hbgi, bgri, gri]
-        metric_list_name = ['adrr', 'lbgi', 'hbgi', 'bgri', 'gri']
-
-        for m in range(len(metric_list_name)):
-            results["risk"][metric_list_name[m]] = dict()
-            results["risk"][metric_list_name[m]]["values"] = np.zeros(shape=(len(data),))
-            for d in range(len(data)):
-                results["risk"][metric_list_name[m]]["values"][d] = metric_list[m](data[d])
-            results["risk"][metric_list_name[m]]["mean"] = np.nanmean(
-                results["risk"][metric_list_name[m]]["values"])
-            results["risk"][metric_list_name[m]]["std"] = np.nanstd(
-                results["risk"][metric_list_name[m]]["values"])
-            results["risk"][metric_list_name[m]]["median"] = np.nanmedian(
-                results["risk"][metric_list_name[m]]["values"])
-            results["risk"][metric_list_name[m]]["prc_5"] = np.nanpercentile(
-                results["risk"][metric_list_name[m]]["values"], 5)
-            results["risk"][metric_list_name[m]]["prc_25"] = np.nanpercentile(
-                results["risk"][metric_list_name[m]]["values"], 25)
-            results["risk"][metric_list_name[m]]["prc_75"] = np.nanpercentile(
-                results["risk"][metric_list_name[m]]["values"], 75)
-            results["risk"][metric_list_name[m]]["prc_95"] = np.nanpercentile(
-                results["risk"][metric_list_name[m]]["values"], 95)
-
-        # Glycemic transformation
-        results["glycemic_transformation"] = dict()
-        metric_list = [grade_score, grade_hypo_score, grade_hyper_score,
-                       grade_eu_score, igc, hypo_index,
-                       hyper_index, mr_index]
-        metric_list_name = ['grade_score', 'grade_hypo_score', 'grade_hyper_score',
-                            'grade_eu_score', 'igc', 'hypo_index','hyper_index',
-                            'mr_index']
-
-        for m in range(len(metric_list_name)):
-            results["glycemic_transformation"][metric_list_name[m]] = dict()
-            results["glycemic_transformation"][metric_list_name[m]]["values"] = np.zeros(shape=(len(data),))
-            for d in range(len(data)):
-                results["glycemic_transformation"][metric_list_name[m]]["values"][d] = metric_list[m](data[d])
-            results["glycemic_transformation"][metric_list_name[m]]["mean"] = np.nanmean(
-                results["glycemic_transformation"][metric_list_name[m]]["values"])
-            results["glycemic_transformation"][metric_list_name[m]]["std"] = np.nanstd(
-                results["glycemic_transformation"][metric_list_name[m]]["values"])
-            results["glycemic_transformation"][metric_list_name[m]]["median"] = np.nanmedian(
-                results["glycemic_transformation"][metric_list_name[m]]["values"])
-            results["glycemic_transformation"][metric_list_name[m]]["prc_5"] = np.nanpercentile(
-                results["glycemic_transformation"][metric_list_name[m]]["values"], 5)
-            results["glycemic_transformation"][metric_list_name[m]]["prc_25"] = np.nanpercentile(
-                results["glycemic_transformation"][metric_list_name[m]]["values"], 25)
-            results["glycemic_transformation"][metric_list_name[m]]["prc_75"] = np.nanpercentile(
-                results["glycemic_transformation"][metric_list_name[m]]["values"], 75)
-            results["glycemic_transformation"][metric_list_name[m]]["prc_95"] = np.nanpercentile(
-                results["glycemic_transformation"][metric_list_name[m]]["values"], 95)
-
-        # Data quality
-        results["data_quality"] = dict()
-        metric_list = [number_days_of_observation, missing_glucose_percentage]
-        metric_list_name = ['number_days_of_observation','missing_glucose_percentage']
-
-        for m in range(len(metric_list_name)):
-            results["data_quality"][metric_list_name[m]] = dict()
-            results["data_quality"][metric_list_name[m]]["values"] = np.zeros(shape=(len(data),))
-            for d in range(len(data)):
-                results["data_quality"][metric_list_name[m]]["values"][d] = metric_list[m](data[d])
-            results["data_quality"][metric_list_name[m]]["mean"] = np.nanmean(
-                results["data_quality"][metric_list_name[m]]["values"])
-            results["data_quality"][metric_list_name[m]]["std"] = np.nanstd(
-                results["data_quality"][metric_list_name[m]]["values"])
-            results["data_quality"][metric_list_name[m]]["median"] = np.nanmedian(
-                results["data_quality"][metric_list_name[m]]["values"])
-            results["data_quality"][metric_list_name[m]]["prc_5"] = np.nanpercentile(
-                results["data_quality"][metric_list_name[m]]["values"], 5)
-            results["data_quality"][metric_list_name[m]]["prc_25"] = np.nanpercentile(
-                results["data_quality"][metric_list_name[m]]["values"], 25)
-            results["data_quality"][metric_list_name[m]]["prc_75"] = np.nanpercentile(
-                results["data_quality"][metric_list_name[m]]["values"], 75)
-            results["data_quality"][metric_list_name[m]]["prc_95"] = np.nanpercentile(
-                results["data_quality"][metric_list_name[m]]["values"], 95)
+        # Aggregate the metrics of each category
+        results = dict()
+        for category in metric_list_name:
+            summary = _summarize(values[category])
+
+            results[category] = dict()
+            for m in range(len(metric_list_name[category])):
+                results[category][metric_list_name[category][m]] = dict()
+                results[category][metric_list_name[category][m]]["values"] = values[category][m]
+                for stat in summary:
+                    results[category][metric_list_name[category][m]][stat] = summary[stat][m]
+
+        # Events (one row per category, level and field, one column per subject)
+        event_values = np.empty(shape=(len(_EVENTS_ADDR), len(data)), dtype=np.float64)
+        for d in range(len(data)):
+            event_values[:, d] = subjects[d]["events"]
 
-        # Events
+        # Compute the statistics of all the events at once and scatter them
+        summary = _summarize(event_values)
         results["events"] = dict()
-        results["events"]["hyperglycemic_events"] = dict()
-        results["events"]["hyperglycemic_events"]["hyper"] = dict()
-        results["events"]["hyperglycemic_events"]["hyper"]["mean_duration"] = dict()
-        results["events"]["hyperglycemic_events"]["hyper"]["mean_duration"]["values"] = np.zeros(shape=(len(data),))
-        results["events"]["hyperglycemic_events"]["hyper"]["events_per_week"] = dict()
-        results["events"]["hyperglycemic_events"]["hyper"]["events_per_week"]["values"] = np.zeros(shape=(len(data),))
-        results["events"]["hyperglycemic_events"]["l1"] = dict()
-        results["events"]["hyperglycemic_events"]["l1"]["mean_duration"] = dict()
-        results["events"]["hyperglycemic_events"]["l1"]["mean_duration"]["values"] = np.zeros(shape=(len(data),))
-        results["events"]["hyperglycemic_events"]["l1"]["events_per_week"] = dict()
-        results["events"]["hyperglycemic_events"]["l1"]["events_per_week"]["values"] = np.zeros(shape=(len(data),))
-        results["events"]["hyperglycemic_events"]["l2"] = dict()
-        results["events"]["hyperglycemic_events"]["l2"]["mean_duration"] = dict()
-        results["events"]["hyperglycemic_events"]["l2"]["mean_duration"]["values"] = np.zeros(shape=(len(data),))
-        results["events"]["hyperglycemic_events"]["l2"]["events_per_week"] = dict()
-        results["events"]["hyperglycemic_events"]["l2"]["events_per_week"]["values"] = np.zeros(shape=(len(data),))
-
-        results["events"]["hypoglycemic_events"] = dict()
-        results["events"]["hypoglycemic_events"]["hypo"] = dict()
-        results["events"]["hypoglycemic_events"]["hypo"]["mean_duration"] = dict()
-        results["events"]["hypoglycemic_events"]["hypo"]["mean_duration"]["values"] = np.zeros(shape=(len(data),))
-        results["events"]["hypoglycemic_events"]["hypo"]["events_per_week"] = dict()
-        results["events"]["hypoglycemic_events"]["hypo"]["events_per_week"]["values"] = np.zeros(shape=(len(data),))
-        results["events"]["hypoglycemic_events"]["l1"] = dict()
-        results["events"]["hypoglycemic_events"]["l1"]["mean_duration"] = dict()
-        results["events"]["hypoglycemic_events"]["l1"]["mean_duration"]["values"] = np.zeros(shape=(len(data),))
-        results["events"]["hypoglycemic_events"]["l1"]["events_per_week"] = dict()
-        results["events"]["hypoglycemic_events"]["l1"]["events_per_week"]["values"] = np.zeros(shape=(len(data),))
-        results["events"]["hypoglycemic_events"]["l2"] = dict()
-        results["events"]["hypoglycemic_events"]["l2"]["mean_duration"] = dict()
-        results["events"]["hypoglycemic_events"]["l2"]["mean_duration"]["values"] = np.zeros(shape=(len(data),))
-        results["events"]["hypoglycemic_events"]["l2"]["events_per_week"] = dict()
-        results["events"]["hypoglycemic_events"]["l2"]["events_per_week"]["values"] = np.zeros(shape=(len(data),))
-
-        results["events"]["extended_hypoglycemic_events"] = dict()
-        results["events"]["extended_hypoglycemic_events"]["mean_duration"] = dict()
-        results["events"]["extended_hypoglycemic_events"]["mean_duration"]["values"] = np.zeros(shape=(len(data),))
-        results["events"]["extended_hypoglycemic_events"]["events_per_week"] = dict()
-        results["events"]["extended_hypoglycemic_events"]["events_per_week"]["values"] = np.zeros(shape=(len(data),))
-
-        for d in range(len(data)):
-            r = find_hyperglycemic_events_by_level(data[d], glycemic_target=self.glycemic_target)
-            results["events"]["hyperglycemic_events"]["hyper"]["mean_duration"]["values"][d] = r["hyper"]["mean_duration"]
-            results["events"]["hyperglycemic_events"]["hyper"]["events_per_week"]["values"][d] = r["hyper"]["events_per_week"]
-            results["events"]["hyperglycemic_events"]["l1"]["mean_duration"]["values"][d] = r["l1"]["mean_duration"]
-            results["events"]["hyperglycemic_events"]["l1"]["events_per_week"]["values"][d] = r["l1"]["events_per_week"]
-            results["events"]["hyperglycemic_events"]["l2"]["mean_duration"]["values"][d] = r["l2"]["mean_duration"]
-            results["events"]["hyperglycemic_events"]["l2"]["events_per_week"]["values"][d] = r["l2"]["events_per_week"]
-
-            r = find_hypoglycemic_events_by_level(data[d], glycemic_target=self.glycemic_target)
-            results["events"]["hypoglycemic_events"]["hypo"]["mean_duration"]["values"][d] = r["hypo"]["mean_duration"]
-            results["events"]["hypoglycemic_events"]["hypo"]["events_per_week"]["values"][d] = r["hypo"]["events_per_week"]
-            results["events"]["hypoglycemic_events"]["l1"]["mean_duration"]["values"][d] = r["l1"]["mean_duration"]
-            results["events"]["hypoglycemic_events"]["l1"]["events_per_week"]["values"][d] = r["l1"]["events_per_week"]
-            results["events"]["hypoglycemic_events"]["l2"]["mean_duration"]["values"][d] = r["l2"]["mean_duration"]
-            results["events"]["hypoglycemic_events"]["l2"]["events_per_week"]["values"][d] = r["l2"]["events_per_week"]
-
-            r = find_extended_hypoglycemic_events(data[d])
-            results["events"]["extended_hypoglycemic_events"]["mean_duration"]["values"][d] = r["mean_duration"]
-            results["events"]["extended_hypoglycemic_events"]["events_per_week"]["values"][d] = r["events_per_week"]
-
-        stat = ["mean", "std", "median"]
-        f_stat = [np.nanmean, np.nanstd, np.nanmedian]
-        prc = ["prc_5","prc_25","prc_75","prc_95"]
-        qs = [5, 25, 75, 95]
-        for s in range(len(stat)):
-            results["events"]["hyperglycemic_events"]["hyper"]["mean_duration"][stat[s]] = f_stat[s](results["events"]["hyperglycemic_events"]["hyper"]["mean_duration"]["values"])
-            results["events"]["hyperglycemic_events"]["hyper"]["events_per_week"][stat[s]] = f_stat[s](results["events"]["hyperglycemic_events"]["hyper"]["events_per_week"]["values"])
-            results["events"]["hyperglycemic_events"]["l1"]["mean_duration"][stat[s]] = f_stat[s](results["events"]["hyperglycemic_events"]["l1"]["mean_duration"]["values"])
-            results["events"]["hyperglycemic_events"]["l1"]["events_per_week"][stat[s]] = f_stat[s](results["events"]["hyperglycemic_events"]["l1"]["events_per_week"]["values"])
-            results["events"]["hyperglycemic_events"]["l2"]["mean_duration"][stat[s]] = f_stat[s](results["events"]["hyperglycemic_events"]["l2"]["mean_duration"]["values"])
-            results["events"]["hyperglycemic_events"]["l2"]["events_per_week"][stat[s]] = f_stat[s](results["events"]["hyperglycemic_events"]["l2"]["events_per_week"]["values"])
-
-            results["events"]["hypoglycemic_events"]["hypo"]["mean_duration"][stat[s]] = f_stat[s](results["events"]["hypoglycemic_events"]["hypo"]["mean_duration"]["values"])
-            results["events"]["hypoglycemic_events"]["hypo"]["events_per_week"][stat[s]] = f_stat[s](results["events"]["hypoglycemic_events"]["hypo"]["events_per_week"]["values"])
-            results["events"]["hypoglycemic_events"]["l1"]["mean_duration"][stat[s]] = f_stat[s](results["events"]["hypoglycemic_events"]["l1"]["mean_duration"]["values"])
-            results["events"]["hypoglycemic_events"]["l1"]["events_per_week"][stat[s]] = f_stat[s](results["events"]["hypoglycemic_events"]["l1"]["events_per_week"]["values"])
-            results["events"]["hypoglycemic_events"]["l2"]["mean_duration"][stat[s]] = f_stat[s](results["events"]["hypoglycemic_events"]["l2"]["mean_duration"]["values"])
-            results["events"]["hypoglycemic_events"]["l2"]["events_per_week"][stat[s]] = f_stat[s](results["events"]["hypoglycemic_events"]["l2"]["events_per_week"]["values"])
-
-            results["events"]["extended_hypoglycemic_events"]["mean_duration"][stat[s]] = f_stat[s](results["events"]["extended_hypoglycemic_events"]["mean_duration"]["values"])
-            results["events"]["extended_hypoglycemic_events"]["events_per_week"][stat[s]] = f_stat[s](results["events"]["extended_hypoglycemic_events"]["events_per_week"]["values"])
-
-        for s in range(len(prc)):
-            results["events"]["hyperglycemic_events"]["hyper"]["mean_duration"][prc[s]] = np.nanpercentile(results["events"]["hyperglycemic_events"]["hyper"]["mean_duration"]["values"], qs[s])
-            results["events"]["hyperglycemic_events"]["hyper"]["events_per_week"][prc[s]] = np.nanpercentile(results["events"]["hyperglycemic_events"]["hyper"]["events_per_week"]["values"], qs[s])
-            results["events"]["hyperglycemic_events"]["l1"]["mean_duration"][prc[s]] = np.nanpercentile(results["events"]["hyperglycemic_events"]["l1"]["mean_duration"]["values"], qs[s])
-            results["events"]["hyperglycemic_events"]["l1"]["events_per_week"][prc[s]] = np.nanpercentile(results["events"]["hyperglycemic_events"]["l1"]["events_per_week"]["values"], qs[s])
-            results["events"]["hyperglycemic_events"]["l2"]["mean_duration"][prc[s]] = np.nanpercentile(results["events"]["hyperglycemic_events"]["l2"]["mean_duration"]["values"], qs[s])
-            results["events"]["hyperglycemic_events"]["l2"]["events_per_week"][prc[s]] = np.nanpercentile(results["events"]["hyperglycemic_events"]["l2"]["events_per_week"]["values"], qs[s])
-
-            results["events"]["hypoglycemic_events"]["hypo"]["mean_duration"][prc[s]] = np.nanpercentile(results["events"]["hypoglycemic_events"]["hypo"]["mean_duration"]["values"], qs[s])
-            results["events"]["hypoglycemic_events"]["hypo"]["events_per_week"][prc[s]] = np.nanpercentile(results["events"]["hypoglycemic_events"]["hypo"]["events_per_week"]["values"], qs[s])
-            results["events"]["hypoglycemic_events"]["l1"]["mean_duration"][prc[s]] = np.nanpercentile(results["events"]["hypoglycemic_events"]["l1"]["mean_duration"]["values"], qs[s])
-            results["events"]["hypoglycemic_events"]["l1"]["events_per_week"][prc[s]] = np.nanpercentile(results["events"]["hypoglycemic_events"]["l1"]["events_per_week"]["values"], qs[s])
-            results["events"]["hypoglycemic_events"]["l2"]["mean_duration"][prc[s]] = np.nanpercentile(results["events"]["hypoglycemic_events"]["l2"]["mean_duration"]["values"], qs[s])
-            results["events"]["hypoglycemic_events"]["l2"]["events_per_week"][prc[s]] = np.nanpercentile(results["events"]["hypoglycemic_events"]["l2"]["events_per_week"]["values"], qs[s])
-
-            results["events"]["extended_hypoglycemic_events"]["mean_duration"][prc[s]] = np.nanpercentile(results["events"]["extended_hypoglycemic_events"]["mean_duration"]["values"], qs[s])
-            results["events"]["extended_hypoglycemic_events"]["events_per_week"][prc[s]] = np.nanpercentile(results["events"]["extended_hypoglycemic_events"]["events_per_week"]["values"], qs[s])
+        for i, (category, level, field) in enumerate(_EVENTS_ADDR):
+            level_results = results["events"].setdefault(category, dict())
+            if level is not None:
+                level_results = level_results.setdefault(level, dict())
+            level_results[field] = dict()
+            level_results[field]["values"] = event_values[i]
+            for stat in summary:
+                level_results[field][stat] = summary[stat][i]
 
         return results
 
-    def compare_two_arms(self, arm_1, arm_2, is_paired, alpha):
+    def compare_two_arms(self, arm_1, arm_2, is_paired, alpha, normality_test=True):
         """
         Analyzes and compares glucose data of one arm.
 
@@ -452,6 +708,10 @@ class Agata:
             when data of the same patients are present in both arms, unpaired otherwise
         alpha: float
             The significance level to use during the statistical analysis
+        normality_test: bool, optional, default True
+            A boolean flag defining whether to check if the samples are gaussian distributed (with the Lilliefors test)
+            to choose the statistical test. If False, the samples are assumed not gaussian distributed (e.g., for
+            metrics known to be skewed) and the rank tests are used, skipping the Lilliefors tests
 
         Returns
         -------
@@ -482,6 +742,7 @@ class Agata:
                 (checked with the Lilliefors test)
                 - Mann-Whitney U-test if the test not `is_paired` and at least one of the samples is not gaussian
                 distributed (checked with the Lilliefors test).
+                The t-test is also used if one of the samples has less than 4 values.
         Raises
         ------
         None
@@ -498,415 +759,439 @@ class Agata:
         ----------
         None
         """
-        for d in arm_1:
-            # Check input
-            check_dataframe(d)
-            check_data_columns(d)
-            check_homogeneous_timegrid(d)
-        for d in arm_2:
-            # Check input
+        for d in {id(d): d for d in list(arm_1) + list(arm_2)}.values():
+            # Check input (once per dataframe, even if given more than once or in both arms)
             check_dataframe(d)
             check_data_columns(d)
             check_homogeneous_timegrid(d)
 
+        # Reuse (a copy of) the arms analyzed by previous comparisons, if kept (e.g., when an arm is compared against
+        # several others)
+        arms = {"arm_1": arm_1, "arm_2": arm_2}
         results = dict()
-        results["arm_1"] = self.analyze_one_arm(arm_1)
-        results["arm_2"] = self.analyze_one_arm(arm_2)
+        if self.cache_size > 0:
+            subject_keys = {id(d): self._subject_key(d) for d in list(arm_1) + list(arm_2)}
+            keys = {name: tuple(subject_keys[id(d)] for d in arm) for name, arm in arms.items()}
+            for name in arms:
+                if keys[name] in self._arm_cache:
+                    self._arm_cache.move_to_end(keys[name])
+                    results[name] = deepcopy(self._arm_cache[keys[name]])
+        to_analyze = [name for name in arms if name not in results]
+
+        # Extract the data arrays of each subject once for both arms (a dataframe shared by the arms, e.g., when
+        # paired, is also analyzed once) and reuse the metrics of the subjects analyzed by previous comparisons
+        self._cache.clear()
+        profiles = dict()
+        for name in to_analyze:
+            for d in arms[name]:
+                if id(d) not in profiles:
+                    profiles[id(d)] = self._profile_arrays(d)
+                    if self.cache_size > 0 and subject_keys[id(d)] in self._subject_cache:
+                        self._subject_cache.move_to_end(subject_keys[id(d)])
+                        self._cache[(id(d), 'subject')] = self._subject_cache[subject_keys[id(d)]]
+
+        for name in to_analyze:
+            results[name] = self.analyze_one_arm(arms[name], _prepared_arrays=[profiles[id(d)] for d in arms[name]])
+        results = {name: results[name] for name in arms}
+
+        # Keep (a copy of) the new arms and subjects, evicting the least recently used ones
+        if self.cache_size > 0:
+            for key in profiles:
+                self._keep(self._subject_cache, subject_keys[key], self._cache[(key, 'subject')])
+            for name in to_analyze:
+                self._keep(self._arm_cache, keys[name], deepcopy(results[name]))
+
+        # Run the tests of each category
         stats = dict()
+        for path, metric_list_name, identical in _CMP_SCHEMA:
+            arm_1_results = reduce(getitem, path, results["arm_1"])
+            arm_2_results = reduce(getitem, path, results["arm_2"])
+            r1 = np.stack([arm_1_results[m]["values"] for m in metric_list_name])
+            r2 = np.stack([arm_2_results[m]["values"] for m in metric_list_name])
+            p, h = _run_tests(r1, r2, is_paired, alpha, identical=identical, normality_test=normality_test)
+
+            # Collect the tests (h as an int, unless it is nan)
+            category_stats = reduce(lambda d, k: d.setdefault(k, dict()), path, stats)
+            for m in range(len(metric_list_name)):
+                category_stats[metric_list_name[m]] = {"p": p[m], "h": h[m] if np.isnan(h[m]) else int(h[m])}
 
-        # Variability
-        stats["variability"] = dict()
-        metric_list_name = ['mean_glucose', 'median_glucose', 'std_glucose', 'cv_glucose', 'range_glucose',
-                            'iqr_glucose',
-                            'auc_glucose', 'gmi', 'cogi', 'conga', 'j_index', 'mage_index', 'mage_minus_index',
-                            'mage_plus_index',
-                            'ef_index', 'modd', 'sddm_index', 'sdw_index', 'std_glucose_roc', 'cvga']
-
-        for m in metric_list_name:
-            r1 = results["arm_1"]["variability"][m]["values"]
-            r2 = results["arm_2"]["variability"][m]["values"]
-
-            # Correct for lilliefors behaviour
-            if(r1[~np.isnan(r1)].size >= 4):
-                ks, p1 = lilliefors(r1[~np.isnan(r1)])
-            else:
-                p1 = 0
-            if (r2[~np.isnan(r2)].size >= 4):
-                ks, p2 = lilliefors(r2[~np.isnan(r2)])
-            else:
-                p2 = 0
-
-            stats["variability"][m] = dict()
-            if np.sum(~np.isnan(r1)) < 4 or np.sum(~np.isnan(r2)) < 4 or ((p1 > 0.05 or np.isnan(p1)) and (p2 > 0.05 or np.isnan(p2))):
-                t = ttest_ind(r1, r2, nan_policy="omit")
-                stats["variability"][m]["p"] = t.pvalue
-                if np.isnan(stats["variability"][m]["p"]):
-                    stats["variability"][m]["h"] = np.nan
-                else:
-                    stats["variability"][m]["h"] = 1 * (t.pvalue < alpha)
-            else:
-                if is_paired:
-                    idxs = np.where(np.logical_and(~np.isnan(r1), ~np.isnan(r2)))[0]
-                    if np.all(r1[idxs] - r2[idxs]) == 0:
-                        stats["variability"][m]["h"] = 0
-                        stats["variability"][m]["p"] = 1
-                    else:
-                        t = wilcoxon(r1, r2, nan_policy="omit")
-                        stats["variability"][m]["p"] = t.pvalue
-                        if np.isnan(stats["variability"][m]["p"]):
-                            stats["variability"][m]["h"] = np.nan
-                        else:
-                            stats["variability"][m]["h"] = 1 * (t.pvalue < alpha)
-                else:
-                    t = mannwhitneyu(r1, r2)
-                    stats["variability"][m]["p"] = t.pvalue
-                    if np.isnan(stats["variability"][m]["p"]):
-                        stats["variability"][m]["h"] = np.nan
-                    else:
-                        stats["variability"][m]["h"] = 1 * (t.pvalue < alpha)
+        return results, stats
+
+    def clear_arm_cache(self):
+        """
+        Clears the results of the arms (and of their subjects) kept by `compare_two_arms`, which are otherwise reused
+        when the same arm (or subject) is compared again.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        None
+
+        Raises
+        ------
+        None
+
+        See Also
+        --------
+        Agata.compare_two_arms
+
+        Examples
+        --------
+        None
+
+        References
+        ----------
+        None
+        """
+        self._arm_cache.clear()
+        self._subject_cache.clear()
+
+    def _keep(self, cache, key, value):
+        """
+        Keeps a value in one of the caches of `compare_two_arms` as the most recently used, evicting the least
+        recently used values beyond `cache_size`.
+
+        Parameters
+        ----------
+        cache: OrderedDict
+            The cache to keep the value in, ordered from the least to the most recently used value.
+        key: tuple
+            The key of the value (see `_subject_key`).
+        value: object
+            The value to keep.
+
+        Returns
+        -------
+        None
+
+        Raises
+        ------
+        None
+
+        See Also
+        --------
+        None
+
+        Examples
+        --------
+        None
+
+        References
+        ----------
+        None
+        """
+        cache[key] = value
+        cache.move_to_end(key)
+        while len(cache) > self.cache_size:
+            cache.popitem(last=False)
+
+    def _subject_key(self, data):
+        """
+        Returns the key of a subject in the cache of `compare_two_arms`, i.e., the glycemic target and the hash of the
+        content of its glucose profile (so that a modified dataframe is analyzed again). The key of an arm is the tuple
+        of the keys of its subjects.
+
+        Parameters
+        ----------
+        data: pd.DataFrame
+            Pandas dataframe with a column `glucose` containing the glucose data of the subject.
+
+        Returns
+        -------
+        key: tuple
+            The key of the subject.
+
+        Raises
+        ------
+        None
+
+        See Also
+        --------
+        None
+
+        Examples
+        --------
+        None
+
+        References
+        ----------
+        None
+        """
+        return self.glycemic_target, hashlib.sha1(pd.util.hash_pandas_object(data, index=False).values).hexdigest()
+
+    def _arm_metrics(self):
+        """
+        Returns the metrics computed by `analyze_one_arm` for each subject, grouped by category. The time in ranges
+        and the events are not included since they are computed all at once. It is called once, in `__init__`.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        metric_list: dict
+            A dictionary containing, for each category, the tuple of the metric functions of the subject profile
+            arrays (as returned by `_profile_arrays`).
+        metric_list_name: dict
+            A dictionary containing, for each category, the list of the metric names. It includes the time in
+            ranges category.
+
+        Raises
+        ------
+        None
+
+        See Also
+        --------
+        None
+
+        Examples
+        --------
+        None
+
+        References
+        ----------
+        None
+        """
+        metric_list = dict()
+        metric_list["variability"] = [lambda p: _mean_glucose(p.values),
+                                      lambda p: _median_glucose(p.values),
+                                      lambda p: _std_glucose(p.values),
+                                      lambda p: _cv_glucose(p.values),
+                                      lambda p: _range_glucose(p.values),
+                                      lambda p: _iqr_glucose(p.values),
+                                      lambda p: _auc_glucose_over_basal(p.glucose, 0., p.sample_time),
+                                      lambda p: _gmi(p.values),
+                                      lambda p: _cogi(p.glucose, self._get_time_in_ranges(p, 'diabetes'),
+                                                      _std_glucose(p.values)),
+                                      lambda p: _conga(p.t, p.glucose),
+                                      lambda p: _j_index(p.values),
+                                      lambda p: _mage_index(self._get_daily_excursions(p)),
+                                      lambda p: _mage_minus_index(self._get_daily_excursions(p)),
+                                      lambda p: _mage_plus_index(self._get_daily_excursions(p)),
+                                      lambda p: _ef_index(self._get_daily_excursions(p)),
+                                      lambda p: _modd(p.t, p.glucose), lambda p: _sddm_index(p.t, p.glucose),
+                                      lambda p: _sdw_index(p.t, p.glucose),
+                                      lambda p: _std_glucose_roc(p.glucose), lambda p: _cvga(p.glucose)]
+        metric_list["risk"] = [lambda p: _adrr(p.t, p.glucose), lambda p: _lbgi(p.values),
+                               lambda p: _hbgi(p.values),
+                               lambda p: _bgri(p.values),
+                               lambda p: _gri(p.glucose, self._get_time_in_ranges(p, 'diabetes'))]
+        metric_list["glycemic_transformation"] = [lambda p: _grade_score(p.values),
+                                                  lambda p: _grade_hypo_score(p.values),
+                                                  lambda p: _grade_hyper_score(p.values),
+                                                  lambda p: _grade_eu_score(p.values), lambda p: _igc(p.values),
+                                                  lambda p: _hypo_index(p.values), lambda p: _hyper_index(p.values),
+                                                  lambda p: _mr_index(p.values)]
+        metric_list["data_quality"] = [lambda p: _number_days_of_observation(p.t),
+                                       lambda p: _missing_glucose_percentage(p.glucose)]
+
+        # Freeze the metric functions
+        metric_list = {category: tuple(metric_list[category]) for category in metric_list}
+
+        metric_list_name = dict()
+        metric_list_name["variability"] = ['mean_glucose', 'median_glucose', 'std_glucose', 'cv_glucose',
+                                           'range_glucose', 'iqr_glucose', 'auc_glucose', 'gmi', 'cogi', 'conga',
+                                           'j_index', 'mage_index', 'mage_minus_index', 'mage_plus_index', 'ef_index',
+                                           'modd', 'sddm_index', 'sdw_index', 'std_glucose_roc', 'cvga']
+        metric_list_name["time_in_ranges"] = ['time_in_target', 'time_in_tight_target', 'time_in_hypoglycemia',
+                                              'time_in_l1_hypoglycemia', 'time_in_l2_hypoglycemia',
+                                              'time_in_hyperglycemia', 'time_in_l1_hyperglycemia',
+                                              'time_in_l2_hyperglycemia']
+        metric_list_name["risk"] = ['adrr', 'lbgi', 'hbgi', 'bgri', 'gri']
+        metric_list_name["glycemic_transformation"] = ['grade_score', 'grade_hypo_score', 'grade_hyper_score',
+                                                       'grade_eu_score', 'igc', 'hypo_index', 'hyper_index',
+                                                       'mr_index']
+        metric_list_name["data_quality"] = ['number_days_of_observation', 'missing_glucose_percentage']
+
+        return metric_list, metric_list_name
+
+    def _analyze_one_subject(self, arrays):
+        """
+        Computes all the metrics of `analyze_one_arm` for a single subject.
+
+        Parameters
+        ----------
+        arrays: SimpleNamespace
+            The arrays of the glucose profile of the subject, as returned by `_profile_arrays`.
+
+        Returns
+        -------
+        results: dict
+            A dictionary containing, for each category, the vector of the metric values (ordered as in
+            `_metric_list_name`) and, in `events`, the vector of the event metrics (ordered as in `_EVENTS_ADDR`).
+
+        Raises
+        ------
+        None
+
+        See Also
+        --------
+        None
+
+        Examples
+        --------
+        None
+
+        References
+        ----------
+        None
+        """
+        metric_list, metric_list_name = self._metric_list, self._metric_list_name
+
+        results = dict()
+
+        # Without glucose data (e.g., empty or all nan profiles) the glucose metrics are nan: skip their computation
+        no_glucose = bool(np.isnan(arrays.glucose).all())
 
         # Time in ranges
-        stats["time_in_ranges"] = dict()
-        metric_list_name = ['time_in_target', 'time_in_tight_target', 'time_in_hypoglycemia',
-                            'time_in_l1_hypoglycemia', 'time_in_l2_hypoglycemia', 'time_in_hyperglycemia',
-                            'time_in_l1_hyperglycemia', 'time_in_l2_hyperglycemia']
-
-        for m in metric_list_name:
-            r1 = results["arm_1"]["time_in_ranges"][m]["values"]
-            r2 = results["arm_2"]["time_in_ranges"][m]["values"]
-
-            # Correct for lilliefors behaviour
-            if (r1[~np.isnan(r1)].size >= 4):
-                ks, p1 = lilliefors(r1[~np.isnan(r1)])
-            else:
-                p1 = 0
-            if (r2[~np.isnan(r2)].size >= 4):
-                ks, p2 = lilliefors(r2[~np.isnan(r2)])
-            else:
-                p2 = 0
-
-            stats["time_in_ranges"][m] = dict()
-            if np.sum(~np.isnan(r1)) < 4 or np.sum(~np.isnan(r2)) < 4 or (
-                    (p1 > 0.05 or np.isnan(p1)) and (p2 > 0.05 or np.isnan(p2))):
-                t = ttest_ind(r1, r2, nan_policy="omit")
-                stats["time_in_ranges"][m]["p"] = t.pvalue
-                if np.isnan(stats["time_in_ranges"][m]["p"]):
-                    stats["time_in_ranges"][m]["h"] = np.nan
-                else:
-                    stats["time_in_ranges"][m]["h"] = 1 * (t.pvalue < alpha)
+        if no_glucose:
+            results["time_in_ranges"] = np.full(len(metric_list_name["time_in_ranges"]), np.nan)
+        else:
+            time_in_ranges = self._get_time_in_ranges(arrays, self.glycemic_target)
+            results["time_in_ranges"] = np.array(
+                [time_in_ranges[name] for name in metric_list_name["time_in_ranges"]], dtype=np.float64)
+
+        # Other metrics (data quality is computed anyway)
+        for category in metric_list:
+            if no_glucose and category != "data_quality":
+                results[category] = np.full(len(metric_list[category]), np.nan)
             else:
-                if is_paired:
-                    idxs = np.where(np.logical_and(~np.isnan(r1), ~np.isnan(r2)))[0]
-                    if np.all(r1[idxs] - r2[idxs]) == 0:
-                        stats["time_in_ranges"][m]["h"] = 0
-                        stats["time_in_ranges"][m]["p"] = 1
-                    else:
-                        t = wilcoxon(r1, r2, nan_policy="omit")
-                        stats["time_in_ranges"][m]["p"] = t.pvalue
-                        if np.isnan(stats["time_in_ranges"][m]["p"]):
-                            stats["time_in_ranges"][m]["h"] = np.nan
-                        else:
-                            stats["time_in_ranges"][m]["h"] = 1 * (t.pvalue < alpha)
-                else:
-                    t = mannwhitneyu(r1, r2)
-                    stats["time_in_ranges"][m]["p"] = t.pvalue
-                    if np.isnan(stats["time_in_ranges"][m]["p"]):
-                        stats["time_in_ranges"][m]["h"] = np.nan
-                    else:
-                        stats["time_in_ranges"][m]["h"] = 1 * (t.pvalue < alpha)
-        # Risk
-        stats["risk"] = dict()
-        metric_list_name = ['adrr', 'lbgi', 'hbgi', 'bgri', 'gri']
-
-        for m in metric_list_name:
-            r1 = results["arm_1"]["risk"][m]["values"]
-            r2 = results["arm_2"]["risk"][m]["values"]
-
-            # Correct for lilliefors behaviour
-            if (r1[~np.isnan(r1)].size >= 4):
-                ks, p1 = lilliefors(r1[~np.isnan(r1)])
-            else:
-                p1 = 0
-            if (r2[~np.isnan(r2)].size >= 4):
-                ks, p2 = lilliefors(r2[~np.isnan(r2)])
-            else:
-                p2 = 0
-
-            stats["risk"][m] = dict()
-            if np.sum(~np.isnan(r1)) < 4 or np.sum(~np.isnan(r2)) < 4 or (
-                    (p1 > 0.05 or np.isnan(p1)) and (p2 > 0.05 or np.isnan(p2))):
-                t = ttest_ind(r1, r2, nan_policy="omit")
-                stats["risk"][m]["p"] = t.pvalue
-                if np.isnan(stats["risk"][m]["p"]):
-                    stats["risk"][m]["h"] = np.nan
-                else:
-                    stats["risk"][m]["h"] = 1 * (t.pvalue < alpha)
-            else:
-                if is_paired:
-                    idxs = np.where(np.logical_and(~np.isnan(r1), ~np.isnan(r2)))[0]
-                    if np.all(r1[idxs] - r2[idxs]) == 0:
-                        stats["risk"][m]["h"] = 0
-                        stats["risk"][m]["p"] = 1
-                    else:
-                        t = wilcoxon(r1, r2, nan_policy="omit")
-                        stats["risk"][m]["p"] = t.pvalue
-                        if np.isnan(stats["risk"][m]["p"]):
-                            stats["risk"][m]["h"] = np.nan
-                        else:
-                            stats["risk"][m]["h"] = 1 * (t.pvalue < alpha)
-                else:
-                    t = mannwhitneyu(r1, r2)
-                    stats["risk"][m]["p"] = t.pvalue
-                    if np.isnan(stats["risk"][m]["p"]):
-                        stats["risk"][m]["h"] = np.nan
-                    else:
-                        stats["risk"][m]["h"] = 1 * (t.pvalue < alpha)
-
-        # Glycemic transformation
-        stats["glycemic_transformation"] = dict()
-        metric_list_name = ['grade_score', 'grade_hypo_score', 'grade_hyper_score',
-                                        'grade_eu_score', 'igc', 'hypo_index', 'hyper_index',
-                                        'mr_index']
-
-        for m in metric_list_name:
-            r1 = results["arm_1"]["glycemic_transformation"][m]["values"]
-            r2 = results["arm_2"]["glycemic_transformation"][m]["values"]
-
-            # Correct for lilliefors behaviour
-            if (r1[~np.isnan(r1)].size >= 4):
-                ks, p1 = lilliefors(r1[~np.isnan(r1)])
-            else:
-                p1 = 0
-            if (r2[~np.isnan(r2)].size >= 4):
-                ks, p2 = lilliefors(r2[~np.isnan(r2)])
-            else:
-                p2 = 0
-
-            stats["glycemic_transformation"][m] = dict()
-            if np.sum(~np.isnan(r1)) < 4 or np.sum(~np.isnan(r2)) < 4 or (
-                    (p1 > 0.05 or np.isnan(p1)) and (p2 > 0.05 or np.isnan(p2))):
-                t = ttest_ind(r1, r2, nan_policy="omit")
-                stats["glycemic_transformation"][m]["p"] = t.pvalue
-                if np.isnan(stats["glycemic_transformation"][m]["p"]):
-                    stats["glycemic_transformation"][m]["h"] = np.nan
-                else:
-                    stats["glycemic_transformation"][m]["h"] = 1 * (t.pvalue < alpha)
-            else:
-                if is_paired:
-                    idxs = np.where(np.logical_and(~np.isnan(r1), ~np.isnan(r2)))[0]
-                    if np.all(r1[idxs] - r2[idxs]) == 0:
-                        stats["glycemic_transformation"][m]["h"] = 0
-                        stats["glycemic_transformation"][m]["p"] = 1
-                    else:
-                        t = wilcoxon(r1, r2, nan_policy="omit")
-                        stats["glycemic_transformation"][m]["p"] = t.pvalue
-                        if np.isnan(stats["glycemic_transformation"][m]["p"]):
-                            stats["glycemic_transformation"][m]["h"] = np.nan
-                        else:
-                            stats["glycemic_transformation"][m]["h"] = 1 * (t.pvalue < alpha)
-                else:
-                    t = mannwhitneyu(r1, r2)
-                    stats["glycemic_transformation"][m]["p"] = t.pvalue
-                    if np.isnan(stats["glycemic_transformation"][m]["p"]):
-                        stats["glycemic_transformation"][m]["h"] = np.nan
-                    else:
-                        stats["glycemic_transformation"][m]["h"] = 1 * (t.pvalue < alpha)
-
-        # Data quality
-        stats["data_quality"] = dict()
-        metric_list_name = ['number_days_of_observation','missing_glucose_percentage']
-
-        for m in metric_list_name:
-            r1 = results["arm_1"]["data_quality"][m]["values"]
-            r2 = results["arm_2"]["data_quality"][m]["values"]
-
-            # Correct for lilliefors behaviour
-            if (r1[~np.isnan(r1)].size >= 4):
-                ks, p1 = lilliefors(r1[~np.isnan(r1)])
-            else:
-                p1 = 0
-            if (r2[~np.isnan(r2)].size >= 4):
-                ks, p2 = lilliefors(r2[~np.isnan(r2)])
-            else:
-                p2 = 0
-
-            stats["data_quality"][m] = dict()
-            if np.sum(~np.isnan(r1)) < 4 or np.sum(~np.isnan(r2)) < 4 or (
-                    (p1 > 0.05 or np.isnan(p1)) and (p2 > 0.05 or np.isnan(p2))):
-                t = ttest_ind(r1, r2, nan_policy="omit")
-                stats["data_quality"][m]["p"] = t.pvalue
-                if np.isnan(stats["data_quality"][m]["p"]):
-                    stats["data_quality"][m]["h"] = np.nan
-                else:
-                    stats["data_quality"][m]["h"] = 1 * (t.pvalue < alpha)
-            else:
-                if is_paired:
-                    idxs = np.where(np.logical_and(~np.isnan(r1), ~np.isnan(r2)))[0]
-                    if np.all(r1[idxs] - r2[idxs]) == 0:
-                        stats["data_quality"][m]["h"] = 0
-                        stats["data_quality"][m]["p"] = 1
-                    else:
-                        t = wilcoxon(r1, r2, nan_policy="omit")
-                        stats["data_quality"][m]["p"] = t.pvalue
-                        if np.isnan(stats["data_quality"][m]["p"]):
-                            stats["data_quality"][m]["h"] = np.nan
-                        else:
-                            stats["data_quality"][m]["h"] = 1 * (t.pvalue < alpha)
-                else:
-                    t = mannwhitneyu(r1, r2)
-                    stats["data_quality"][m]["p"] = t.pvalue
-                    if np.isnan(stats["data_quality"][m]["p"]):
-                        stats["data_quality"][m]["h"] = np.nan
-                    else:
-                        stats["data_quality"][m]["h"] = 1 * (t.pvalue < alpha)
+                results[category] = np.array([metric(arrays) for metric in metric_list[category]],
+                                             dtype=np.float64)
 
         # Events
-        stats["events"] = dict()
-        stats["events"]["hypoglycemic_events"] = dict()
-        stats["events"]["hypoglycemic_events"]["hypo"] = dict()
-        stats["events"]["hypoglycemic_events"]["l1"] = dict()
-        stats["events"]["hypoglycemic_events"]["l2"] = dict()
-        stats["events"]["hyperglycemic_events"] = dict()
-        stats["events"]["hyperglycemic_events"]["hyper"] = dict()
-        stats["events"]["hyperglycemic_events"]["l1"] = dict()
-        stats["events"]["hyperglycemic_events"]["l2"] = dict()
-
-        cat = ["hypoglycemic_events"]
-        sub_cat = ['hypo', 'l1', 'l2']
-        metric_list_name = ['mean_duration', 'events_per_week']
-
-        for c in cat:
-            for s in sub_cat:
-                for m in metric_list_name:
-                    r1 = results["arm_1"]["events"][c][s][m]["values"]
-                    r2 = results["arm_2"]["events"][c][s][m]["values"]
-                    # Correct for lilliefors behaviour
-                    if (r1[~np.isnan(r1)].size >= 4):
-                        ks, p1 = lilliefors(r1[~np.isnan(r1)])
-                    else:
-                        p1 = 0
-                    if (r2[~np.isnan(r2)].size >= 4):
-                        ks, p2 = lilliefors(r2[~np.isnan(r2)])
-                    else:
-                        p2 = 0
-
-                    stats["events"][c][s][m] = dict()
-                    if np.sum(~np.isnan(r1)) < 4 or np.sum(~np.isnan(r2)) < 4 or ((p1 > 0.05 or np.isnan(p1)) and (p2 > 0.05 or np.isnan(p2))):
-                        t = ttest_ind(r1, r2, nan_policy="omit")
-                        stats["events"][c][s][m]["p"] = t.pvalue
-                        if np.isnan(stats["events"][c][s][m]["p"]):
-                            stats["events"][c][s][m]["h"] = np.nan
-                        else:
-                            stats["events"][c][s][m]["h"] = 1 * (t.pvalue < alpha)
-                    else:
-                        if is_paired:
-                            idxs = np.where(np.logical_and(~np.isnan(r1), ~np.isnan(r2)))[0]
-                            if np.all(r1[idxs] - r2[idxs]) == 0:
-                                stats["events"][c][s][m]["h"] = np.nan
-                                stats["events"][c][s][m]["p"] = np.nan
-                            else:
-                                t = wilcoxon(r1, r2, nan_policy="omit")
-                                stats["events"][c][s][m]["p"] = t.pvalue
-                                if np.isnan(stats["events"][c][s][m]["p"]):
-                                    stats["events"][c][s][m]["h"] = np.nan
-                                else:
-                                    stats["events"][c][s][m]["h"] = 1 * (t.pvalue < alpha)
-                        else:
-                            t = mannwhitneyu(r1, r2)
-                            stats["events"][c][s][m]["p"] = t.pvalue
-                            if np.isnan(stats["events"][c][s][m]["p"]):
-                                stats["events"][c][s][m]["h"] = np.nan
-                            else:
-                                stats["events"][c][s][m]["h"] = 1 * (t.pvalue < alpha)
-
-        cat = ["hyperglycemic_events"]
-        sub_cat = ['hyper', 'l1', 'l2']
-        metric_list_name = ['mean_duration', 'events_per_week']
-
-        for c in cat:
-            for s in sub_cat:
-                for m in metric_list_name:
-                    r1 = results["arm_1"]["events"][c][s][m]["values"]
-                    r2 = results["arm_2"]["events"][c][s][m]["values"]
-                    # Correct for lilliefors behaviour
-                    if (r1[~np.isnan(r1)].size >= 4):
-                        ks, p1 = lilliefors(r1[~np.isnan(r1)])
-                    else:
-                        p1 = 0
-                    if (r2[~np.isnan(r2)].size >= 4):
-                        ks, p2 = lilliefors(r2[~np.isnan(r2)])
-                    else:
-                        p2 = 0
-
-                    stats["events"][c][s][m] = dict()
-                    if np.sum(~np.isnan(r1)) < 4 or np.sum(~np.isnan(r2)) < 4 or ((p1 > 0.05 or np.isnan(p1)) and (p2 > 0.05 or np.isnan(p2))):
-                        t = ttest_ind(r1, r2, nan_policy="omit")
-                        stats["events"][c][s][m]["p"] = t.pvalue
-                        if np.isnan(stats["events"][c][s][m]["p"]):
-                            stats["events"][c][s][m]["h"] = np.nan
-                        else:
-                            stats["events"][c][s][m]["h"] = 1 * (t.pvalue < alpha)
-                    else:
-                        if is_paired:
-                            idxs = np.where(np.logical_and(~np.isnan(r1), ~np.isnan(r2)))[0]
-                            if np.all(r1[idxs] - r2[idxs]) == 0:
-                                stats["events"][c][s][m]["h"] = np.nan
-                                stats["events"][c][s][m]["p"] = np.nan
-                            else:
-                                t = wilcoxon(r1, r2, nan_policy="omit")
-                                stats["events"][c][s][m]["p"] = t.pvalue
-                                if np.isnan(stats["events"][c][s][m]["p"]):
-                                    stats["events"][c][s][m]["h"] = np.nan
-                                else:
-                                    stats["events"][c][s][m]["h"] = 1 * (t.pvalue < alpha)
-                        else:
-                            t = mannwhitneyu(r1, r2)
-                            stats["events"][c][s][m]["p"] = t.pvalue
-                            if np.isnan(stats["events"][c][s][m]["p"]):
-                                stats["events"][c][s][m]["h"] = np.nan
-                            else:
-                                stats["events"][c][s][m]["h"] = 1 * (t.pvalue < alpha)
-
-        stats["events"]["extended_hypoglycemic_events"] = dict()
-        for m in metric_list_name:
-            r1 = results["arm_1"]["events"]["extended_hypoglycemic_events"][m]["values"]
-            r2 = results["arm_2"]["events"]["extended_hypoglycemic_events"][m]["values"]
-            # Correct for lilliefors behaviour
-            if (r1[~np.isnan(r1)].size >= 4):
-                ks, p1 = lilliefors(r1[~np.isnan(r1)])
+        events = []
+        for category, levels, find_events in _EVENTS_SPEC:
+            if levels == [None]:
+                r = {None: find_events(arrays.data)}
             else:
-                p1 = 0
-            if (r2[~np.isnan(r2)].size >= 4):
-                ks, p2 = lilliefors(r2[~np.isnan(r2)])
-            else:
-                p2 = 0
-            stats["events"]["extended_hypoglycemic_events"][m] = dict()
-            if np.sum(~np.isnan(r1)) < 4 or np.sum(~np.isnan(r2)) < 4 or ((p1 > 0.05 or np.isnan(p1)) and (p2 > 0.05 or np.isnan(p2))):
-                t = ttest_ind(r1, r2, nan_policy="omit")
-                stats["events"]["extended_hypoglycemic_events"][m]["p"] = t.pvalue
-                if np.isnan(stats["events"]["extended_hypoglycemic_events"][m]["p"]):
-                    stats["events"]["extended_hypoglycemic_events"][m]["h"] = np.nan
-                else:
-                    stats["events"]["extended_hypoglycemic_events"][m]["h"] = 1 * (t.pvalue < alpha)
-            else:
-                if is_paired:
-                    idxs = np.where(np.logical_and(~np.isnan(r1), ~np.isnan(r2)))[0]
-                    if np.all(r1[idxs] - r2[idxs]) == 0:
-                        stats["events"]["extended_hypoglycemic_events"][m]["h"] = np.nan
-                        stats["events"]["extended_hypoglycemic_events"][m]["p"] = np.nan
-                    else:
-                        t = wilcoxon(r1, r2, nan_policy="omit")
-                        stats["events"]["extended_hypoglycemic_events"][m]["p"] = t.pvalue
-                        if np.isnan(stats["events"]["extended_hypoglycemic_events"][m]["p"]):
-                            stats["events"]["extended_hypoglycemic_events"][m]["h"] = np.nan
-                        else:
-                            stats["events"]["extended_hypoglycemic_events"][m]["h"] = 1 * (t.pvalue < alpha)
-                else:
-                    t = mannwhitneyu(r1, r2)
-                    stats["events"]["extended_hypoglycemic_events"][m]["p"] = t.pvalue
-                    if np.isnan(stats["events"]["extended_hypoglycemic_events"][m]["p"]):
-                        stats["events"]["extended_hypoglycemic_events"][m]["h"] = np.nan
-                    else:
-                        stats["events"]["extended_hypoglycemic_events"][m]["h"] = 1 * (t.pvalue < alpha)
+                r = find_events(arrays.data, glycemic_target=self.glycemic_target)
+            events += [r[level][field] for level in levels for field in _EVENTS_FIELDS]
+        results["events"] = np.array(events, dtype=np.float64)
 
-        return results, stats
+        return results
+
+    def _get_daily_excursions(self, arrays):
+        """
+        Returns the daily glycemic excursions of a glucose profile (shared by the MAGE and EF indexes), computing them
+        only once per analysis.
+
+        Parameters
+        ----------
+        arrays: SimpleNamespace
+            The arrays of the glucose profile, as returned by `_profile_arrays`.
+
+        Returns
+        -------
+        excursions: list or None
+            The daily glycemic excursions, as returned by `_daily_excursions`.
+
+        Raises
+        ------
+        None
+
+        See Also
+        --------
+        None
+
+        Examples
+        --------
+        None
+
+        References
+        ----------
+        None
+        """
+        key = (id(arrays.data), 'daily_excursions')
+        if key not in self._cache:
+            self._cache[key] = _daily_excursions(arrays.data)
+        return self._cache[key]
+
+    def _get_time_in_ranges(self, arrays, glycemic_target):
+        """
+        Returns the time in ranges of a glucose profile, computing them only once per analysis.
+
+        Parameters
+        ----------
+        arrays: SimpleNamespace
+            The arrays of the glucose profile, as returned by `_profile_arrays`.
+        glycemic_target: str, {'diabetes', 'pregnancy'}
+            A string defining the set of glycemic targets to use.
+
+        Returns
+        -------
+        time_in_ranges: dict
+            A dictionary containing the time percentages spent in each range, as returned by `_time_in_ranges`.
+
+        Raises
+        ------
+        None
+
+        See Also
+        --------
+        None
+
+        Examples
+        --------
+        None
+
+        References
+        ----------
+        None
+        """
+        key = (id(arrays.data), 'time_in_ranges', glycemic_target)
+        if key not in self._cache:
+            self._cache[key] = _time_in_ranges(arrays.glucose, glycemic_target)
+        return self._cache[key]
+
+    @staticmethod
+    def _profile_arrays(data):
+        """
+        Extracts, once, the arrays of a glucose profile used by the metrics.
+
+        Parameters
+        ----------
+        data: pd.DataFrame
+            Pandas dataframe with a column `glucose` containing the glucose data to analyze (in mg/dl).
+
+        Returns
+        -------
+        arrays: SimpleNamespace
+            A namespace containing:
+            - data: pd.DataFrame
+                The given dataframe, for the metrics that work on it directly.
+            - t: np.ndarray
+                A C-contiguous vector of int64 containing the timestamps (in ns since epoch).
+            - glucose: np.ndarray
+                A C-contiguous vector of double containing the glucose data (in mg/dl).
+            - values: np.ndarray
+                A vector of double containing the non-nan glucose data (in mg/dl), filtered once for the metrics that
+                ignore nan values.
+            - sample_time: float
+                The sample time of the profile (in min). It is nan if the profile has less than two samples.
+
+        Raises
+        ------
+        None
+
+        See Also
+        --------
+        None
+
+        Examples
+        --------
+        None
+
+        References
+        ----------
+        None
+        """
+        t = np.ascontiguousarray(np.asarray(data.t.values, dtype='datetime64[ns]').view('i8'))
+        glucose = np.ascontiguousarray(data.glucose.values, dtype=np.float64)
+        values = glucose[~np.isnan(glucose)]
+        sample_time = (t[1] - t[0]) / 6e10 if t.size > 1 else np.nan
+        return SimpleNamespace(data=data, t=t, glucose=glucose, values=values, sample_time=sample_time)
@@ -2,8 +2,9 @@ import numpy as np
 import pandas as pd
 from datetime import datetime,timedelta
 
-from py_agata.time_in_ranges import time_in_l1_hypoglycemia, time_in_l2_hypoglycemia, time_in_l1_hyperglycemia, time_in_l2_hyperglycemia
+from py_agata.time_in_ranges import _TH_HYPO, _TH_HYPER, _TH_L2_HYPO, _TH_L2_HYPER
 from py_agata.input_validator import *
+from py_agata.variability import _day_starts
 
 def adrr(data):
     """
@@ -42,60 +43,8 @@ def adrr(data):
     check_data_columns(data)
     check_homogeneous_timegrid(data)
 
-    if data.t.values.size == 0:
-        return np.nan
-
-    # Setup the formula parameters
-    alpha = 1.084
-    beta = 5.381
-    gamma = 1.509
-    th = 112.5
-
-    # Get the first and last day limits
-    first_day = pd.to_datetime(data.t.values[0]).to_pydatetime()
-    first_day = first_day.replace(hour=0, minute=0, second=0)
-    last_day = pd.to_datetime(data.t.values[-1]).to_pydatetime()
-    last_day = last_day.__add__(timedelta(days=1)).replace(hour=0, minute=0, second=0)
-
-
-    # Calculate the number of days and preallocate the daily max lbgi and hbgi
-    n_days = (last_day-first_day).days
-    max_lbgi_day = np.empty(shape=(n_days,))
-    max_hbgi_day = np.empty(shape=(n_days,))
-
-    for d in range(0,n_days):
-
-        # Get the day of data
-        low_limit = data.t >= (first_day + timedelta(days=d))
-        high_limit = data.t < (first_day + timedelta(days=d+1))
-        flags = np.logical_and(low_limit,high_limit)
-        day_data = data.glucose.values[flags]
-
-        # Get rid of nans
-        non_nan_glucose = day_data[~np.isnan(day_data)]
-
-        if not non_nan_glucose.size == 0:
-
-            # Symmetrization
-            f = gamma*(np.log(non_nan_glucose)**alpha-beta)
-
-            # Risk computation
-            rl = 10*(f**2)
-            rl[non_nan_glucose > th] = 0
-            rh = 10*(f**2)
-            rh[non_nan_glucose < th] = 0
-
-            # Get the max risks
-            max_lbgi_day[d] = np.max(rl)
-            max_hbgi_day[d] = np.max(rh)
-
-        else:
-
-            max_hbgi_day[d] = np.nan
-            max_lbgi_day[d] = np.nan
-
-    # Return adrr
-    return np.nanmean(max_hbgi_day + max_lbgi_day)
+    # Return the result
+    return _adrr(np.asarray(data.t.values, dtype='datetime64[ns]').view('i8'), data.glucose.values)
 
 
 def lbgi(data):
@@ -135,24 +84,8 @@ def lbgi(data):
     check_data_columns(data)
     check_homogeneous_timegrid(data)
 
-    # Setup the formula parameters
-    alpha = 1.084
-    beta = 5.381
-    gamma = 1.509
-    th = 112.5
-
-    # Get rid of nans
-    non_nan_glucose = data.glucose.values[~np.isnan(data.glucose.values)]
-
-    # Symmetrization
-    f = gamma*(np.log(non_nan_glucose)**alpha-beta)
-
-    # Risk computation
-    rl = 10*(f**2)
-    rl[non_nan_glucose > th] = 0
-
     # Return lbgi
-    return np.mean(rl)
+    return _lbgi(np.ascontiguousarray(data.glucose.values, dtype=np.float64))
 
 
 def hbgi(data):
@@ -192,24 +125,8 @@ def hbgi(data):
     check_data_columns(data)
     check_homogeneous_timegrid(data)
 
-    # Setup the formula parameters
-    alpha = 1.084
-    beta = 5.381
-    gamma = 1.509
-    th = 112.5
-
-    # Get rid of nans
-    non_nan_glucose = data.glucose.values[~np.isnan(data.glucose.values)]
-
-    # Symmetrization
-    f = gamma*(np.log(non_nan_glucose)**alpha-beta)
-
-    # Risk computation
-    rh = 10*(f**2)
-    rh[non_nan_glucose < th] = 0
-
     # Return hbgi
-    return np.mean(rh)
+    return _hbgi(np.ascontiguousarray(data.glucose.values, dtype=np.float64))
 
 
 def bgri(data):
@@ -250,7 +167,7 @@ def bgri(data):
     check_homogeneous_timegrid(data)
 
     # Return bgri
-    return lbgi(data) + hbgi(data)
+    return _bgri(np.ascontiguousarray(data.glucose.values, dtype=np.float64))
 
 
 def gri(data):
@@ -292,16 +209,8 @@ def gri(data):
     check_data_columns(data)
     check_homogeneous_timegrid(data)
 
-    #Compute metric
-    v_low = time_in_l2_hypoglycemia(data) # VLow( < 54 mg / dL; < 3.0 mmol / L)
-    low = time_in_l1_hypoglycemia(data) # Low(54–70 mg / dL; 3.0–3.9 mmol / L)
-    v_high = time_in_l2_hyperglycemia(data) # VHigh( > 250 mg / dL; > 13.9 mmol / L)
-    high = time_in_l1_hyperglycemia(data) # High( > 180–250 mg / dL; > 10.0–13.9 mmol / L)
-
-    gri = (3.0 * v_low) + (2.4 * low) + (1.6 * v_high) + (0.8 * high)
-
-    #Limit gri between 0 - 100 and return
-    return np.min([gri, 100])
+    # Return gri
+    return _gri(np.ascontiguousarray(data.glucose.values, dtype=np.float64))
 
 
 def dynamic_risk(data, amplification_function='tanh', maximum_amplification=2.5, amplification_rapidity=2., maximum_damping=0.6):
@@ -357,38 +266,375 @@ def dynamic_risk(data, amplification_function='tanh', maximum_amplification=2.5,
     if data.shape[0] == 0:
         return np.nan
 
+    # Get the timestamps and the glucose data once
+    t = np.asarray(data.t.values, dtype='datetime64[ns]')
+    g = np.ascontiguousarray(data.glucose.values, dtype=np.float64)
+
     # Initialization
     alpha = 1.084
     beta = 5.381
     gamma = 1.509
     dr_delta = (maximum_amplification - maximum_damping) / 2
     dr_beta = dr_delta + maximum_damping
-    print((1 - dr_beta) / dr_delta)
-    dr_gamma = np.arctanh(complex((1 - dr_beta) / dr_delta, 0))
-    rl = np.zeros(shape=(data.glucose.values.size,))
-    rh = np.zeros(shape=(data.glucose.values.size,))
 
+    # Use the real arctanh when defined (so that the modulation factor is computed in the real domain)
+    dr_gamma = (1 - dr_beta) / dr_delta
+    if -1 < dr_gamma < 1:
+        dr_gamma = np.arctanh(dr_gamma)
+    else:
+        dr_gamma = np.arctanh(complex(dr_gamma, 0))
 
     # Compute rate-of-change
-    ts = (pd.to_datetime(data.t.values[1]).to_pydatetime() - pd.to_datetime(data.t.values[0]).to_pydatetime()).total_seconds()/60
-    roc = np.diff(data.glucose.values)/ts
-    roc = np.append(0,roc)
+    ts = (t[1] - t[0]) / np.timedelta64(1, 'm')
+    roc = np.empty_like(g)
+    roc[0] = 0
+    np.subtract(g[1:], g[:-1], out=roc[1:])
+    roc[1:] /= ts
+
+    # Compute the log of glucose and its powers once
+    log_glucose = np.log(g)
+    log_glucose_alpha = log_glucose ** alpha
+    log_glucose_alpha_m1 = log_glucose ** (alpha - 1)
 
     # Symmetrization
-    f = gamma * (np.log(data.glucose.values) ** alpha - beta)
-    rl = 10 * (f ** 2)
-    rl[f > 0] = 0
-    rh = 10 * (f ** 2)
-    rh[f < 0] = 0
+    f = gamma * (log_glucose_alpha - beta)
 
-    # Compute static risk
-    sr = rh-rl
-    modulation_factor = np.ones(shape=(data.glucose.values.size,))
-    dr_over_dg = np.divide(10 * (gamma**2) * 2 * alpha * (np.log(data.glucose.values)**(2 * alpha - 1) - beta * np.log(data.glucose.values)**(alpha - 1)), data.glucose.values)
+    # Compute static risk (i.e., rh - rl = 10 * f^2 with the sign of f)
+    sr = 10 * (f * np.abs(f))
 
-    # Compute dynamic risk and return it
+    # Derivative of the static risk (10 * gamma^2 * 2 * alpha * (log(g)^(2*alpha-1) - beta * log(g)^(alpha-1)) / g,
+    # factored as 20 * gamma * alpha * log(g)^(alpha-1) * f / g)
+    dr_over_dg = np.divide(20 * gamma * alpha * log_glucose_alpha_m1 * f, g)
+
+    # Compute the modulation factor (in a single buffer, unless the tanh offset is complex)
     if amplification_function == 'tanh':
-        modulation_factor = np.real(dr_delta*np.tanh(amplification_rapidity * np.multiply(dr_over_dg, roc) + dr_gamma)) + dr_beta
+        modulation_factor = np.multiply(dr_over_dg, roc)
+        modulation_factor *= amplification_rapidity
+        if np.iscomplexobj(dr_gamma):
+            modulation_factor = np.real(np.tanh(modulation_factor + dr_gamma))
+        else:
+            modulation_factor += dr_gamma
+            np.tanh(modulation_factor, out=modulation_factor)
+        modulation_factor *= dr_delta
+        modulation_factor += dr_beta
     elif amplification_function == 'exp':
-        modulation_factor = np.exp(maximum_amplification * np.multiply(dr_over_dg, roc))
-    return np.multiply(sr, modulation_factor)
+        modulation_factor = np.multiply(dr_over_dg, roc)
+        modulation_factor *= maximum_amplification
+        np.exp(modulation_factor, out=modulation_factor)
+    else:
+        # No modulation
+        return sr
+
+    # Compute dynamic risk and return it
+    return np.multiply(sr, modulation_factor, out=sr)
+
+
+def _adrr(t, glucose):
+    """
+    Computes the average daily risk range (ADRR) of the given glucose vector (ignoring nan values).
+    Array counterpart of `adrr`.
+
+    Parameters
+    ----------
+    t: np.ndarray
+        A vector of int64 containing the (homogeneous) timestamps of the glucose data (in ns).
+    glucose: np.ndarray
+        A vector of double containing the glucose data to analyze (in mg/dl).
+
+    Returns
+    -------
+    adrr: float
+        The average daily risk range of the given data.
+
+    Raises
+    ------
+    None
+
+    See Also
+    --------
+    adrr
+
+    Examples
+    --------
+    None
+
+    References
+    ----------
+    None
+    """
+    if t.size == 0:
+        return np.nan
+
+    # Setup the formula parameters
+    th = 112.5
+
+    # Find where each day starts
+    day_starts = _day_starts(t.view('datetime64[ns]'))
+
+    # Get the glucose data as a C-contiguous float64 buffer (so that numpy's vectorized log loop applies)
+    glucose = np.ascontiguousarray(glucose, dtype=np.float64)
+
+    # Risk computation of all the data at once (symmetrization shared by rl and rh, nan values do not count)
+    nan_glucose = np.isnan(glucose)
+    r = _risk_function(glucose)
+    rl = np.where((glucose > th) | nan_glucose, 0, r)
+    rh = np.where((glucose < th) | nan_glucose, 0, r)
+
+    # Get the max risks of each day at once (nan for the days without data)
+    starts = day_starts[:-1]
+    has_data = np.logical_or.reduceat(~nan_glucose, starts) & (np.diff(day_starts) > 0)
+    max_lbgi_day = np.where(has_data, np.maximum.reduceat(rl, starts), np.nan)
+    max_hbgi_day = np.where(has_data, np.maximum.reduceat(rh, starts), np.nan)
+
+    # Return adrr (nan if no day has data)
+    daily_risk = max_hbgi_day + max_lbgi_day
+    if np.all(np.isnan(daily_risk)):
+        return np.nan
+    return np.nanmean(daily_risk)
+
+
+def _lbgi(glucose):
+    """
+    Computes the low blood glucose index (LBGI) of the given glucose vector (ignoring nan values).
+    Array counterpart of `lbgi`.
+
+    Parameters
+    ----------
+    glucose: np.ndarray
+        A vector of double containing the glucose data to analyze (in mg/dl).
+
+    Returns
+    -------
+    lbgi: float
+        the low blood glucose index of the glucose concentration.
+
+    Raises
+    ------
+    None
+
+    See Also
+    --------
+    lbgi
+
+    Examples
+    --------
+    None
+
+    References
+    ----------
+    None
+    """
+    # Setup the formula parameters
+    th = 112.5
+
+    # Get rid of nans (skipping the copy when there are none)
+    nan_glucose = np.isnan(glucose)
+    non_nan_glucose = glucose[~nan_glucose] if nan_glucose.any() else glucose
+
+    # Risk computation
+    rl = np.where(non_nan_glucose > th, 0, _risk_function(non_nan_glucose))
+
+    # Return lbgi
+    return np.mean(rl)
+
+
+def _hbgi(glucose):
+    """
+    Computes the high blood glucose index (HBGI) of the given glucose vector (ignoring nan values).
+    Array counterpart of `hbgi`.
+
+    Parameters
+    ----------
+    glucose: np.ndarray
+        A vector of double containing the glucose data to analyze (in mg/dl).
+
+    Returns
+    -------
+    hbgi: float
+        the high blood glucose index of the glucose concentration.
+
+    Raises
+    ------
+    None
+
+    See Also
+    --------
+    hbgi
+
+    Examples
+    --------
+    None
+
+    References
+    ----------
+    None
+    """
+    # Setup the formula parameters
+    th = 112.5
+
+    # Get rid of nans (skipping the copy when there are none)
+    nan_glucose = np.isnan(glucose)
+    non_nan_glucose = glucose[~nan_glucose] if nan_glucose.any() else glucose
+
+    # Risk computation
+    rh = np.where(non_nan_glucose < th, 0, _risk_function(non_nan_glucose))
+
+    # Return hbgi
+    return np.mean(rh)
+
+
+def _bgri(glucose):
+    """
+    Computes the blood glucose risk index (BGRI) of the given glucose vector (ignoring nan values).
+    Array counterpart of `bgri`.
+
+    Parameters
+    ----------
+    glucose: np.ndarray
+        A vector of double containing the glucose data to analyze (in mg/dl).
+
+    Returns
+    -------
+    bgri: float
+        the blood glucose risk index of the glucose concentration.
+
+    Raises
+    ------
+    None
+
+    See Also
+    --------
+    bgri
+
+    Examples
+    --------
+    None
+
+    References
+    ----------
+    None
+    """
+    # Setup the formula parameters
+    th = 112.5
+
+    # Get rid of nans (skipping the copy when there are none)
+    nan_glucose = np.isnan(glucose)
+    non_nan_glucose = glucose[~nan_glucose] if nan_glucose.any() else glucose
+
+    # Risk computation (symmetrization shared by rl and rh)
+    r = _risk_function(non_nan_glucose)
+    rl = np.where(non_nan_glucose > th, 0, r)
+    rh = np.where(non_nan_glucose < th, 0, r)
+
+    # Return bgri
+    return np.mean(rl) + np.mean(rh)
+
+
+def _gri(glucose, time_in_ranges=None):
+    """
+    Computes the blood glycemia risk index (GRI) of the given glucose vector (ignoring nan values).
+    Array counterpart of `gri`.
+
+    Parameters
+    ----------
+    glucose: np.ndarray
+        A vector of double containing the glucose data to analyze (in mg/dl).
+    time_in_ranges: dict, optional, default: None
+        The time in ranges of `glucose` with the `diabetes` glycemic target, as returned by `_time_in_ranges`. If None,
+        only the values in the ranges it needs are counted.
+
+    Returns
+    -------
+    gri: float
+        the glycemia risk index of the glucose concentration.
+
+    Raises
+    ------
+    None
+
+    See Also
+    --------
+    gri
+
+    Examples
+    --------
+    None
+
+    References
+    ----------
+    None
+    """
+    #Compute metric
+    if time_in_ranges is None:
+        # Get non-nan values
+        values = glucose[~np.isnan(glucose)]
+        if values.size == 0:
+            return np.nan
+
+        # Count the values below each bound of the time in ranges (with SIMD comparisons and no intermediate class
+        # array), then the values of each range as their differences (0: VLow, 1: Low, 2: target, 3: High, 4: VHigh)
+        th_hypo, th_hyper = _TH_HYPO['diabetes'], _TH_HYPER['diabetes']
+        below = [0, np.count_nonzero(values <= _TH_L2_HYPO), np.count_nonzero(values <= th_hypo),
+                 np.count_nonzero(values < th_hyper), np.count_nonzero(values < _TH_L2_HYPER), values.shape[0]]
+        percentages = 100 * np.diff(below) / values.shape[0]
+        time_in_ranges = {'time_in_l2_hypoglycemia': percentages[0], 'time_in_l1_hypoglycemia': percentages[1],
+                          'time_in_l1_hyperglycemia': percentages[3], 'time_in_l2_hyperglycemia': percentages[4]}
+    v_low = time_in_ranges['time_in_l2_hypoglycemia'] # VLow( < 54 mg / dL; < 3.0 mmol / L)
+    low = time_in_ranges['time_in_l1_hypoglycemia'] # Low(54–70 mg / dL; 3.0–3.9 mmol / L)
+    v_high = time_in_ranges['time_in_l2_hyperglycemia'] # VHigh( > 250 mg / dL; > 13.9 mmol / L)
+    high = time_in_ranges['time_in_l1_hyperglycemia'] # High( > 180–250 mg / dL; > 10.0–13.9 mmol / L)
+    gri = (3.0 * v_low) + (2.4 * low) + (1.6 * v_high) + (0.8 * high)
+
+    #Limit gri between 0 - 100 and return
+    return float(min(gri, 100.0))
+
+
+def _risk_function(glucose):
+    """
+    Computes the risk function of Kovatchev (i.e., 10*f(glucose)^2, with f the symmetrization of the glucose scale)
+    of the given glucose vector, in a single buffer (each step is computed in place). It is the building block shared
+    by `lbgi`, `hbgi`, `bgri`, and `adrr`.
+
+    Parameters
+    ----------
+    glucose: np.ndarray
+        A vector of double containing the glucose data (in mg/dl).
+
+    Returns
+    -------
+    r: np.ndarray
+        A vector of double containing the risk of each glucose value.
+
+    Raises
+    ------
+    None
+
+    See Also
+    --------
+    lbgi, hbgi, bgri, adrr
+
+    Examples
+    --------
+    None
+
+    References
+    ----------
+    Kovatchev et al., "Evaluation of a new measure of blood glucose variability in
+    diabetes", Diabetes Care, 2006, vol. 29, pp. 2433-2438. DOI: 10.2337/dc06-1085.
+    """
+    # Setup the formula parameters
+    alpha = 1.084
+    beta = 5.381
+    gamma = 1.509
+
+    # Symmetrization
+    r = np.log(glucose)
+    np.power(r, alpha, out=r)
+    np.subtract(r, beta, out=r)
+    np.multiply(gamma, r, out=r)
+
+    # Risk computation
+    np.square(r, out=r)
+    np.multiply(10, r, out=r)
+
+    return r
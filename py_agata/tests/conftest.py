@@ -0,0 +1,75 @@
+import pandas as pd
+import numpy as np
+import pytest
+from datetime import datetime
+
+
+@pytest.fixture(scope="session")
+def glucose_timestamps():
+    """
+    Timestamps of the glucose profiles of the unit tests, built once per test session. The tests must not modify them.
+
+    Parameters
+    ----------
+    None
+
+    Returns
+    -------
+    t: np.ndarray
+        A vector of datetime64 containing the timestamps.
+
+    Raises
+    ------
+    None
+
+    See Also
+    --------
+    None
+
+    Examples
+    --------
+    None
+
+    References
+    ----------
+    None
+    """
+    return pd.date_range(start=datetime(2000, 1, 1, 0, 0, 0), periods=11, freq='5min').to_numpy()
+
+
+@pytest.fixture(scope="session")
+def glucose_data(glucose_timestamps):
+    """
+    Glucose profile shared by the unit tests, built once per test session. The tests must not modify it.
+
+    Parameters
+    ----------
+    glucose_timestamps: np.ndarray
+        A vector of datetime64 containing the timestamps (see the `glucose_timestamps` fixture).
+
+    Returns
+    -------
+    data: pd.DataFrame
+        Pandas dataframe with a column `t` containing the timestamps and a column `glucose` containing the glucose
+        data (in mg/dl).
+
+    Raises
+    ------
+    None
+
+    See Also
+    --------
+    None
+
+    Examples
+    --------
+    None
+
+    References
+    ----------
+    None
+    """
+    t = glucose_timestamps
+    glucose = np.array([40, 60, 60, 80, 120, 150, 200, 200, 260, 260, np.nan])
+    d = {'t': t, 'glucose': glucose}
+    return pd.DataFrame(data=d)
@@ -38,3 +38,4 @@ def test_agata_init():
     agata = Agata(glycemic_target='diabetes')
 
     assert agata.glycemic_target == 'diabetes'
+    assert agata.cache_size == 0
@@ -1,12 +1,9 @@
-import pandas as pd
 import numpy as np
-import datetime
-from datetime import datetime, timedelta
 
 from py_agata.py_agata import Agata
 
 
-def test_analyze_one_arm():
+def test_analyze_one_arm(glucose_data):
     """
     Unit test of Agata.analyze_one_arm function.
 
@@ -35,18 +32,7 @@ def test_analyze_one_arm():
     None
     """
     # Set test data
-    t = np.arange(datetime(2000, 1, 1, 0, 0, 0), datetime(2000, 1, 1, 0, 55, 0), timedelta(minutes=5)).astype(
-        datetime)
-    glucose = np.zeros(shape=(t.shape[0],))
-    glucose[0] = 40
-    glucose[1:3] = [60, 60]
-    glucose[3] = 80
-    glucose[4:6] = [120, 150]
-    glucose[6:8] = [200, 200]
-    glucose[8:10] = [260, 260]
-    glucose[10] = np.nan
-    d = {'t': t, 'glucose': glucose}
-    data = pd.DataFrame(data=d)
+    data = glucose_data
 
     # Tests
 
@@ -104,4 +90,95 @@ def test_analyze_one_arm():
     assert results["events"]["hypoglycemic_events"]["l2"]["events_per_week"]["values"].size == 2
 
     assert results["events"]["extended_hypoglycemic_events"]["mean_duration"]["values"].size == 2
-    assert  results["events"]["extended_hypoglycemic_events"]["events_per_week"]["values"].size == 2
\ No newline at end of file
+    assert  results["events"]["extended_hypoglycemic_events"]["events_per_week"]["values"].size == 2
+
+def test_analyze_one_arm_n_jobs(glucose_data):
+    """
+    Unit test of Agata.analyze_one_arm function run in parallel processes.
+
+    Parameters
+    ----------
+    None
+
+    Returns
+    -------
+    None
+
+    Raises
+    ------
+    None
+
+    See Also
+    --------
+    None
+
+    Examples
+    --------
+    None
+
+    References
+    ----------
+    None
+    """
+    # Set test data (distinct subjects)
+    data_1 = glucose_data
+    data_2 = glucose_data.copy()
+    data_2.glucose = data_2.glucose.values[::-1]
+    data_3 = glucose_data.copy()
+    data_3.glucose = data_3.glucose + 20
+
+    # Tests
+    agata = Agata(glycemic_target='diabetes')
+
+    results_serial = agata.analyze_one_arm(data=[data_1, data_2, data_3])
+    results_parallel = Agata(glycemic_target='diabetes').analyze_one_arm(data=[data_1, data_2, data_3], n_jobs=2)
+
+    for category in ['variability', 'time_in_ranges', 'risk', 'glycemic_transformation', 'data_quality']:
+        for m in results_serial[category]:
+            assert np.array_equal(results_parallel[category][m]["values"], results_serial[category][m]["values"],
+                                  equal_nan=True)
+    assert np.array_equal(results_parallel["events"]["hypoglycemic_events"]["hypo"]["mean_duration"]["values"],
+                          results_serial["events"]["hypoglycemic_events"]["hypo"]["mean_duration"]["values"],
+                          equal_nan=True)
+    assert np.array_equal(results_parallel["events"]["hyperglycemic_events"]["hyper"]["events_per_week"]["values"],
+                          results_serial["events"]["hyperglycemic_events"]["hyper"]["events_per_week"]["values"],
+                          equal_nan=True)
+
+
+def test_analyze_one_arm_empty():
+    """
+    Unit test of Agata.analyze_one_arm function with an empty arm.
+
+    Parameters
+    ----------
+    None
+
+    Returns
+    -------
+    None
+
+    Raises
+    ------
+    None
+
+    See Also
+    --------
+    None
+
+    Examples
+    --------
+    None
+
+    References
+    ----------
+    None
+    """
+    # Tests
+    agata = Agata(glycemic_target='diabetes')
+
+    results = agata.analyze_one_arm(data=[])
+
+    assert results["variability"]["mean_glucose"]["values"].size == 0
+    for stat in ['mean', 'std', 'median', 'prc_5', 'prc_25', 'prc_75', 'prc_95']:
+        assert np.isnan(results["variability"]["mean_glucose"][stat])
+        assert np.isnan(results["events"]["extended_hypoglycemic_events"]["mean_duration"][stat])
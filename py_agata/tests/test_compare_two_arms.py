@@ -1,12 +1,11 @@
 import pandas as pd
 import numpy as np
-import datetime
-from datetime import datetime, timedelta
+from scipy.stats import mannwhitneyu
 
 from py_agata.py_agata import Agata
 
 
-def test_compare_two_arms():
+def test_compare_two_arms(glucose_data, glucose_timestamps):
     """
     Unit test of Agata.compare_two_arms function.
 
@@ -35,55 +34,18 @@ def test_compare_two_arms():
     None
     """
     # Set test data
-    t = np.arange(datetime(2000, 1, 1, 0, 0, 0), datetime(2000, 1, 1, 0, 55, 0), timedelta(minutes=5)).astype(
-        datetime)
-    glucose = np.zeros(shape=(t.shape[0],))
-    glucose[0] = 40
-    glucose[1:3] = [60, 60]
-    glucose[3] = 80
-    glucose[4:6] = [120, 150]
-    glucose[6:8] = [200, 200]
-    glucose[8:10] = [260, 260]
-    glucose[10] = np.nan
-    d = {'t': t, 'glucose': glucose}
-    data_1 = pd.DataFrame(data=d)
-
-    t = np.arange(datetime(2000, 1, 1, 0, 0, 0), datetime(2000, 1, 1, 0, 55, 0), timedelta(minutes=5)).astype(
-        datetime)
-    glucose = np.zeros(shape=(t.shape[0],))
-    glucose[0] = 40
-    glucose[1:3] = [50, 60]
-    glucose[3] = 120
-    glucose[4:6] = [120, 150]
-    glucose[6:8] = [190, 200]
-    glucose[8:10] = [260, 260]
-    glucose[10] = np.nan
+    data_1 = glucose_data
+
+    t = glucose_timestamps
+    glucose = np.array([40, 50, 60, 120, 120, 150, 190, 200, 260, 260, np.nan])
     d = {'t': t, 'glucose': glucose}
     data_2 = pd.DataFrame(data=d)
 
-    t = np.arange(datetime(2000, 1, 1, 0, 0, 0), datetime(2000, 1, 1, 0, 55, 0), timedelta(minutes=5)).astype(
-        datetime)
-    glucose = np.zeros(shape=(t.shape[0],))
-    glucose[0] = 100
-    glucose[1:3] = [100, 100]
-    glucose[3] = 120
-    glucose[4:6] = [120, 120]
-    glucose[6:8] = [190, 200]
-    glucose[8:10] = [100, 100]
-    glucose[10] = np.nan
+    glucose = np.array([100, 100, 100, 120, 120, 120, 190, 200, 100, 100, np.nan])
     d = {'t': t, 'glucose': glucose}
     data_3 = pd.DataFrame(data=d)
 
-    t = np.arange(datetime(2000, 1, 1, 0, 0, 0), datetime(2000, 1, 1, 0, 55, 0), timedelta(minutes=5)).astype(
-        datetime)
-    glucose = np.zeros(shape=(t.shape[0],))
-    glucose[0] = 100
-    glucose[1:3] = [100, 100]
-    glucose[3] = 120
-    glucose[4:6] = [120, 120]
-    glucose[6:8] = [100, 100]
-    glucose[8:10] = [100, 100]
-    glucose[10] = np.nan
+    glucose = np.array([100, 100, 100, 120, 120, 120, 100, 100, 100, 100, np.nan])
     d = {'t': t, 'glucose': glucose}
     data_4 = pd.DataFrame(data=d)
 
@@ -294,3 +256,51 @@ def test_compare_two_arms():
     results, stats = agata.compare_two_arms(arm_1=[data_5, data_5, data_5, data_5], arm_2=[data_5, data_5, data_5], is_paired=False, alpha=0.05)
 
     results, stats = agata.compare_two_arms(arm_1=[data_1, data_1, data_1, data_1], arm_2=[data_1, data_1, data_1, data_1], is_paired=True, alpha=0.05)
+
+    # Identical paired values are not tested (h = 0, p = 1), paired values that differ are
+    results, stats = agata.compare_two_arms(arm_1=[data_1, data_1, data_1, data_2], arm_2=[data_1, data_1, data_1, data_2], is_paired=True, alpha=0.05)
+    assert stats["variability"]["mean_glucose"]["h"] == 0
+    assert stats["variability"]["mean_glucose"]["p"] == 1
+
+    results, stats = agata.compare_two_arms(arm_1=[data_1, data_1, data_1, data_2], arm_2=[data_3, data_3, data_1, data_2], is_paired=True, alpha=0.05)
+    assert stats["variability"]["mean_glucose"]["p"] < 1
+
+    # Arms already analyzed are reused (as copies) if kept, unless their data change or the cache is cleared
+    agata = Agata(glycemic_target='diabetes', cache_size=2)
+    results, stats = agata.compare_two_arms(arm_1=[data_1, data_1, data_1, data_2], arm_2=[data_3, data_3, data_1, data_2], is_paired=True, alpha=0.05)
+    results_cached, stats_cached = agata.compare_two_arms(arm_1=[data_1, data_1, data_1, data_2], arm_2=[data_3, data_3, data_1, data_2], is_paired=True, alpha=0.05)
+    assert results_cached["arm_1"] is not results["arm_1"]
+    assert np.array_equal(results_cached["arm_1"]["variability"]["mean_glucose"]["values"], results["arm_1"]["variability"]["mean_glucose"]["values"])
+    assert stats_cached["variability"]["mean_glucose"]["p"] == stats["variability"]["mean_glucose"]["p"]
+
+    results_cached["arm_1"]["variability"]["mean_glucose"]["values"][0] = 0
+    results_cached, _ = agata.compare_two_arms(arm_1=[data_1, data_1, data_1, data_2], arm_2=[data_3, data_3, data_1, data_2], is_paired=True, alpha=0.05)
+    assert results_cached["arm_1"]["variability"]["mean_glucose"]["values"][0] == results["arm_1"]["variability"]["mean_glucose"]["values"][0]
+
+    data_6 = data_2.copy()
+    data_6.loc[0, 'glucose'] = 300
+    results_changed, _ = agata.compare_two_arms(arm_1=[data_1, data_1, data_1, data_6], arm_2=[data_3, data_3, data_1, data_2], is_paired=True, alpha=0.05)
+    assert results_changed["arm_1"]["variability"]["mean_glucose"]["values"][3] != results["arm_1"]["variability"]["mean_glucose"]["values"][3]
+
+    agata.clear_arm_cache()
+    results_cleared, _ = agata.compare_two_arms(arm_1=[data_1, data_1, data_1, data_2], arm_2=[data_3, data_3, data_1, data_2], is_paired=True, alpha=0.05)
+    assert results_cleared["arm_1"] is not results["arm_1"]
+    assert np.array_equal(results_cleared["arm_1"]["variability"]["mean_glucose"]["values"], results["arm_1"]["variability"]["mean_glucose"]["values"])
+
+    # Subjects already analyzed are reused in new arms
+    results_reordered, _ = agata.compare_two_arms(arm_1=[data_2, data_1, data_1, data_1], arm_2=[data_3, data_3, data_1, data_2], is_paired=True, alpha=0.05)
+    assert np.array_equal(results_reordered["arm_1"]["variability"]["mean_glucose"]["values"], results["arm_1"]["variability"]["mean_glucose"]["values"][::-1])
+
+    # No more arms and subjects than the cache size are kept
+    assert len(agata._arm_cache) <= 2
+    assert len(agata._subject_cache) <= 2
+
+    # Without the normality test, the rank tests are used
+    results, stats = agata.compare_two_arms(arm_1=[data_1, data_1, data_2, data_2, data_4], arm_2=[data_3, data_3, data_4, data_4], is_paired=False, alpha=0.05, normality_test=False)
+    assert stats["variability"]["mean_glucose"]["p"] == mannwhitneyu(results["arm_1"]["variability"]["mean_glucose"]["values"], results["arm_2"]["variability"]["mean_glucose"]["values"]).pvalue
+    assert stats["variability"]["mean_glucose"]["h"] == 1 or stats["variability"]["mean_glucose"]["h"] == 0
+
+    # An empty arm has nan statistics and is not tested
+    results, stats = agata.compare_two_arms(arm_1=[], arm_2=[data_3, data_3, data_4, data_4], is_paired=False, alpha=0.05)
+    assert np.isnan(results["arm_1"]["variability"]["mean_glucose"]["mean"])
+    assert np.isnan(stats["variability"]["mean_glucose"]["p"])
@@ -0,0 +1,56 @@
+import numpy as np
+from statsmodels.stats.diagnostic import lilliefors
+
+import py_agata.py_agata
+from py_agata.py_agata import _lilliefors_pvalues
+
+
+def test_lilliefors_pvalues(monkeypatch):
+    """
+    Unit test of _lilliefors_pvalues function.
+
+    Parameters
+    ----------
+    None
+
+    Returns
+    -------
+    None
+
+    Raises
+    ------
+    None
+
+    See Also
+    --------
+    None
+
+    Examples
+    --------
+    None
+
+    References
+    ----------
+    None
+    """
+    # Set test data (rows with different numbers of valid values, gaussian and not)
+    rng = np.random.default_rng(0)
+    values = np.full(shape=(6, 40), fill_value=np.nan)
+    values[0, :40] = rng.normal(size=40)
+    values[1, :40] = rng.exponential(size=40)
+    values[2, :10] = rng.normal(size=10)
+    values[3, :10] = rng.exponential(size=10)
+    values[4, :25] = rng.uniform(size=25)
+    values[5, :3] = rng.normal(size=3)
+    valid = ~np.isnan(values)
+    n = np.count_nonzero(valid, axis=1)
+
+    expected = np.array([lilliefors(values[i][valid[i]])[1] if n[i] >= 4 else 0 for i in range(values.shape[0])])
+
+    #Tests
+    assert np.allclose(_lilliefors_pvalues(values, valid, n), expected)
+
+    # Without the (private) statsmodels table, each row is tested with lilliefors
+    monkeypatch.setattr(py_agata.py_agata, 'get_lilliefors_table', None)
+    monkeypatch.setattr(py_agata.py_agata, '_LILLIEFORS_CRITVALS', dict())
+    assert np.allclose(_lilliefors_pvalues(values, valid, n), expected)
@@ -2,6 +2,15 @@ import numpy as np
 
 from py_agata.input_validator import *
 
+# Glycemic thresholds (in mg/dl) of the time in ranges: hypo/hyperglycemia thresholds of each glycemic target, tight
+# target range, and level 2 hypo/hyperglycemia thresholds (the same for all the glycemic targets)
+_TH_HYPO = {'diabetes': 70., 'pregnancy': 63.}
+_TH_HYPER = {'diabetes': 180., 'pregnancy': 140.}
+_TH_TIGHT_TARGET = (70., 140.)
+_TH_L2_HYPO = 54.
+_TH_L2_HYPER = 250.
+
+
 def time_in_target(data, glycemic_target='diabetes'):
     """
     Computes the time spent in the target range (ignoring nan values).
@@ -44,14 +53,7 @@ def time_in_target(data, glycemic_target='diabetes'):
     check_homogeneous_timegrid(data)
 
     # Set the threshold
-    if glycemic_target == 'diabetes':
-        th_l = 70.
-        th_h = 180.
-    elif glycemic_target == 'pregnancy':
-        th_l = 63.
-        th_h = 140.
-    else:
-        raise RuntimeError('`glycemic_target` can be `diabetes` or `pregnancy`.')
+    th_l, th_h = _thresholds(glycemic_target)
 
     # Return the result
     return time_in_given_range(data=data, th_l=th_l, th_h=th_h, include_th_l=False, include_th_h=False)
@@ -98,15 +100,9 @@ def time_in_tight_target(data, glycemic_target='diabetes'):
     check_data_columns(data)
     check_homogeneous_timegrid(data)
 
-    # Set the threshold
-    if glycemic_target == 'diabetes':
-        th_l = 70.
-        th_h = 140.
-    elif glycemic_target == 'pregnancy':
-        th_l = 70.
-        th_h = 140.
-    else:
-        raise RuntimeError('`glycemic_target` can be `diabetes` or `pregnancy`.')
+    # Set the threshold (the same for all the glycemic targets, which is checked anyway)
+    _thresholds(glycemic_target)
+    th_l, th_h = _TH_TIGHT_TARGET
 
     # Return the result
     return time_in_given_range(data=data, th_l=th_l, th_h=th_h, include_th_l=False, include_th_h=False)
@@ -154,12 +150,7 @@ def time_in_hypoglycemia(data, glycemic_target='diabetes'):
     check_homogeneous_timegrid(data)
 
     # Set the threshold
-    if glycemic_target == 'diabetes':
-        th = 70.
-    elif glycemic_target == 'pregnancy':
-        th = 63.
-    else:
-        raise RuntimeError('`glycemic_target` can be `diabetes` or `pregnancy`.')
+    th, _ = _thresholds(glycemic_target)
 
     # Return the result
     return time_in_given_below_range(data=data, th=th, include_th=True)
@@ -207,14 +198,8 @@ def time_in_l1_hypoglycemia(data, glycemic_target='diabetes'):
     check_homogeneous_timegrid(data)
 
     # Set the threshold
-    if glycemic_target == 'diabetes':
-        th_l = 54.
-        th_h = 70.
-    elif glycemic_target == 'pregnancy':
-        th_l = 54.
-        th_h = 63.
-    else:
-        raise RuntimeError('`glycemic_target` can be `diabetes` or `pregnancy`.')
+    th_h, _ = _thresholds(glycemic_target)
+    th_l = _TH_L2_HYPO
 
     # Return the result
     return time_in_given_range(data=data, th_l=th_l, th_h=th_h, include_th_l=False, include_th_h=True)
@@ -261,13 +246,9 @@ def time_in_l2_hypoglycemia(data, glycemic_target='diabetes'):
     check_data_columns(data)
     check_homogeneous_timegrid(data)
 
-    # Set the threshold
-    if glycemic_target == 'diabetes':
-        th = 54.
-    elif glycemic_target == 'pregnancy':
-        th = 54.
-    else:
-        raise RuntimeError('`glycemic_target` can be `diabetes` or `pregnancy`.')
+    # Set the threshold (the same for all the glycemic targets, which is checked anyway)
+    _thresholds(glycemic_target)
+    th = _TH_L2_HYPO
 
     # Return the result
     return time_in_given_below_range(data=data, th=th, include_th=True)
@@ -315,12 +296,7 @@ def time_in_hyperglycemia(data, glycemic_target='diabetes'):
     check_homogeneous_timegrid(data)
 
     # Set the threshold
-    if glycemic_target == 'diabetes':
-        th = 180.
-    elif glycemic_target == 'pregnancy':
-        th = 140.
-    else:
-        raise RuntimeError('`glycemic_target` can be `diabetes` or `pregnancy`.')
+    _, th = _thresholds(glycemic_target)
 
     # Return the result
     return time_in_given_above_range(data=data, th=th, include_th=True)
@@ -368,14 +344,8 @@ def time_in_l1_hyperglycemia(data, glycemic_target='diabetes'):
     check_homogeneous_timegrid(data)
 
     # Set the threshold
-    if glycemic_target == 'diabetes':
-        th_l = 180.
-        th_h = 250.
-    elif glycemic_target == 'pregnancy':
-        th_l = 140.
-        th_h = 250.
-    else:
-        raise RuntimeError('`glycemic_target` can be `diabetes` or `pregnancy`.')
+    _, th_l = _thresholds(glycemic_target)
+    th_h = _TH_L2_HYPER
 
     # Return the result
     return time_in_given_range(data=data, th_l=th_l, th_h=th_h, include_th_l=True, include_th_h=False)
@@ -422,13 +392,9 @@ def time_in_l2_hyperglycemia(data, glycemic_target='diabetes'):
     check_data_columns(data)
     check_homogeneous_timegrid(data)
 
-    # Set the threshold
-    if glycemic_target == 'diabetes':
-        th = 250.
-    elif glycemic_target == 'pregnancy':
-        th = 250.
-    else:
-        raise RuntimeError('`glycemic_target` can be `diabetes` or `pregnancy`.')
+    # Set the threshold (the same for all the glycemic targets, which is checked anyway)
+    _thresholds(glycemic_target)
+    th = _TH_L2_HYPER
 
     # Return the result
     return time_in_given_above_range(data=data, th=th, include_th=True)
@@ -482,19 +448,20 @@ def time_in_given_range(data, th_l, th_h, include_th_l=False, include_th_h=False
     check_float_parameter(th_l)
     check_float_parameter(th_h)
 
-    # Get non-nan values
-    values = data.glucose.values[~np.isnan(data.glucose.values)]
+    # Count non-nan values (nan values are never flagged, so they do not need to be removed)
+    glucose = data.glucose.values
+    n_values = glucose.size - np.count_nonzero(np.isnan(glucose))
 
     # Return nan if all values are nan
-    if values.size == 0:
+    if n_values == 0:
         return np.nan
 
     # Get low/high flags
-    flags_l = values >= th_l if include_th_l else values > th_l
-    flags_h = values <= th_h if include_th_h else values < th_h
+    flags_l = glucose >= th_l if include_th_l else glucose > th_l
+    flags_h = glucose <= th_h if include_th_h else glucose < th_h
 
     # Return the results
-    return 100 * np.where(np.logical_and(flags_l, flags_h))[0].shape[0]/values.shape[0]
+    return 100 * np.count_nonzero(np.logical_and(flags_l, flags_h, out=flags_l))/n_values
 
 
 def time_in_given_above_range(data, th, include_th=False):
@@ -540,18 +507,19 @@ def time_in_given_above_range(data, th, include_th=False):
     check_homogeneous_timegrid(data)
     check_float_parameter(th)
 
-    # Get non-nan values
-    values = data.glucose.values[~np.isnan(data.glucose.values)]
+    # Count non-nan values (nan values are never flagged, so they do not need to be removed)
+    glucose = data.glucose.values
+    n_values = glucose.size - np.count_nonzero(np.isnan(glucose))
 
     # Return nan if all values are nan
-    if values.size == 0:
+    if n_values == 0:
         return np.nan
 
     # Get flags
-    flags = values >= th if include_th else values > th
+    flags = glucose >= th if include_th else glucose > th
 
     # Return the results
-    return 100 * np.where(flags)[0].shape[0]/values.shape[0]
+    return 100 * np.count_nonzero(flags)/n_values
 
 
 def time_in_given_below_range(data, th, include_th=False):
@@ -597,15 +565,120 @@ def time_in_given_below_range(data, th, include_th=False):
     check_homogeneous_timegrid(data)
     check_float_parameter(th)
 
-    # Get non-nan values
-    values = data.glucose.values[~np.isnan(data.glucose.values)]
+    # Count non-nan values (nan values are never flagged, so they do not need to be removed)
+    glucose = data.glucose.values
+    n_values = glucose.size - np.count_nonzero(np.isnan(glucose))
 
     # Return nan if all values are nan
-    if values.size == 0:
+    if n_values == 0:
         return np.nan
 
     # Get flags
-    flags = values <= th if include_th else values < th
+    flags = glucose <= th if include_th else glucose < th
 
     # Return the results
-    return 100 * np.where(flags)[0].shape[0]/values.shape[0]
+    return 100 * np.count_nonzero(flags)/n_values
+
+
+def _time_in_ranges(glucose, glycemic_target='diabetes'):
+    """
+    Computes all the time in range metrics of the given glucose vector at once (ignoring nan values). It is equivalent
+    to calling each `time_in_*` function on the same data, but it filters nan values only once.
+
+    Parameters
+    ----------
+    glucose: np.ndarray
+        A vector of double containing the glucose data to analyze (in mg/dl).
+    glycemic_target: str, {'diabetes', 'pregnancy'}, optional, default: 'diabetes'
+        A string defining the set of glycemic targets to use. The default
+        value is `diabetes`. It can be {`diabetes`,`pregnancy`).
+
+    Returns
+    -------
+    time_in_ranges: dict
+        A dictionary containing the time percentages spent in each range, keyed as in
+        `Agata.analyze_glucose_profile`.
+
+    Raises
+    ------
+    None
+
+    See Also
+    --------
+    time_in_target, time_in_tight_target, time_in_hypoglycemia, time_in_l1_hypoglycemia, time_in_l2_hypoglycemia,
+    time_in_hyperglycemia, time_in_l1_hyperglycemia, time_in_l2_hyperglycemia
+
+    Examples
+    --------
+    None
+
+    References
+    ----------
+    Battelino et al., "Continuous glucose monitoring and metrics for clinical
+    trials: An international consensus statement", The Lancet Diabetes &
+    Endocrinology, 2022, pp. 1-16. DOI: https://doi.org/10.1016/S2213-8587(22)00319-9.
+    """
+    # Set the thresholds
+    th_hypo, th_hyper = _thresholds(glycemic_target)
+
+    # Get non-nan values
+    values = glucose[~np.isnan(glucose)]
+
+    # Return nan if all values are nan
+    if values.size == 0:
+        return dict.fromkeys(['time_in_target', 'time_in_tight_target', 'time_in_hypoglycemia',
+                              'time_in_l1_hypoglycemia', 'time_in_l2_hypoglycemia', 'time_in_hyperglycemia',
+                              'time_in_l1_hyperglycemia', 'time_in_l2_hyperglycemia'], np.nan)
+
+    def percentage(flags):
+        return 100 * np.count_nonzero(flags) / values.shape[0]
+
+    # Return the results
+    results = dict()
+    results['time_in_target'] = percentage((values > th_hypo) & (values < th_hyper))
+    results['time_in_tight_target'] = percentage((values > _TH_TIGHT_TARGET[0]) & (values < _TH_TIGHT_TARGET[1]))
+    results['time_in_hypoglycemia'] = percentage(values <= th_hypo)
+    results['time_in_l1_hypoglycemia'] = percentage((values > _TH_L2_HYPO) & (values <= th_hypo))
+    results['time_in_l2_hypoglycemia'] = percentage(values <= _TH_L2_HYPO)
+    results['time_in_hyperglycemia'] = percentage(values >= th_hyper)
+    results['time_in_l1_hyperglycemia'] = percentage((values >= th_hyper) & (values < _TH_L2_HYPER))
+    results['time_in_l2_hyperglycemia'] = percentage(values >= _TH_L2_HYPER)
+    return results
+
+
+def _thresholds(glycemic_target):
+    """
+    Returns the hypoglycemia and hyperglycemia thresholds of the given glycemic target.
+
+    Parameters
+    ----------
+    glycemic_target: str, {'diabetes', 'pregnancy'}
+        A string defining the set of glycemic targets to use.
+
+    Returns
+    -------
+    th_hypo: float
+        The hypoglycemia threshold (in mg/dl).
+    th_hyper: float
+        The hyperglycemia threshold (in mg/dl).
+
+    Raises
+    ------
+    RuntimeError
+        If `glycemic_target` is not `diabetes` or `pregnancy`.
+
+    See Also
+    --------
+    None
+
+    Examples
+    --------
+    None
+
+    References
+    ----------
+    None
+    """
+    if glycemic_target not in _TH_HYPO:
+        raise RuntimeError('`glycemic_target` can be `diabetes` or `pregnancy`.')
+    return _TH_HYPO[glycemic_target], _TH_HYPER[glycemic_target]
@@ -1,7 +1,6 @@
 import pandas as pd
 import numpy as np
-import datetime
-from datetime import datetime, timedelta
+from datetime import datetime
 
 from py_agata.time_in_ranges import time_in_l2_hyperglycemia
 
@@ -35,16 +34,8 @@ def test_time_in_l2_hyperglycemia():
     None
     """
     # Set test data
-    t = np.arange(datetime(2000, 1, 1, 0, 0, 0), datetime(2000, 1, 1, 0, 55, 0), timedelta(minutes=5)).astype(
-        datetime)
-    glucose = np.zeros(shape=(t.shape[0],))
-    glucose[0] = 40
-    glucose[1:3] = [60, 60]
-    glucose[3] = 80
-    glucose[4:6] = [120, 120]
-    glucose[6:8] = [200, 200]
-    glucose[8:10] = [260, 260]
-    glucose[10] = np.nan
+    t = pd.date_range(start=datetime(2000, 1, 1, 0, 0, 0), periods=11, freq='5min').to_numpy()
+    glucose = np.array([40, 60, 60, 80, 120, 120, 200, 200, 260, 260, np.nan])
     d = {'t': t, 'glucose': glucose}
     data = pd.DataFrame(data=d)
 
@@ -61,16 +52,8 @@ def test_time_in_l2_hyperglycemia():
         assert True
 
     # Set empty data
-    t = np.arange(datetime(2000, 1, 1, 1, 0, 0), datetime(2000, 1, 1, 1, 55, 0), timedelta(minutes=5)).astype(
-        datetime)
-    glucose = np.zeros(shape=(t.shape[0],))
-    glucose[0] = np.nan
-    glucose[1:3] = [np.nan, np.nan]
-    glucose[3] = np.nan
-    glucose[4:6] = [np.nan, np.nan]
-    glucose[6:8] = [np.nan, np.nan]
-    glucose[8:10] = [np.nan, np.nan]
-    glucose[10] = np.nan
+    t = pd.date_range(start=datetime(2000, 1, 1, 1, 0, 0), periods=11, freq='5min').to_numpy()
+    glucose = np.full(11, np.nan)
     d = {'t': t, 'glucose': glucose}
     data = pd.DataFrame(data=d)
 
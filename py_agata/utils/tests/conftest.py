@@ -0,0 +1,109 @@
+import os
+import pytest
+
+from py_agata.utils import read_dexcom_data, read_eversense_data, read_freestyle_libre_data
+
+
+@pytest.fixture(scope="session")
+def dexcom_data():
+    """
+    Dexcom example data, read once per test session. The tests must not modify them.
+
+    Parameters
+    ----------
+    None
+
+    Returns
+    -------
+    data: pd.DataFrame
+        Pandas dataframe with a column `t` containing the timestamps and a column `glucose` containing the glucose
+        data (in mg/dl).
+
+    Raises
+    ------
+    None
+
+    See Also
+    --------
+    read_dexcom_data
+
+    Examples
+    --------
+    None
+
+    References
+    ----------
+    None
+    """
+    file = os.path.join(os.path.abspath(''), 'example', 'data', 'dexcom_example.xlsx')
+    return read_dexcom_data(file)
+
+
+@pytest.fixture(scope="session")
+def eversense_data():
+    """
+    Eversense example data, read once per test session. The tests must not modify them.
+
+    Parameters
+    ----------
+    None
+
+    Returns
+    -------
+    data: pd.DataFrame
+        Pandas dataframe with a column `t` containing the timestamps and a column `glucose` containing the glucose
+        data (in mg/dl).
+
+    Raises
+    ------
+    None
+
+    See Also
+    --------
+    read_eversense_data
+
+    Examples
+    --------
+    None
+
+    References
+    ----------
+    None
+    """
+    file = os.path.join(os.path.abspath(''), 'example', 'data', 'eversense_example.xlsx')
+    return read_eversense_data(file)
+
+
+@pytest.fixture(scope="session")
+def freestyle_libre_data():
+    """
+    Freestyle Libre example data, read once per test session. The tests must not modify them.
+
+    Parameters
+    ----------
+    None
+
+    Returns
+    -------
+    data: pd.DataFrame
+        Pandas dataframe with a column `t` containing the timestamps and a column `glucose` containing the glucose
+        data (in mg/dl).
+
+    Raises
+    ------
+    None
+
+    See Also
+    --------
+    read_freestyle_libre_data
+
+    Examples
+    --------
+    None
+
+    References
+    ----------
+    None
+    """
+    file = os.path.join(os.path.abspath(''), 'example', 'data', 'freestyle_libre_example.xlsx')
+    return read_freestyle_libre_data(file)
@@ -35,8 +35,7 @@ def test_glucose_time_vectors_to_dataframe():
     None
     """
     # Set test data
-    t = np.arange(datetime(2000, 1, 1, 0, 30, 0), datetime(2000, 1, 1, 0, 45, 0), timedelta(minutes=5)).astype(
-        datetime)
+    t = pd.date_range(start=datetime(2000, 1, 1, 0, 30, 0), periods=3, freq='5min').to_pydatetime()
     glucose = np.zeros(shape=(t.shape[0],))
     glucose[0] = np.nan
     glucose[1:3] = [100, 200]
@@ -50,7 +49,7 @@ def test_glucose_time_vectors_to_dataframe():
     assert np.isnan(results.glucose.values[0])
     assert results.glucose.values[1] == 100
     assert results.glucose.values[2] == 200
-    assert pd.to_datetime(results.t.values[0]).to_pydatetime() == t[0]
-    assert pd.to_datetime(results.t.values[1]).to_pydatetime() == t[1]
-    assert pd.to_datetime(results.t.values[2]).to_pydatetime() == t[2]
+    assert results.t.iloc[0].to_pydatetime() == t[0]
+    assert results.t.iloc[1].to_pydatetime() == t[1]
+    assert results.t.iloc[2].to_pydatetime() == t[2]
 
@@ -35,10 +35,8 @@ def test_glucose_vector_to_dataframe():
     None
     """
     # Set test data
-    t1 = np.arange(datetime(2000, 1, 1, 0, 0, 0), datetime(2000, 1, 1, 0, 15, 0), timedelta(minutes=5)).astype(
-        datetime)
-    t2 = np.arange(datetime(2000, 1, 1, 1, 0, 0), datetime(2000, 1, 1, 1, 15, 0), timedelta(minutes=5)).astype(
-        datetime)
+    t1 = pd.date_range(start=datetime(2000, 1, 1, 0, 0, 0), periods=3, freq='5min').to_pydatetime()
+    t2 = pd.date_range(start=datetime(2000, 1, 1, 1, 0, 0), periods=3, freq='5min').to_pydatetime()
     glucose = np.zeros(shape=(t1.shape[0],))
     glucose[0] = np.nan
     glucose[1:3] = [100, 200]
@@ -52,9 +50,9 @@ def test_glucose_vector_to_dataframe():
     assert np.isnan(results.glucose.values[0])
     assert results.glucose.values[1] == 100
     assert results.glucose.values[2] == 200
-    assert pd.to_datetime(results.t.values[0]).to_pydatetime() == t1[0]
-    assert pd.to_datetime(results.t.values[1]).to_pydatetime() == t1[1]
-    assert pd.to_datetime(results.t.values[2]).to_pydatetime() == t1[2]
+    assert results.t.iloc[0].to_pydatetime() == t1[0]
+    assert results.t.iloc[1].to_pydatetime() == t1[1]
+    assert results.t.iloc[2].to_pydatetime() == t1[2]
 
     results = glucose_vector_to_dataframe(glucose=glucose, sample_time=5, start_time=t2[0])
     assert type(results) is pd.DataFrame
@@ -64,7 +62,7 @@ def test_glucose_vector_to_dataframe():
     assert np.isnan(results.glucose.values[0])
     assert results.glucose.values[1] == 100
     assert results.glucose.values[2] == 200
-    assert pd.to_datetime(results.t.values[0]).to_pydatetime() == t2[0]
-    assert pd.to_datetime(results.t.values[1]).to_pydatetime() == t2[1]
-    assert pd.to_datetime(results.t.values[2]).to_pydatetime() == t2[2]
+    assert results.t.iloc[0].to_pydatetime() == t2[0]
+    assert results.t.iloc[1].to_pydatetime() == t2[1]
+    assert results.t.iloc[2].to_pydatetime() == t2[2]
 
@@ -2,11 +2,9 @@ import pandas as pd
 import numpy as np
 import datetime
 from datetime import datetime, timedelta
-import os
-from py_agata.utils import read_dexcom_data
 
 
-def test_read_dexcom_data():
+def test_read_dexcom_data(dexcom_data):
     """
     Unit test of read_dexcom_data function.
 
@@ -35,13 +33,10 @@ def test_read_dexcom_data():
     None
     """
 
-    file = os.path.join(os.path.abspath(''),'example','data','dexcom_example.xlsx')
-    # d = {'t': time_range, 'glucose': data.glucose.values}
-    # data = pd.DataFrame(data=d)
+    # Set test data (read once per test session)
+    data = dexcom_data
 
     #Tests
-    data = read_dexcom_data(file)
-
     assert type(data) is pd.DataFrame
     assert 't' in data.columns
     assert 'glucose' in data.columns
@@ -50,4 +50,9 @@ def test_to_mg_dl():
     assert 'glucose' in results.columns
     assert np.isnan(results.glucose.values[0])
     assert np.round(results.glucose.values[1]*10)/10 == 1801.8
-    assert np.round(results.glucose.values[2]*10)/10 == 3603.6
\ No newline at end of file
+    assert np.round(results.glucose.values[2]*10)/10 == 3603.6
+    results = to_mg_dl(glucose)
+    assert type(results) is np.ndarray
+    assert np.isnan(results[0])
+    assert np.round(results[1]*10)/10 == 1801.8
+    assert np.round(to_mg_dl(200.)*10)/10 == 3603.6
@@ -51,3 +51,9 @@ def test_to_mmol_l():
     assert np.isnan(results.glucose.values[0])
     assert np.round(results.glucose.values[1]*10)/10 == 100
     assert np.round(results.glucose.values[2]*10)/10 == 200
+
+    results = to_mmol_l(glucose)
+    assert type(results) is np.ndarray
+    assert np.isnan(results[0])
+    assert np.round(results[1]*10)/10 == 100
+    assert np.round(to_mmol_l(3603.6)*10)/10 == 200
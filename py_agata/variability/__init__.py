@@ -1,11 +1,9 @@
 import numpy as np
 import pandas as pd
-from scipy.stats import iqr
 from scipy.signal import find_peaks
-from datetime import timedelta
 
 from py_agata.input_validator import *
-from py_agata.time_in_ranges import time_in_target, time_in_hypoglycemia
+from py_agata.time_in_ranges import _time_in_ranges
 
 
 def mean_glucose(data):
@@ -14,9 +12,9 @@ def mean_glucose(data):
 
     Parameters
     ----------
-    data: pd.DataFrame
+    data: pd.DataFrame or np.ndarray
         Pandas dataframe with a column `glucose` containing the glucose data
-        to analyze (in mg/dl)
+        to analyze (in mg/dl), or directly a vector of double containing the glucose data
 
     Returns
     -------
@@ -39,20 +37,17 @@ def mean_glucose(data):
     ----------
     Wikipedia on mean: https://en.wikipedia.org/wiki/Mean (Accessed: 2020-12-10).
     """
+    # Compute the result directly on glucose vectors
+    if isinstance(data, np.ndarray):
+        return _mean_glucose(data)
+
     # Check input
     check_dataframe(data)
     check_data_columns(data)
     check_homogeneous_timegrid(data)
 
-    # Get non-nan values
-    values = data.glucose.values[~np.isnan(data.glucose.values)]
-
-    # Return nan if all values are nan
-    if values.size == 0:
-        return np.nan
-
     # Return the result
-    return np.mean(values)
+    return _mean_glucose(data.glucose.values)
 
 
 def median_glucose(data):
@@ -61,9 +56,9 @@ def median_glucose(data):
 
     Parameters
     ----------
-    data: pd.DataFrame
+    data: pd.DataFrame or np.ndarray
         Pandas dataframe with a column `glucose` containing the glucose data
-        to analyze (in mg/dl)
+        to analyze (in mg/dl), or directly a vector of double containing the glucose data
 
     Returns
     -------
@@ -86,20 +81,17 @@ def median_glucose(data):
     ----------
     Wikipedia on median: https://en.wikipedia.org/wiki/Median (Accessed: 2020-12-10).
     """
+    # Compute the result directly on glucose vectors
+    if isinstance(data, np.ndarray):
+        return _median_glucose(data)
+
     # Check input
     check_dataframe(data)
     check_data_columns(data)
     check_homogeneous_timegrid(data)
 
-    # Get non-nan values
-    values = data.glucose.values[~np.isnan(data.glucose.values)]
-
-    # Return nan if all values are nan
-    if values.size == 0:
-        return np.nan
-
     # Return the result
-    return np.median(values)
+    return _median_glucose(data.glucose.values)
 
 
 def std_glucose(data):
@@ -108,9 +100,9 @@ def std_glucose(data):
 
     Parameters
     ----------
-    data: pd.DataFrame
+    data: pd.DataFrame or np.ndarray
         Pandas dataframe with a column `glucose` containing the glucose data
-        to analyze (in mg/dl)
+        to analyze (in mg/dl), or directly a vector of double containing the glucose data
 
     Returns
     -------
@@ -133,20 +125,17 @@ def std_glucose(data):
     ----------
     Wikipedia on standard deviation: https://en.wikipedia.org/wiki/Standard_deviation (Accessed: 2020-12-10).
     """
+    # Compute the result directly on glucose vectors
+    if isinstance(data, np.ndarray):
+        return _std_glucose(data)
+
     # Check input
     check_dataframe(data)
     check_data_columns(data)
     check_homogeneous_timegrid(data)
 
-    # Get non-nan values
-    values = data.glucose.values[~np.isnan(data.glucose.values)]
-
-    # Return nan if all values are nan
-    if values.size == 0:
-        return np.nan
-
     # Return the result
-    return np.std(values, ddof=1)
+    return _std_glucose(data.glucose.values)
 
 
 def cv_glucose(data):
@@ -155,9 +144,9 @@ def cv_glucose(data):
 
     Parameters
     ----------
-    data: pd.DataFrame
+    data: pd.DataFrame or np.ndarray
         Pandas dataframe with a column `glucose` containing the glucose data
-        to analyze (in mg/dl)
+        to analyze (in mg/dl), or directly a vector of double containing the glucose data
 
     Returns
     -------
@@ -180,13 +169,17 @@ def cv_glucose(data):
     ----------
     Wikipedia on coefficient of variation: https://en.wikipedia.org/wiki/Coefficient_of_variation (Accessed: 2020-12-10).
     """
+    # Compute the result directly on glucose vectors
+    if isinstance(data, np.ndarray):
+        return _cv_glucose(data)
+
     # Check input
     check_dataframe(data)
     check_data_columns(data)
     check_homogeneous_timegrid(data)
 
     # Return the result
-    return 100 * std_glucose(data) / mean_glucose(data)
+    return _cv_glucose(data.glucose.values)
 
 
 def range_glucose(data):
@@ -195,9 +188,9 @@ def range_glucose(data):
 
     Parameters
     ----------
-    data: pd.DataFrame
+    data: pd.DataFrame or np.ndarray
         Pandas dataframe with a column `glucose` containing the glucose data
-        to analyze (in mg/dl)
+        to analyze (in mg/dl), or directly a vector of double containing the glucose data
 
     Returns
     -------
@@ -220,15 +213,17 @@ def range_glucose(data):
     ----------
     Wikipedia on range: https://en.wikipedia.org/wiki/Range_(statistics) (Accessed: 2020-12-10).
     """
+    # Compute the result directly on glucose vectors
+    if isinstance(data, np.ndarray):
+        return _range_glucose(data)
+
     # Check input
     check_dataframe(data)
     check_data_columns(data)
     check_homogeneous_timegrid(data)
 
     # Return the result
-    if(data.glucose.values.size == 0):
-        return np.nan
-    return np.nanmax(data.glucose.values) - np.nanmin(data.glucose.values)
+    return _range_glucose(data.glucose.values)
 
 
 def iqr_glucose(data):
@@ -237,9 +232,9 @@ def iqr_glucose(data):
 
     Parameters
     ----------
-    data: pd.DataFrame
+    data: pd.DataFrame or np.ndarray
         Pandas dataframe with a column `glucose` containing the glucose data
-        to analyze (in mg/dl)
+        to analyze (in mg/dl), or directly a vector of double containing the glucose data
 
     Returns
     -------
@@ -262,16 +257,17 @@ def iqr_glucose(data):
     ----------
     Wikipedia on IQR: https://en.wikipedia.org/wiki/Interquartile_range (Accessed: 2020-12-10).
     """
+    # Compute the result directly on glucose vectors
+    if isinstance(data, np.ndarray):
+        return _iqr_glucose(data)
+
     # Check input
     check_dataframe(data)
     check_data_columns(data)
     check_homogeneous_timegrid(data)
 
-    # Get rid of nans
-    values = data.glucose.values[~np.isnan(data.glucose.values)]
-
     # Return the result
-    return iqr(values)
+    return _iqr_glucose(data.glucose.values)
 
 
 def auc_glucose_over_basal(data, basal):
@@ -311,23 +307,16 @@ def auc_glucose_over_basal(data, basal):
     check_homogeneous_timegrid(data)
     check_float_parameter(basal)
 
-    # Get non-nan values
-    values = data.glucose.values[~np.isnan(data.glucose.values)]
-
     # Return nan if all values are nan
-    if values.size == 0:
+    if np.all(np.isnan(data.glucose.values)):
         return np.nan
 
-    # Shift the trace
-    values = values - basal
-
-    # Get ts
-    t0 = pd.to_datetime(data.t.values[0]).to_pydatetime()
-    t1 = pd.to_datetime(data.t.values[1]).to_pydatetime()
-    ts = (t1 - t0).total_seconds() / 60
+    # Get ts (from the first two timestamps only, in ns)
+    t = np.asarray(data.t.values[:2], dtype='datetime64[ns]').view('i8')
+    ts = (t[1] - t[0]) / 6e10
 
     # Return the result
-    return np.sum(values*ts)
+    return _auc_glucose_over_basal(data.glucose.values, basal, ts)
 
 
 def auc_glucose(data):
@@ -377,9 +366,9 @@ def gmi(data):
 
     Parameters
     ----------
-    data: pd.DataFrame
+    data: pd.DataFrame or np.ndarray
         Pandas dataframe with a column `glucose` containing the glucose data
-        to analyze (in mg/dl)
+        to analyze (in mg/dl), or directly a vector of double containing the glucose data
 
     Returns
     -------
@@ -404,13 +393,17 @@ def gmi(data):
     for estimating A1C from continuous glucose monitoring", Diabetes Care,
     2018, vol. 41, pp. 2275-2280. DOI: 10.2337/dc18-1581.
     """
+    # Compute the result directly on glucose vectors
+    if isinstance(data, np.ndarray):
+        return _gmi(data)
+
     # Check input
     check_dataframe(data)
     check_data_columns(data)
     check_homogeneous_timegrid(data)
 
     # Return results
-    return 3.31 + 0.02392 * mean_glucose(data)
+    return _gmi(data.glucose.values)
 
 
 def cogi(data):
@@ -451,19 +444,8 @@ def cogi(data):
     check_data_columns(data)
     check_homogeneous_timegrid(data)
 
-    # Compute TIR component
-    tir = time_in_target(data)*0.5
-
-    # Compute TBR component
-    tbr = np.min([15, time_in_hypoglycemia(data)])
-    tbr = (100 - 100 / 15 * tbr) * 0.35
-
-    # Compute GV component
-    gv = np.min([np.max([std_glucose(data) / 18.018, 1]), 6])
-    gv = (120 - 20 * gv) * 0.15
-
     # Return results
-    return tir + tbr + gv
+    return _cogi(data.glucose.values)
 
 
 def conga(data):
@@ -504,28 +486,8 @@ def conga(data):
     check_data_columns(data)
     check_homogeneous_timegrid(data)
 
-    # Set the CONGAOrd hyperparameter to 4 (number of hours in the past it
-    # refers to)
-    conga_ord = 4
-
-    # Build vectors
-    n = data.glucose.values.size
-    dc = np.empty(shape=(0,))
-
-    for i in range(1,n):
-
-        # Find the index referring to conga_ord hours ago
-        j = np.where(data.t <= (pd.to_datetime(data.t.values[i]).to_pydatetime() - timedelta(hours=conga_ord)))[0]
-
-        if not j.size == 0:
-            j = j[-1]
-            dc = np.append(dc, data.glucose.values[i] - data.glucose[j])
-
-    # Return results
-    if dc.size == 0:
-        return np.nan
-    else:
-        return np.nanstd(dc, ddof=1)
+    # Return the result
+    return _conga(np.asarray(data.t.values, dtype='datetime64[ns]').view('i8'), data.glucose.values)
 
 
 def j_index(data):
@@ -534,9 +496,9 @@ def j_index(data):
 
     Parameters
     ----------
-    data: pd.DataFrame
+    data: pd.DataFrame or np.ndarray
         Pandas dataframe with a column `glucose` containing the glucose data
-        to analyze (in mg/dl)
+        to analyze (in mg/dl), or directly a vector of double containing the glucose data
 
     Returns
     -------
@@ -561,12 +523,17 @@ def j_index(data):
     glucose control in diabetic patients", Hormone and Metabolic Reseach,
     1995, vol. 27, pp. 41-42. DOI: 10.1055/s-2007-979906.
     """
+    # Compute the result directly on glucose vectors
+    if isinstance(data, np.ndarray):
+        return _j_index(data)
+
     # Check input
     check_dataframe(data)
     check_data_columns(data)
     check_homogeneous_timegrid(data)
 
-    return 1e-3 * (mean_glucose(data) + std_glucose(data)) ** 2
+    # Return the result
+    return _j_index(data.glucose.values)
 
 
 def mage_plus_index(data):
@@ -607,139 +574,7 @@ def mage_plus_index(data):
     check_data_columns(data)
     check_homogeneous_timegrid(data)
 
-    # Get the first and last day limits
-    if data.t.values.size == 0:
-        return np.nan
-
-    first_day = pd.to_datetime(data.t.values[0]).to_pydatetime()
-    first_day = first_day.replace(hour=0, minute=0, second=0)
-    last_day = pd.to_datetime(data.t.values[-1]).to_pydatetime()
-    last_day = last_day.__add__(timedelta(days=1)).replace(hour=0, minute=0, second=0)
-
-
-    # Calculate the number of days and preallocate
-    n_days = (last_day - first_day).days
-    mage_day_plus = np.empty(shape=(n_days,))
-
-    for d in range(0, n_days):
-
-        # Step 0: parameters
-
-        # Get the day of data
-        low_limit = data.t >= (first_day + timedelta(days=d))
-        high_limit = data.t < (first_day + timedelta(days=d + 1))
-        flags = np.logical_and(low_limit, high_limit)
-        day_data = data.glucose.values[flags]
-
-        # Get glucose values (might be nan)
-        std_within = np.nanstd(day_data, ddof=1)
-        n = day_data.size
-
-        if n > 3:
-            # Step 1: turning points are only local extrema
-            i_max = find_peaks(day_data)[0]
-            i_min = find_peaks(-day_data)[0]
-            i_turning = np.union1d([0, n-1], np.union1d(i_max, i_min)).astype(int)
-
-            turning = day_data[i_turning]
-            n_turning = i_turning.size
-
-            # Step 2: Turning points of no interest are removed
-            # A turning point is removed if it's not significantly different from
-            # BOTH its left and right-hand side RETAINED neighbours.
-
-            to_be_kept = [True] * n_turning
-
-            for i in range(1, n_turning-1): # First and last samples are retained
-
-                condition_1 = abs(turning[i] - turning[i - 1]) < std_within
-                condition_2 = abs(turning[i + 1] - turning[i]) < std_within
-                to_be_kept[i] = not(condition_1 and condition_2)
-
-            i_turning = i_turning[to_be_kept]
-
-            # Step 3: Turning points are removed again or moved appropriately
-            i = 1
-            while i < len(i_turning)-1:
-                prev = i_turning[i - 1]
-                curr = i_turning[i]
-                next = i_turning[i + 1]
-                prev_slope = day_data[curr] - day_data[prev]
-                next_slope = day_data[next] - day_data[curr]
-
-                if prev_slope < 0 and next_slope > 0:  # Minimum
-                    # The actual current turning point is the min in the interval
-                    temp = np.nanargmin(day_data[prev:(next+1)]) + prev
-                    curr = temp
-                    i_turning[i] = curr
-                    # The actual previous turning point is the max to the left of the current turning point.
-                    temp = np.nanargmax(day_data[prev:curr]) + prev
-                    i_turning[i - 1] = temp
-                    # The actual following turning point is the max to the right of the current turning point.
-                    temp = np.nanargmax(day_data[(curr + 1):(next+1)]) + curr + 1
-                    i_turning[i + 1] = temp
-
-                    i += 1
-                elif prev_slope > 0 and next_slope < 0:  # Maximum
-                    # The actual current turning point is the max in the interval
-                    temp = np.nanargmax(day_data[prev:(next+1)]) + prev
-                    curr = temp
-                    i_turning[i] = curr
-                    # The actual previous turning point is the min to the left of the current turning point.
-                    temp = np.nanargmin(day_data[prev:curr]) + prev
-                    i_turning[i - 1] = temp
-                    # The actual following turning point is the min to the right of the current turning point.
-                    temp = np.nanargmin(day_data[(curr + 1):(next+1)]) + curr + 1
-                    i_turning[i + 1] = temp
-
-                    i += 1
-                else:  # Middle point
-                    i_turning = np.delete(i_turning, i)
-
-            # Step 4: Remove residual spurious turning points.
-            # Turning points not significantly different from EITHER neighbour are
-            # removed. Some extra processing is needed for the first and last sample.
-            sample1 = day_data[i_turning[0]]
-            sample2 = day_data[i_turning[1]]
-
-            if abs(sample2 - sample1) < std_within:
-                i_turning = np.delete(i_turning, 0)
-
-            if len(i_turning) > 1:
-                # Last sample processing
-                sample1 = day_data[i_turning[-2]]
-                sample2 = day_data[i_turning[-1]]
-                if abs(sample2 - sample1) < std_within:
-                    i_turning = np.delete(i_turning, len(i_turning)-1)
-
-            turning = day_data[i_turning]
-            n_turning = len(i_turning)
-
-            # Internal points
-            to_be_kept = np.ones(n_turning, dtype=bool)
-            for i in range(1, n_turning - 1):
-                condition1 = abs(turning[i] - turning[i - 1]) < std_within
-                condition2 = abs(turning[i + 1] - turning[i]) < std_within
-                to_be_kept[i] = not(condition1 or condition2)
-
-            i_turning = i_turning[to_be_kept]
-            turning = day_data[i_turning]
-
-            # Step 5: Compute daily MAGE+
-            excursions = np.diff(turning)
-            mage_day_plus[d] = np.nanmean(excursions[excursions > 0])
-        else:
-            mage_day_plus[d] = np.nan
-
-    # Compute index
-    mage_day_plus[np.isnan(mage_day_plus)] = 0  # Correct for 'mean' behavior
-    mpi = np.mean(mage_day_plus)
-
-    # Manage all nan data
-    if np.all(np.isnan(data['glucose'])):
-        mpi = np.nan
-
-    return mpi
+    return _mage_plus_index(_daily_excursions(data))
 
 
 def mage_minus_index(data):
@@ -780,138 +615,7 @@ def mage_minus_index(data):
     check_data_columns(data)
     check_homogeneous_timegrid(data)
 
-    if data.t.values.size == 0:
-        return np.nan
-    # Get the first and last day limits
-    first_day = pd.to_datetime(data.t.values[0]).to_pydatetime()
-    first_day = first_day.replace(hour=0, minute=0, second=0)
-    last_day = pd.to_datetime(data.t.values[-1]).to_pydatetime()
-    last_day = last_day.__add__(timedelta(days=1)).replace(hour=0, minute=0, second=0)
-
-
-    # Calculate the number of days and preallocate
-    n_days = (last_day - first_day).days
-    mage_day_minus = np.empty(shape=(n_days,))
-
-    for d in range(0, n_days):
-
-        # Step 0: parameters
-
-        # Get the day of data
-        low_limit = data.t >= (first_day + timedelta(days=d))
-        high_limit = data.t < (first_day + timedelta(days=d + 1))
-        flags = np.logical_and(low_limit, high_limit)
-        day_data = data.glucose.values[flags]
-
-        # Get glucose values (might be nan)
-        std_within = np.nanstd(day_data, ddof=1)
-        n = day_data.size
-
-        if n > 3:
-            # Step 1: turning points are only local extrema
-            i_max = find_peaks(day_data)[0]
-            i_min = find_peaks(-day_data)[0]
-            i_turning = np.union1d([0, n-1], np.union1d(i_max, i_min)).astype(int)
-
-            turning = day_data[i_turning]
-            n_turning = i_turning.size
-
-            # Step 2: Turning points of no interest are removed
-            # A turning point is removed if it's not significantly different from
-            # BOTH its left and right-hand side RETAINED neighbours.
-
-            to_be_kept = [True] * n_turning
-
-            for i in range(1, n_turning-1): # First and last samples are retained
-
-                condition_1 = abs(turning[i] - turning[i - 1]) < std_within
-                condition_2 = abs(turning[i + 1] - turning[i]) < std_within
-                to_be_kept[i] = not(condition_1 and condition_2)
-
-            i_turning = i_turning[to_be_kept]
-
-            # Step 3: Turning points are removed again or moved appropriately
-            i = 1
-            while i < len(i_turning)-1:
-                prev = i_turning[i - 1]
-                curr = i_turning[i]
-                next = i_turning[i + 1]
-                prev_slope = day_data[curr] - day_data[prev]
-                next_slope = day_data[next] - day_data[curr]
-
-                if prev_slope < 0 and next_slope > 0:  # Minimum
-                    # The actual current turning point is the min in the interval
-                    temp = np.nanargmin(day_data[prev:(next+1)]) + prev
-                    curr = temp
-                    i_turning[i] = curr
-                    # The actual previous turning point is the max to the left of the current turning point.
-                    temp = np.nanargmax(day_data[prev:curr]) + prev
-                    i_turning[i - 1] = temp
-                    # The actual following turning point is the max to the right of the current turning point.
-                    temp = np.nanargmax(day_data[(curr + 1):(next+1)]) + curr + 1
-                    i_turning[i + 1] = temp
-
-                    i += 1
-                elif prev_slope > 0 and next_slope < 0:  # Maximum
-                    # The actual current turning point is the max in the interval
-                    temp = np.nanargmax(day_data[prev:(next+1)]) + prev
-                    curr = temp
-                    i_turning[i] = curr
-                    # The actual previous turning point is the min to the left of the current turning point.
-                    temp = np.nanargmin(day_data[prev:curr]) + prev
-                    i_turning[i - 1] = temp
-                    # The actual following turning point is the min to the right of the current turning point.
-                    temp = np.nanargmin(day_data[(curr + 1):(next+1)]) + curr + 1
-                    i_turning[i + 1] = temp
-
-                    i += 1
-                else:  # Middle point
-                    i_turning = np.delete(i_turning, i)
-
-            # Step 4: Remove residual spurious turning points.
-            # Turning points not significantly different from EITHER neighbour are
-            # removed. Some extra processing is needed for the first and last sample.
-            sample1 = day_data[i_turning[0]]
-            sample2 = day_data[i_turning[1]]
-
-            if abs(sample2 - sample1) < std_within:
-                i_turning = np.delete(i_turning, 0)
-
-            if len(i_turning) > 1:
-                # Last sample processing
-                sample1 = day_data[i_turning[-2]]
-                sample2 = day_data[i_turning[-1]]
-                if abs(sample2 - sample1) < std_within:
-                    i_turning = np.delete(i_turning, len(i_turning)-1)
-
-            turning = day_data[i_turning]
-            n_turning = len(i_turning)
-
-            # Internal points
-            to_be_kept = np.ones(n_turning, dtype=bool)
-            for i in range(1, n_turning - 1):
-                condition1 = abs(turning[i] - turning[i - 1]) < std_within
-                condition2 = abs(turning[i + 1] - turning[i]) < std_within
-                to_be_kept[i] = not(condition1 or condition2)
-
-            i_turning = i_turning[to_be_kept]
-            turning = day_data[i_turning]
-
-            # Step 5: Compute daily MAGE+
-            excursions = np.diff(turning)
-            mage_day_minus[d] = np.nanmean(excursions[excursions < 0])
-        else:
-            mage_day_minus[d] = np.nan
-
-    # Compute index
-    mage_day_minus[np.isnan(mage_day_minus)] = 0  # Correct for 'mean' behavior
-    mmi = -np.mean(mage_day_minus)
-
-    # Manage all nan data
-    if np.all(np.isnan(data['glucose'])):
-        mmi = np.nan
-
-    return mmi
+    return _mage_minus_index(_daily_excursions(data))
 
 
 def mage_index(data):
@@ -952,9 +656,7 @@ def mage_index(data):
     check_data_columns(data)
     check_homogeneous_timegrid(data)
 
-    if np.isnan(mage_plus_index(data)) and np.isnan(mage_minus_index(data)):
-        return np.nan
-    return np.nanmean([mage_plus_index(data), mage_minus_index(data)])
+    return _mage_index(_daily_excursions(data))
 
 
 def ef_index(data):
@@ -995,141 +697,7 @@ def ef_index(data):
     check_data_columns(data)
     check_homogeneous_timegrid(data)
 
-    if data.t.values.size == 0:
-        return np.nan
-
-    # Set the fixed parameter
-    ef_th = 75
-
-    # Get the first and last day limits
-    first_day = pd.to_datetime(data.t.values[0]).to_pydatetime()
-    first_day = first_day.replace(hour=0, minute=0, second=0)
-    last_day = pd.to_datetime(data.t.values[-1]).to_pydatetime()
-    last_day = last_day.__add__(timedelta(days=1)).replace(hour=0, minute=0, second=0)
-
-
-    # Calculate the number of days and preallocate
-    n_days = (last_day - first_day).days
-    ef_day = np.empty(shape=(n_days,))
-
-    for d in range(0, n_days):
-
-        # Step 0: parameters
-
-        # Get the day of data
-        low_limit = data.t >= (first_day + timedelta(days=d))
-        high_limit = data.t < (first_day + timedelta(days=d + 1))
-        flags = np.logical_and(low_limit, high_limit)
-        day_data = data.glucose.values[flags]
-
-        # Get glucose values (might be nan)
-        std_within = np.nanstd(day_data, ddof=1)
-        n = day_data.size
-
-        if n > 3:
-            # Step 1: turning points are only local extrema
-            i_max = find_peaks(day_data)[0]
-            i_min = find_peaks(-day_data)[0]
-            i_turning = np.union1d([0, n-1], np.union1d(i_max, i_min)).astype(int)
-
-            turning = day_data[i_turning]
-            n_turning = i_turning.size
-
-            # Step 2: Turning points of no interest are removed
-            # A turning point is removed if it's not significantly different from
-            # BOTH its left and right-hand side RETAINED neighbours.
-
-            to_be_kept = [True] * n_turning
-
-            for i in range(1, n_turning-1): # First and last samples are retained
-
-                condition_1 = abs(turning[i] - turning[i - 1]) < std_within
-                condition_2 = abs(turning[i + 1] - turning[i]) < std_within
-                to_be_kept[i] = not(condition_1 and condition_2)
-
-            i_turning = i_turning[to_be_kept]
-
-            # Step 3: Turning points are removed again or moved appropriately
-            i = 1
-            while i < len(i_turning)-1:
-                prev = i_turning[i - 1]
-                curr = i_turning[i]
-                next = i_turning[i + 1]
-                prev_slope = day_data[curr] - day_data[prev]
-                next_slope = day_data[next] - day_data[curr]
-
-                if prev_slope < 0 and next_slope > 0:  # Minimum
-                    # The actual current turning point is the min in the interval
-                    temp = np.nanargmin(day_data[prev:(next+1)]) + prev
-                    curr = temp
-                    i_turning[i] = curr
-                    # The actual previous turning point is the max to the left of the current turning point.
-                    temp = np.nanargmax(day_data[prev:curr]) + prev
-                    i_turning[i - 1] = temp
-                    # The actual following turning point is the max to the right of the current turning point.
-                    temp = np.nanargmax(day_data[(curr + 1):(next+1)]) + curr + 1
-                    i_turning[i + 1] = temp
-
-                    i += 1
-                elif prev_slope > 0 and next_slope < 0:  # Maximum
-                    # The actual current turning point is the max in the interval
-                    temp = np.nanargmax(day_data[prev:(next+1)]) + prev
-                    curr = temp
-                    i_turning[i] = curr
-                    # The actual previous turning point is the min to the left of the current turning point.
-                    temp = np.nanargmin(day_data[prev:curr]) + prev
-                    i_turning[i - 1] = temp
-                    # The actual following turning point is the min to the right of the current turning point.
-                    temp = np.nanargmin(day_data[(curr + 1):(next+1)]) + curr + 1
-                    i_turning[i + 1] = temp
-
-                    i += 1
-                else:  # Middle point
-                    i_turning = np.delete(i_turning, i)
-
-            # Step 4: Remove residual spurious turning points.
-            # Turning points not significantly different from EITHER neighbour are
-            # removed. Some extra processing is needed for the first and last sample.
-            sample1 = day_data[i_turning[0]]
-            sample2 = day_data[i_turning[1]]
-
-            if abs(sample2 - sample1) < std_within:
-                i_turning = np.delete(i_turning, 0)
-
-            if len(i_turning) > 1:
-                # Last sample processing
-                sample1 = day_data[i_turning[-2]]
-                sample2 = day_data[i_turning[-1]]
-                if abs(sample2 - sample1) < std_within:
-                    i_turning = np.delete(i_turning, len(i_turning)-1)
-
-            turning = day_data[i_turning]
-            n_turning = len(i_turning)
-
-            # Internal points
-            to_be_kept = np.ones(n_turning, dtype=bool)
-            for i in range(1, n_turning - 1):
-                condition1 = abs(turning[i] - turning[i - 1]) < std_within
-                condition2 = abs(turning[i + 1] - turning[i]) < std_within
-                to_be_kept[i] = not(condition1 or condition2)
-
-            i_turning = i_turning[to_be_kept]
-            turning = day_data[i_turning]
-
-            # Step 5: Compute daily MAGE+
-            excursions = np.diff(turning)
-            ef_day[d] = np.where(abs(excursions) > ef_th)[0].size
-        else:
-            ef_day[d] = np.nan
-
-    # Compute index
-    ei = np.nansum(ef_day)/n_days
-
-    # Manage all nan data
-    if np.all(np.isnan(data['glucose'])):
-        ei = np.nan
-
-    return ei
+    return _ef_index(_daily_excursions(data))
 
 
 def modd(data):
@@ -1170,28 +738,8 @@ def modd(data):
     check_data_columns(data)
     check_homogeneous_timegrid(data)
 
-    # Build vectors
-    yesterday = timedelta(minutes=1440)
-
-    n = len(data)
-
-    Dm = []
-
-
-    for i in range(1, n):
-
-        # Find the index referring to the same time yesterday
-        j = np.where(data.t <= (pd.to_datetime(data.t.values[i]).to_pydatetime() - yesterday))[0]
-
-        if j.size > 0:  # if there is a meaningful sample in data[j]
-            j = j[-1]
-            Dm.append(abs(data.glucose.values[i] - data.glucose.values[j]))
-
-    if Dm:
-        modd = np.nanmean(Dm)
-    else:
-        modd = np.nan
-    return modd
+    # Return the result
+    return _modd(np.asarray(data.t.values, dtype='datetime64[ns]').view('i8'), data.glucose.values)
 
 
 def sddm_index(data):
@@ -1232,32 +780,8 @@ def sddm_index(data):
     check_data_columns(data)
     check_homogeneous_timegrid(data)
 
-    if data.t.values.size == 0:
-        return np.nan
-    # Get the first and last day limits
-    first_day = pd.to_datetime(data.t.values[0]).to_pydatetime()
-    first_day = first_day.replace(hour=0, minute=0, second=0)
-    last_day = pd.to_datetime(data.t.values[-1]).to_pydatetime()
-    last_day = last_day.__add__(timedelta(days=1)).replace(hour=0, minute=0, second=0)
-
-
-    # Calculate the number of days and preallocate
-    n_days = (last_day - first_day).days
-    mean_within = np.zeros(shape=(n_days,))
-
-    for d in range(0, n_days):
-
-        # Get the day of data
-        low_limit = data.t >= (first_day + timedelta(days=d))
-        high_limit = data.t < (first_day + timedelta(days=d + 1))
-        flags = np.logical_and(low_limit, high_limit)
-        day_data = data.glucose.values[flags]
-
-        # Get daily mean and std
-        mean_within[d] = np.nanmean(day_data)
-
-    # Compute index
-    return np.nanstd(mean_within, ddof=1)
+    # Return the result
+    return _sddm_index(np.asarray(data.t.values, dtype='datetime64[ns]').view('i8'), data.glucose.values)
 
 
 def sdw_index(data):
@@ -1298,32 +822,9 @@ def sdw_index(data):
     check_data_columns(data)
     check_homogeneous_timegrid(data)
 
-    if data.t.values.size == 0:
-        return np.nan
-    # Get the first and last day limits
-    first_day = pd.to_datetime(data.t.values[0]).to_pydatetime()
-    first_day = first_day.replace(hour=0, minute=0, second=0)
-    last_day = pd.to_datetime(data.t.values[-1]).to_pydatetime()
-    last_day = last_day.__add__(timedelta(days=1)).replace(hour=0, minute=0, second=0)
-
-
-    # Calculate the number of days and preallocate
-    n_days = (last_day - first_day).days
-    std_within = np.zeros(shape=(n_days,))
-
-    for d in range(0, n_days):
-
-        # Get the day of data
-        low_limit = data.t >= (first_day + timedelta(days=d))
-        high_limit = data.t < (first_day + timedelta(days=d + 1))
-        flags = np.logical_and(low_limit, high_limit)
-        day_data = data.glucose.values[flags]
-
-        # Get daily mean and std
-        std_within[d] = np.nanstd(day_data, ddof=1)
+    # Return the result
+    return _sdw_index(np.asarray(data.t.values, dtype='datetime64[ns]').view('i8'), data.glucose.values)
 
-    # Compute index
-    return np.nanmean(std_within)
 
 def glucose_roc(data):
     """
@@ -1366,16 +867,7 @@ def glucose_roc(data):
     check_data_columns(data)
     check_homogeneous_timegrid(data)
 
-    g_roc = np.empty(shape=(data.glucose.values.size,))
-    g_roc.fill(np.nan)
-
-    if g_roc.size > 4:
-
-        for t in range(3, g_roc.size):
-
-            g_roc[t] = (data.glucose.values[t] - data.glucose.values[t-3]) / 15
-
-    return pd.DataFrame(data={'t': data.t.values, 'glucose_roc': g_roc})
+    return pd.DataFrame(data={'t': data.t.values, 'glucose_roc': _glucose_roc(data.glucose.values)})
 
 
 def std_glucose_roc(data):
@@ -1416,9 +908,8 @@ def std_glucose_roc(data):
     check_data_columns(data)
     check_homogeneous_timegrid(data)
 
-    roc = glucose_roc(data)
-
-    return np.nanstd(roc.glucose_roc.values, ddof=1)
+    # Return the result
+    return _std_glucose_roc(data.glucose.values)
 
 
 def cvga(data):
@@ -1460,13 +951,1116 @@ def cvga(data):
     check_data_columns(data)
     check_homogeneous_timegrid(data)
 
-    if data.t.values.size == 0:
+    # Return the result
+    return _cvga(data.glucose.values)
+
+
+def _mean_glucose(glucose):
+    """
+    Computes the mean glucose level of the given glucose vector (ignoring nan values).
+    Array counterpart of `mean_glucose`.
+
+    Parameters
+    ----------
+    glucose: np.ndarray
+        A vector of double containing the glucose data to analyze (in mg/dl).
+
+    Returns
+    -------
+    mean_glucose: float
+        The mean glucose level.
+
+    Raises
+    ------
+    None
+
+    See Also
+    --------
+    mean_glucose
+
+    Examples
+    --------
+    None
+
+    References
+    ----------
+    None
+    """
+    # Get non-nan values
+    values = glucose[~np.isnan(glucose)]
+
+    # Return nan if all values are nan
+    if values.size == 0:
+        return np.nan
+
+    # Return the result
+    return np.mean(values)
+
+
+def _median_glucose(glucose):
+    """
+    Computes the median glucose level of the given glucose vector (ignoring nan values).
+    Array counterpart of `median_glucose`.
+
+    Parameters
+    ----------
+    glucose: np.ndarray
+        A vector of double containing the glucose data to analyze (in mg/dl).
+
+    Returns
+    -------
+    median_glucose: float
+        The median glucose level.
+
+    Raises
+    ------
+    None
+
+    See Also
+    --------
+    median_glucose
+
+    Examples
+    --------
+    None
+
+    References
+    ----------
+    None
+    """
+    # Get non-nan values
+    values = glucose[~np.isnan(glucose)]
+
+    # Return nan if all values are nan
+    if values.size == 0:
         return np.nan
 
-    roc = glucose_roc(data)
+    # Return the result
+    return np.median(values)
+
+
+def _std_glucose(glucose):
+    """
+    Computes the std glucose level of the given glucose vector (ignoring nan values).
+    Array counterpart of `std_glucose`.
+
+    Parameters
+    ----------
+    glucose: np.ndarray
+        A vector of double containing the glucose data to analyze (in mg/dl).
+
+    Returns
+    -------
+    std_glucose: float
+        The std glucose level.
+
+    Raises
+    ------
+    None
+
+    See Also
+    --------
+    std_glucose
+
+    Examples
+    --------
+    None
+
+    References
+    ----------
+    None
+    """
+    # Get non-nan values
+    values = glucose[~np.isnan(glucose)]
+
+    # Return nan if all values are nan
+    if values.size == 0:
+        return np.nan
+
+    # Return the result
+    return np.std(values, ddof=1)
+
+
+def _cv_glucose(glucose):
+    """
+    Computes the coefficient of variation of the given glucose vector (ignoring nan values).
+    Array counterpart of `cv_glucose`.
+
+    Parameters
+    ----------
+    glucose: np.ndarray
+        A vector of double containing the glucose data to analyze (in mg/dl).
+
+    Returns
+    -------
+    cv_glucose: float
+        The cv of glucose.
+
+    Raises
+    ------
+    None
+
+    See Also
+    --------
+    cv_glucose
+
+    Examples
+    --------
+    None
+
+    References
+    ----------
+    None
+    """
+    # Get non-nan values (once for both mean and std)
+    values = glucose[~np.isnan(glucose)]
+
+    # Return nan if all values are nan
+    if values.size == 0:
+        return np.nan
+
+    # Return the result
+    return 100 * np.std(values, ddof=1) / np.mean(values)
+
+
+def _range_glucose(glucose):
+    """
+    Computes the spanned range of the given glucose vector (ignoring nan values).
+    Array counterpart of `range_glucose`.
+
+    Parameters
+    ----------
+    glucose: np.ndarray
+        A vector of double containing the glucose data to analyze (in mg/dl).
+
+    Returns
+    -------
+    range: float
+        The range of glucose.
+
+    Raises
+    ------
+    None
+
+    See Also
+    --------
+    range_glucose
+
+    Examples
+    --------
+    None
+
+    References
+    ----------
+    None
+    """
+    # Return the result (fmax/fmin ignore nan values, and return nan if all values are nan)
+    if glucose.size == 0:
+        return np.nan
+    return np.fmax.reduce(glucose) - np.fmin.reduce(glucose)
+
+
+def _iqr_glucose(glucose):
+    """
+    Computes the interquartile range of the given glucose vector (ignoring nan values).
+    Array counterpart of `iqr_glucose`.
+
+    Parameters
+    ----------
+    glucose: np.ndarray
+        A vector of double containing the glucose data to analyze (in mg/dl).
+
+    Returns
+    -------
+    iqr: float
+        The interquartile range of glucose.
+
+    Raises
+    ------
+    None
+
+    See Also
+    --------
+    iqr_glucose
+
+    Examples
+    --------
+    None
+
+    References
+    ----------
+    None
+    """
+    # Get non-nan values
+    values = glucose[~np.isnan(glucose)]
+
+    # Return nan if all values are nan
+    if values.size == 0:
+        return np.nan
+
+    # Return the result (both quartiles at once)
+    q75, q25 = np.percentile(values, [75, 25])
+    return q75 - q25
+
+
+def _auc_glucose_over_basal(glucose, basal, sample_time):
+    """
+    Computes the area under the given glucose vector using a given basal offset (ignoring nan values).
+    Array counterpart of `auc_glucose_over_basal`.
+
+    Parameters
+    ----------
+    glucose: np.ndarray
+        A vector of double containing the glucose data to analyze (in mg/dl).
+    basal: float
+        The basal offset (in mg/dl).
+    sample_time: float
+        The sample time of the glucose data (in min).
+
+    Returns
+    -------
+    auc_glucose_over_basal: float
+        The area under the glucose curve.
+
+    Raises
+    ------
+    None
+
+    See Also
+    --------
+    auc_glucose_over_basal
+
+    Examples
+    --------
+    None
+
+    References
+    ----------
+    None
+    """
+    # Get non-nan values
+    values = glucose[~np.isnan(glucose)]
+
+    # Return nan if all values are nan
+    if values.size == 0:
+        return np.nan
+
+    # Shift the trace
+    values = values - basal
+
+    # Return the result
+    return np.sum(values*sample_time)
+
+
+def _gmi(glucose):
+    """
+    Computes the glucose management indicator of the given glucose vector (ignoring nan values).
+    Array counterpart of `gmi`.
+
+    Parameters
+    ----------
+    glucose: np.ndarray
+        A vector of double containing the glucose data to analyze (in mg/dl).
+
+    Returns
+    -------
+    gmi: float
+        The glucose management indicator of the given data.
+
+    Raises
+    ------
+    None
+
+    See Also
+    --------
+    gmi
+
+    Examples
+    --------
+    None
+
+    References
+    ----------
+    None
+    """
+    # Return results
+    return 3.31 + 0.02392 * _mean_glucose(glucose)
+
+
+def _cogi(glucose, time_in_ranges=None, std_glucose=None):
+    """
+    Computes the Continuous Glucose Monitoring Index (COGI) of the given glucose vector (ignoring nan values).
+    Array counterpart of `cogi`.
+
+    Parameters
+    ----------
+    glucose: np.ndarray
+        A vector of double containing the glucose data to analyze (in mg/dl).
+    time_in_ranges: dict, optional, default: None
+        The time in ranges of `glucose` with the `diabetes` glycemic target, as returned by `_time_in_ranges`. If None,
+        they are computed.
+    std_glucose: float, optional, default: None
+        The standard deviation of `glucose`, as returned by `_std_glucose`. If None, it is computed.
+
+    Returns
+    -------
+    cogi: float
+        The Continuous Glucose Monitoring Index (COGI) of the given data.
+
+    Raises
+    ------
+    None
+
+    See Also
+    --------
+    cogi
+
+    Examples
+    --------
+    None
+
+    References
+    ----------
+    None
+    """
+    # Get the time in ranges
+    if time_in_ranges is None:
+        time_in_ranges = _time_in_ranges(glucose)
+
+    # Compute TIR component
+    tir = time_in_ranges['time_in_target']*0.5
+
+    # Compute TBR component
+    tbr = np.min([15, time_in_ranges['time_in_hypoglycemia']])
+    tbr = (100 - 100 / 15 * tbr) * 0.35
+
+    # Compute GV component
+    if std_glucose is None:
+        std_glucose = _std_glucose(glucose)
+    gv = np.min([np.max([std_glucose / 18.018, 1]), 6])
+    gv = (120 - 20 * gv) * 0.15
+
+    # Return results
+    return tir + tbr + gv
+
+
+def _j_index(glucose):
+    """
+    Computes the J-Index of the given glucose vector (ignoring nan values).
+    Array counterpart of `j_index`.
+
+    Parameters
+    ----------
+    glucose: np.ndarray
+        A vector of double containing the glucose data to analyze (in mg/dl).
+
+    Returns
+    -------
+    j_index: float
+        The J-Index of the given data.
+
+    Raises
+    ------
+    None
+
+    See Also
+    --------
+    j_index
+
+    Examples
+    --------
+    None
+
+    References
+    ----------
+    None
+    """
+    # Get non-nan values (once for both mean and std)
+    values = glucose[~np.isnan(glucose)]
+
+    # Return nan if all values are nan
+    if values.size == 0:
+        return np.nan
+
+    # Return the result
+    return 1e-3 * (np.mean(values) + np.std(values, ddof=1)) ** 2
+
+
+def _day_starts(t):
+    """
+    Finds where each day of the given timestamps starts, from the midnight of the first day to the midnight following
+    the last one. The day limits are computed with datetime64 arithmetic, so no Python datetime is built.
+
+    Parameters
+    ----------
+    t: np.ndarray
+        A vector of datetime64[ns] containing the (sorted and non-empty) timestamps.
+
+    Returns
+    -------
+    day_starts: np.ndarray
+        A vector of int containing the index of the first timestamp of each day, followed by the number of timestamps
+        (i.e., the data of day `d` are those in `day_starts[d]:day_starts[d + 1]`).
+
+    Raises
+    ------
+    None
+
+    See Also
+    --------
+    sddm_index, sdw_index, py_agata.risk.adrr
+
+    Examples
+    --------
+    None
+
+    References
+    ----------
+    None
+    """
+    first_day = t[0].astype('datetime64[D]')
+    last_day = t[-1].astype('datetime64[D]') + np.timedelta64(1, 'D')
+    n_days = int((last_day - first_day) / np.timedelta64(1, 'D'))
+
+    # Day limits (midnights) and their positions in the timestamps (timestamps are sorted)
+    limits = (first_day + np.arange(0, n_days + 1)).astype('datetime64[ns]')
+    return np.searchsorted(t, limits, side='left')
+
+
+def _daily_excursions(data):
+    """
+    Computes, for each day of the given data, the glycemic excursions (i.e., the differences between consecutive
+    retained turning points) used by the MAGE and EF indexes. The turning points are computed only once and shared by
+    `mage_plus_index`, `mage_minus_index`, `mage_index`, and `ef_index`.
+
+    Parameters
+    ----------
+    data: pd.DataFrame
+        Pandas dataframe with a column `glucose` containing the glucose data
+        to analyze (in mg/dl)
+
+    Returns
+    -------
+    excursions: list or None
+        A list containing, for each day, the vector of the glycemic excursions of that day (None if the day has less
+        than 4 samples). None if data are empty or all glucose values are nan.
+
+    Raises
+    ------
+    None
+
+    See Also
+    --------
+    mage_plus_index, mage_minus_index, mage_index, ef_index
+
+    Examples
+    --------
+    None
+
+    References
+    ----------
+    - Service et al., "Mean amplitude of glycemic excursions, a measure of
+    diabetic instability", Diabetes, 1970, vol. 19, pp. 644-655. DOI:
+    10.2337/diab.19.9.644.
+    """
+    glucose = np.ascontiguousarray(data.glucose.values, dtype=np.float64)
+    if glucose.size == 0 or np.all(np.isnan(glucose)):
+        return None
+
+    # Find where each day starts
+    day_starts = _day_starts(np.asarray(data.t.values, dtype='datetime64[ns]'))
+    n_days = day_starts.size - 1
+
+    excursions = []
+    for d in range(0, n_days):
+        # Get the day of data
+        day_data = glucose[day_starts[d]:day_starts[d + 1]]
+        n = day_data.size
+        if n <= 3:
+            excursions.append(None)
+            continue
+
+        # Get glucose values (might be nan)
+        std_within = np.nanstd(day_data, ddof=1)
+
+        # Step 1: turning points are only local extrema
+        i_max = find_peaks(day_data)[0]
+        i_min = find_peaks(-day_data)[0]
+        i_turning = np.union1d([0, n-1], np.union1d(i_max, i_min)).astype(int)
+        turning = day_data[i_turning]
+
+        # Step 2: Turning points of no interest are removed
+        # A turning point is removed if it's not significantly different from
+        # BOTH its left and right-hand side RETAINED neighbours. First and last samples are retained.
+        close = np.abs(np.diff(turning)) < std_within
+        to_be_kept = np.ones(i_turning.size, dtype=bool)
+        to_be_kept[1:-1] = ~(close[:-1] & close[1:])
+        i_turning = i_turning[to_be_kept]
+
+        # Step 3: Turning points are removed again or moved appropriately
+        i = 1
+        while i < len(i_turning)-1:
+            prev = i_turning[i - 1]
+            curr = i_turning[i]
+            next = i_turning[i + 1]
+            prev_slope = day_data[curr] - day_data[prev]
+            next_slope = day_data[next] - day_data[curr]
+            if prev_slope < 0 and next_slope > 0:  # Minimum
+                # The actual current turning point is the min in the interval
+                curr = np.nanargmin(day_data[prev:(next+1)]) + prev
+                i_turning[i] = curr
+                # The actual previous turning point is the max to the left of the current turning point.
+                i_turning[i - 1] = np.nanargmax(day_data[prev:curr]) + prev
+                # The actual following turning point is the max to the right of the current turning point.
+                i_turning[i + 1] = np.nanargmax(day_data[(curr + 1):(next+1)]) + curr + 1
+                i += 1
+            elif prev_slope > 0 and next_slope < 0:  # Maximum
+                # The actual current turning point is the max in the interval
+                curr = np.nanargmax(day_data[prev:(next+1)]) + prev
+                i_turning[i] = curr
+                # The actual previous turning point is the min to the left of the current turning point.
+                i_turning[i - 1] = np.nanargmin(day_data[prev:curr]) + prev
+                # The actual following turning point is the min to the right of the current turning point.
+                i_turning[i + 1] = np.nanargmin(day_data[(curr + 1):(next+1)]) + curr + 1
+                i += 1
+            else:  # Middle point
+                i_turning = np.delete(i_turning, i)
+
+        # Step 4: Remove residual spurious turning points.
+        # Turning points not significantly different from EITHER neighbour are
+        # removed. Some extra processing is needed for the first and last sample.
+        if abs(day_data[i_turning[1]] - day_data[i_turning[0]]) < std_within:
+            i_turning = i_turning[1:]
+        if len(i_turning) > 1:
+            # Last sample processing
+            if abs(day_data[i_turning[-1]] - day_data[i_turning[-2]]) < std_within:
+                i_turning = i_turning[:-1]
+
+        # Internal points
+        turning = day_data[i_turning]
+        close = np.abs(np.diff(turning)) < std_within
+        to_be_kept = np.ones(i_turning.size, dtype=bool)
+        to_be_kept[1:-1] = ~(close[:-1] | close[1:])
+        turning = turning[to_be_kept]
+
+        # Step 5: Compute the daily excursions
+        excursions.append(np.diff(turning))
+
+    return excursions
+
+
+def _mage_plus_index(excursions):
+    """
+    Computes the mean amplitude of positive glycemic excursion (MAGE+) index from the daily glycemic excursions.
+    Counterpart of `mage_plus_index`.
+
+    Parameters
+    ----------
+    excursions: list or None
+        The daily glycemic excursions, as returned by `_daily_excursions`.
+
+    Returns
+    -------
+    mage_plus_index: float
+        The mean amplitude of positive glycemic excursion (MAGE+) index of the given data.
+
+    Raises
+    ------
+    None
+
+    See Also
+    --------
+    mage_plus_index
+
+    Examples
+    --------
+    None
+
+    References
+    ----------
+    None
+    """
+    # Manage empty and all nan data
+    if excursions is None:
+        return np.nan
+
+    mage_day_plus = np.array([np.nan if e is None else np.nanmean(e[e > 0]) for e in excursions])
+
+    # Compute index
+    mage_day_plus[np.isnan(mage_day_plus)] = 0  # Correct for 'mean' behavior
+    return np.mean(mage_day_plus)
+
+
+def _mage_minus_index(excursions):
+    """
+    Computes the mean amplitude of negative glycemic excursion (MAGE-) index from the daily glycemic excursions.
+    Counterpart of `mage_minus_index`.
+
+    Parameters
+    ----------
+    excursions: list or None
+        The daily glycemic excursions, as returned by `_daily_excursions`.
+
+    Returns
+    -------
+    mage_minus_index: float
+        The mean amplitude of negative glycemic excursion (MAGE-) index of the given data.
+
+    Raises
+    ------
+    None
+
+    See Also
+    --------
+    mage_minus_index
+
+    Examples
+    --------
+    None
+
+    References
+    ----------
+    None
+    """
+    # Manage empty and all nan data
+    if excursions is None:
+        return np.nan
+
+    mage_day_minus = np.array([np.nan if e is None else np.nanmean(e[e < 0]) for e in excursions])
+
+    # Compute index
+    mage_day_minus[np.isnan(mage_day_minus)] = 0  # Correct for 'mean' behavior
+    return -np.mean(mage_day_minus)
+
+
+def _mage_index(excursions):
+    """
+    Computes the mean amplitude of glycemic excursion (MAGE) index from the daily glycemic excursions.
+    Counterpart of `mage_index`.
+
+    Parameters
+    ----------
+    excursions: list or None
+        The daily glycemic excursions, as returned by `_daily_excursions`.
+
+    Returns
+    -------
+    mage_index: float
+        The mean amplitude of glycemic excursion (MAGE) index of the given data.
+
+    Raises
+    ------
+    None
+
+    See Also
+    --------
+    mage_index
+
+    Examples
+    --------
+    None
+
+    References
+    ----------
+    None
+    """
+    mage_plus = _mage_plus_index(excursions)
+    mage_minus = _mage_minus_index(excursions)
+    if np.isnan(mage_plus) and np.isnan(mage_minus):
+        return np.nan
+    return np.nanmean([mage_plus, mage_minus])
+
+
+def _ef_index(excursions):
+    """
+    Computes the excursion frequency (EF) index from the daily glycemic excursions.
+    Counterpart of `ef_index`.
+
+    Parameters
+    ----------
+    excursions: list or None
+        The daily glycemic excursions, as returned by `_daily_excursions`.
+
+    Returns
+    -------
+    ef_index: float
+        The excursion frequency (EF) index of the given data.
+
+    Raises
+    ------
+    None
+
+    See Also
+    --------
+    ef_index
+
+    Examples
+    --------
+    None
+
+    References
+    ----------
+    None
+    """
+    # Manage empty and all nan data
+    if excursions is None:
+        return np.nan
+
+    # Set the fixed parameter
+    ef_th = 75
+
+    ef_day = np.array([np.nan if e is None else np.where(abs(e) > ef_th)[0].size for e in excursions])
+
+    # Compute index
+    return np.nansum(ef_day) / len(excursions)
+
+
+def _lagged_differences(t, glucose, lag):
+    """
+    Computes, for each glucose datapoint, its difference with the last datapoint at least `lag` ns before it. Since the
+    timegrid is homogeneous, such datapoint is always the same number of samples before, so that all the differences
+    are computed at once with a single shifted subtraction.
+
+    Parameters
+    ----------
+    t: np.ndarray
+        A vector of int64 containing the (homogeneous) timestamps of the glucose data (in ns).
+    glucose: np.ndarray
+        A vector of double containing the glucose data to analyze (in mg/dl).
+    lag: int
+        The lag of the differences (in ns).
+
+    Returns
+    -------
+    differences: np.ndarray
+        A vector of double containing the lagged differences (might be nan).
+
+    Raises
+    ------
+    None
+
+    See Also
+    --------
+    conga, modd
+
+    Examples
+    --------
+    None
+
+    References
+    ----------
+    None
+    """
+    if glucose.size < 2 or t[1] <= t[0]:
+        return np.empty(shape=(0,))
+
+    # Number of samples between a datapoint and the last one at least `lag` before it
+    k = min(-(-lag // (t[1] - t[0])), glucose.size)
+
+    return glucose[k:] - glucose[:glucose.size - k]
+
+
+def _conga(t, glucose):
+    """
+    Computes the Continuous Overall Net Glycemic Action (CONGA) index of the given glucose vector (ignoring nan values).
+    Array counterpart of `conga`.
+
+    Parameters
+    ----------
+    t: np.ndarray
+        A vector of int64 containing the (homogeneous) timestamps of the glucose data (in ns).
+    glucose: np.ndarray
+        A vector of double containing the glucose data to analyze (in mg/dl).
+
+    Returns
+    -------
+    conga: float
+        The CONGA index of the given data.
+
+    Raises
+    ------
+    None
+
+    See Also
+    --------
+    conga
+
+    Examples
+    --------
+    None
+
+    References
+    ----------
+    None
+    """
+    # Set the CONGAOrd hyperparameter to 4 (number of hours in the past it
+    # refers to)
+    conga_ord = 4
+
+    # Build vectors
+    dc = _lagged_differences(t, glucose, conga_ord * 3600 * 1_000_000_000)
+
+    # Return results
+    if dc.size == 0:
+        return np.nan
+    else:
+        return np.nanstd(dc, ddof=1)
+
+
+def _modd(t, glucose):
+    """
+    Computes the Mean Of Daily Differences (MODD) of the given glucose vector (ignoring nan values).
+    Array counterpart of `modd`.
+
+    Parameters
+    ----------
+    t: np.ndarray
+        A vector of int64 containing the (homogeneous) timestamps of the glucose data (in ns).
+    glucose: np.ndarray
+        A vector of double containing the glucose data to analyze (in mg/dl).
+
+    Returns
+    -------
+    modd: float
+        The MODD of the given data.
+
+    Raises
+    ------
+    None
+
+    See Also
+    --------
+    modd
+
+    Examples
+    --------
+    None
+
+    References
+    ----------
+    None
+    """
+    # Build vectors (differences with the same time yesterday)
+    dm = np.abs(_lagged_differences(t, glucose, 1440 * 60 * 1_000_000_000))
+
+    if dm.size == 0:
+        return np.nan
+    return np.nanmean(dm)
+
+
+def _sddm_index(t, glucose):
+    """
+    Computes the standard deviation of within-day means (SDDM) index of the given glucose vector (ignoring nan values).
+    Array counterpart of `sddm_index`.
+
+    Parameters
+    ----------
+    t: np.ndarray
+        A vector of int64 containing the (homogeneous) timestamps of the glucose data (in ns).
+    glucose: np.ndarray
+        A vector of double containing the glucose data to analyze (in mg/dl).
+
+    Returns
+    -------
+    sddm_index: float
+        The SDDM index of the given data.
+
+    Raises
+    ------
+    None
+
+    See Also
+    --------
+    sddm_index
+
+    Examples
+    --------
+    None
+
+    References
+    ----------
+    None
+    """
+    if t.size == 0:
+        return np.nan
+
+    # Find where each day starts and preallocate
+    day_starts = _day_starts(t.view('datetime64[ns]'))
+    n_days = day_starts.size - 1
+    mean_within = np.empty(shape=(n_days,))
+
+    for d in range(0, n_days):
+
+        # Get the day of data
+        day_data = glucose[day_starts[d]:day_starts[d + 1]]
+
+        # Get daily mean and std
+        mean_within[d] = np.nanmean(day_data)
+
+    # Compute index
+    return np.nanstd(mean_within, ddof=1)
+
+
+def _sdw_index(t, glucose):
+    """
+    Computes the mean of within-day standard deviation (SDW) index of the given glucose vector (ignoring nan values).
+    Array counterpart of `sdw_index`.
+
+    Parameters
+    ----------
+    t: np.ndarray
+        A vector of int64 containing the (homogeneous) timestamps of the glucose data (in ns).
+    glucose: np.ndarray
+        A vector of double containing the glucose data to analyze (in mg/dl).
+
+    Returns
+    -------
+    sdw_index: float
+        The SDW index of the given data.
+
+    Raises
+    ------
+    None
+
+    See Also
+    --------
+    sdw_index
+
+    Examples
+    --------
+    None
+
+    References
+    ----------
+    None
+    """
+    if t.size == 0:
+        return np.nan
+
+    # Find where each day starts and preallocate
+    day_starts = _day_starts(t.view('datetime64[ns]'))
+    n_days = day_starts.size - 1
+    std_within = np.empty(shape=(n_days,))
+
+    for d in range(0, n_days):
+
+        # Get the day of data
+        day_data = glucose[day_starts[d]:day_starts[d + 1]]
+
+        # Get daily mean and std
+        std_within[d] = np.nanstd(day_data, ddof=1)
+
+    # Compute index
+    return np.nanmean(std_within)
+
+
+def _glucose_roc(glucose):
+    """
+    Computes the glucose rate-of-change of the given glucose vector, i.e., the difference between each datapoint and
+    the one three samples before, over 15 minutes. Array counterpart of `glucose_roc`.
+
+    Parameters
+    ----------
+    glucose: np.ndarray
+        A vector of double containing the glucose data to analyze (in mg/dl).
+
+    Returns
+    -------
+    g_roc: np.ndarray
+        A vector of double containing the glucose rate-of-change (in mg/dl/min, nan for the first three samples).
+
+    Raises
+    ------
+    None
+
+    See Also
+    --------
+    glucose_roc
+
+    Examples
+    --------
+    None
+
+    References
+    ----------
+    None
+    """
+    g_roc = np.full(shape=(glucose.size,), fill_value=np.nan)
+    if g_roc.size > 4:
+        g_roc[3:] = (glucose[3:] - glucose[:-3]) / 15
+    return g_roc
+
+
+def _std_glucose_roc(glucose):
+    """
+    Computes the standard deviation of the glucose rate-of-change of the given glucose vector (ignoring nan values).
+    Array counterpart of `std_glucose_roc`.
+
+    Parameters
+    ----------
+    glucose: np.ndarray
+        A vector of double containing the glucose data to analyze (in mg/dl).
+
+    Returns
+    -------
+    std_glucose_roc: float
+        The standard deviation of the glucose rate-of-change of the given data.
+
+    Raises
+    ------
+    None
+
+    See Also
+    --------
+    std_glucose_roc
+
+    Examples
+    --------
+    None
+
+    References
+    ----------
+    None
+    """
+    return np.nanstd(_glucose_roc(glucose), ddof=1)
+
+
+def _cvga(glucose):
+    """
+    Computes the control-variability grid analysis (CVGA) distance of the given glucose vector (ignoring nan values).
+    Array counterpart of `cvga`.
+
+    Parameters
+    ----------
+    glucose: np.ndarray
+        A vector of double containing the glucose data to analyze (in mg/dl).
+
+    Returns
+    -------
+    cvga: float
+        The CVGA distance of the given data.
+
+    Raises
+    ------
+    None
+
+    See Also
+    --------
+    cvga
+
+    Examples
+    --------
+    None
+
+    References
+    ----------
+    None
+    """
+    if glucose.size == 0:
+        return np.nan
 
-    x = np.min([np.max([110 - np.nanmin(data.glucose.values), 0]), 60])
+    x = np.min([np.max([110 - np.nanmin(glucose), 0]), 60])
     p = np.polyfit([110, 180, 300, 400], [0, 20, 40, 60], 3)
-    y = np.polyval(p, np.nanmax(data.glucose.values))
+    y = np.polyval(p, np.nanmax(glucose))
 
     return x**2 + y**2
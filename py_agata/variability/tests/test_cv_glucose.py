@@ -51,6 +51,7 @@ def test_cv_glucose():
     #Tests
     assert np.isnan(cv_glucose(data)) == False
     assert np.round(cv_glucose(data)*100)/100 == 62.32
+    assert cv_glucose(data.glucose.values) == cv_glucose(data)
 
     # Set empty data
     t = np.arange(datetime(2000, 1, 1, 1, 0, 0), datetime(2000, 1, 1, 1, 55, 0), timedelta(minutes=5)).astype(
@@ -51,6 +51,7 @@ def test_gmi():
     #Tests
     assert np.isnan(gmi(data)) == False
     assert np.round(gmi(data)*100)/100 == 6.61
+    assert gmi(data.glucose.values) == gmi(data)
 
     # Set empty data
     t = np.arange(datetime(2000, 1, 1, 1, 0, 0), datetime(2000, 1, 1, 1, 55, 0), timedelta(minutes=5)).astype(
@@ -51,6 +51,7 @@ def test_iqr_glucose():
     #Tests
     assert np.isnan(iqr_glucose(data)) == False
     assert np.round(iqr_glucose(data)*100)/100 == 142.50
+    assert iqr_glucose(data.glucose.values) == iqr_glucose(data)
 
     # Set empty data
     t = np.arange(datetime(2000, 1, 1, 1, 0, 0), datetime(2000, 1, 1, 1, 55, 0), timedelta(minutes=5)).astype(
@@ -51,6 +51,7 @@ def test_j_index():
     #Tests
     assert np.isnan(j_index(data)) == False
     assert np.round(j_index(data)*100)/100 == 50.17
+    assert j_index(data.glucose.values) == j_index(data)
 
     # Set empty data
     t = np.arange(datetime(2000, 1, 1, 1, 0, 0), datetime(2000, 1, 1, 1, 55, 0), timedelta(minutes=5)).astype(
@@ -52,6 +52,7 @@ def test_mean_glucose():
     #Tests
     assert np.isnan(mean_glucose(data)) == False
     assert mean_glucose(data) == 138
+    assert mean_glucose(data.glucose.values) == mean_glucose(data)
 
     # Set empty data
     t = np.arange(datetime(2000, 1, 1, 1, 0, 0), datetime(2000, 1, 1, 1, 55, 0), timedelta(minutes=5)).astype(
@@ -51,6 +51,7 @@ def test_median_glucose():
     #Tests
     assert np.isnan(median_glucose(data)) == False
     assert median_glucose(data) == 120
+    assert median_glucose(data.glucose.values) == median_glucose(data)
 
     # Set empty data
     t = np.arange(datetime(2000, 1, 1, 1, 0, 0), datetime(2000, 1, 1, 1, 55, 0), timedelta(minutes=5)).astype(
@@ -51,6 +51,7 @@ def test_range_glucose():
     #Tests
     assert np.isnan(range_glucose(data)) == False
     assert np.round(range_glucose(data)*100)/100 == 220
+    assert range_glucose(data.glucose.values) == range_glucose(data)
 
     # Set empty data
     t = np.arange(datetime(2000, 1, 1, 1, 0, 0), datetime(2000, 1, 1, 1, 55, 0), timedelta(minutes=5)).astype(
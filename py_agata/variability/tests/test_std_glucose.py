@@ -51,6 +51,7 @@ def test_std_glucose():
     #Tests
     assert np.isnan(std_glucose(data)) == False
     assert np.round(std_glucose(data)*100)/100 == 86
+    assert std_glucose(data.glucose.values) == std_glucose(data)
 
     # Set empty data
     t = np.arange(datetime(2000, 1, 1, 1, 0, 0), datetime(2000, 1, 1, 1, 55, 0), timedelta(minutes=5)).astype(